@@ -1,6 +1,7 @@
 from .model import FlyingWing
-from .solver import WingSolver
+from .solver import FlightCondition, WingSolver, solve, solve_batch
 from .optimizer import WingletOptimizer
+from .backends import AeroSandboxBackend, LiftingLineBackend, VortexLatticeBackend
 
 from ._version import get_versions
 
@@ -0,0 +1,481 @@
+import copy
+
+import aerosandbox as sbx
+import numpy as np
+
+from winglets.hmatrix import HierarchicalSystem
+from winglets.vlm import (
+    InfluenceSystem,
+    KrylovSystem,
+    Lattice,
+    MixedPrecisionSystem,
+    OutOfCoreSystem,
+    PartitionedSystem,
+    Reference,
+    TILE_BYTES,
+    SymmetricSystem,
+    VortexLatticeResult,
+    WarmStart,
+    array_nbytes,
+)
+
+
+class SolverBackend:
+    """Aerodynamic engine driven by a `WingSolver`.
+
+    A backend assembles the factorized influence system of a model and
+    turns vortex strengths into a result object exposing at least the
+    CL, CDi, CY and Cm coefficients.
+    """
+
+    NAME = None
+
+    # Whether `create_result` can skip the near-field pass over the panels
+    FREESTREAM_FORCES = False
+
+    @property
+    def cache_key(self):
+        """Backend configuration that determines the assembled systems."""
+        return (self.NAME,)
+
+    def fresh(self):
+        """Copy of the backend with the same options and none of the state
+        carried between assemblies, for concurrent use.
+
+        Returns
+        -------
+        SolverBackend
+        """
+        return copy.copy(self)
+
+    def assemble(self, model):
+        """Assemble and factorize the influence system of a model.
+
+        Parameters
+        ----------
+        model : winglets.FlyingWing
+
+        Returns
+        -------
+        system : InfluenceSystem-like
+            Exposes `lattice`, `reference`, `solve(rhs)` and
+            `induced_velocity_at_centers(strengths)`.
+        """
+        raise NotImplementedError
+
+    def solve(self, system, rhs):
+        """Vortex strengths of an assembled system.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        rhs : numpy.array
+            (N,) or (N, K) normal-wash right-hand sides.
+
+        Returns
+        -------
+        numpy.array
+        """
+        return system.solve(rhs)
+
+    def create_result(
+        self, system, alpha, velocity, density, vortex_strengths, near_field=True
+    ):
+        """Post-process the solution at an operating point.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        alpha : float
+            In degrees.
+        velocity : float
+        density : float
+        vortex_strengths : numpy.array
+        near_field : bool, default True
+            False takes the forces in the freestream only, without the
+            induced velocities at the vortex centers, if the backend has
+            `FREESTREAM_FORCES`. Ignored otherwise.
+
+        Returns
+        -------
+        result
+        """
+        raise NotImplementedError
+
+
+class AeroSandboxSystem(InfluenceSystem):
+    def __init__(self, problem):
+        """Influence system backed by an aerosandbox.vlm3 problem.
+
+        Parameters
+        ----------
+        problem : aerosandbox.vlm3
+            Problem with panels and geometry set up.
+        """
+        super().__init__(lattice=problem, reference=problem.airplane)
+
+        self.problem = problem
+        self.AIC = problem.AIC
+        self._Vij_centers = problem.Vij_centers
+
+    @property
+    def nbytes(self):
+        return array_nbytes(vars(self), vars(self.problem))
+
+
+class AeroSandboxBackend(SolverBackend):
+    """AeroSandbox 0.3.0 `vlm3` solver."""
+
+    NAME = "aerosandbox"
+
+    def assemble(self, model):
+
+        problem = sbx.vlm3(
+            airplane=model.airplane,
+            op_point=sbx.OperatingPoint(velocity=1.0, alpha=0.0, density=1.0),
+        )
+        problem.verbose = False
+        problem.make_panels()
+        problem.setup_geometry()
+
+        return AeroSandboxSystem(problem).factorize()
+
+    def create_result(
+        self, system, alpha, velocity, density, vortex_strengths, near_field=True
+    ):
+
+        # Shallow copy, so results of cached systems are not overwritten
+        problem = copy.copy(system.problem)
+
+        problem.op_point = sbx.OperatingPoint(
+            velocity=velocity, alpha=alpha, density=density
+        )
+        problem.setup_operating_point()
+        problem.vortex_strengths = vortex_strengths
+        # Always the full near-field pass of vlm3, near_field is ignored
+        problem.calculate_forces()
+
+        return problem
+
+
+class VortexLatticeBackend(SolverBackend):
+    """Native, vectorized NumPy horseshoe vortex lattice."""
+
+    NAME = "vortex_lattice"
+
+    FREESTREAM_FORCES = True
+
+    # GMRES iterations above which the Krylov preconditioner is refreshed
+    REFACTOR_ITERATIONS = 20
+
+    def __init__(
+        self,
+        partition=False,
+        symmetric=False,
+        tile_bytes=TILE_BYTES,
+        workers=1,
+        out_of_core=False,
+        directory=None,
+        mixed_precision=False,
+        krylov=False,
+        hierarchical=False,
+    ):
+        """
+        Parameters
+        ----------
+        partition : bool, default False
+            Keep the planform (first wing) block of the influence matrix
+            and its factorization between calls, and solve the remaining
+            wings through a Schur complement. Meant for loops where only
+            the winglet changes.
+        symmetric : bool, default False
+            Solve configurations symmetric about the XZ plane on their
+            starboard half, valid without sideslip. Falls back to the
+            full lattice for asymmetric configurations.
+        tile_bytes : int, optional
+            Memory budget of the Biot-Savart kernel temporaries. The
+            influence matrices are assembled in row tiles within it.
+        workers : int or None, default 1
+            Threads assembling the row tiles, None for all the CPUs.
+        out_of_core : bool, default False
+            Store the influence matrix in a memory-mapped temporary file
+            and solve it iteratively, for lattices whose dense matrices do
+            not fit in memory. Partitioning is not applied out of core.
+        directory : str, optional
+            Directory of the out-of-core files, by default the system
+            temporary directory.
+        mixed_precision : bool, default False
+            Factorize the influence matrices in float32 and refine the
+            solutions to float64 accuracy with the float64 matrices.
+            Halves the memory and cost of the factorizations. Not
+            combined with partitioning or out of core solves.
+        krylov : bool, default False
+            Solve by GMRES, warm-started with the previous solution and
+            preconditioned with the factorization of an earlier geometry
+            with the same panels. The factorization is refreshed when a
+            solve takes more than REFACTOR_ITERATIONS iterations. Meant
+            for loops of small geometry perturbations. Not combined with
+            partitioning, out of core or mixed precision solves.
+        hierarchical : bool, default False
+            Compress the far-field blocks of the influence operators by
+            adaptive cross approximation in a hierarchical matrix and solve
+            by GMRES, with O(N log N) storage and products. Meant for fine
+            lattices whose dense matrices do not fit in memory. Not
+            combined with the other solve options, except symmetry.
+
+        Attributes
+        ----------
+        iterations : list of int
+            GMRES iterations of every right-hand side of the last solve,
+            zero for direct solves.
+        """
+        self.partition = partition
+        self.symmetric = symmetric
+        self.tile_bytes = tile_bytes
+        self.workers = workers
+        self.out_of_core = out_of_core
+        self.directory = directory
+        self.mixed_precision = mixed_precision
+        self.krylov = krylov
+        self.hierarchical = hierarchical
+
+        self.iterations = []
+
+        self._base_system = None
+        self._preconditioner = None
+        self._warm_start = WarmStart()
+
+    def fresh(self):
+
+        backend = copy.copy(self)
+
+        backend.iterations = []
+
+        backend._base_system = None
+        backend._preconditioner = None
+        backend._warm_start = WarmStart()
+
+        return backend
+
+    @property
+    def cache_key(self):
+        return (
+            self.NAME,
+            self.partition,
+            self.symmetric,
+            self.out_of_core,
+            self.mixed_precision,
+            self.krylov,
+            self.hierarchical,
+        )
+
+    def assemble(self, model):
+
+        wings = model.wings
+
+        lattice = self._create_lattice(wings)
+        reference = Reference.from_wings(wings)
+
+        if not (self.symmetric and lattice.is_symmetric):
+            return self._assemble_lattice(lattice=lattice, reference=reference)
+
+        half = self._assemble_lattice(
+            lattice=lattice.take(lattice.is_starboard),
+            reference=reference,
+            symmetric=True,
+        )
+
+        return SymmetricSystem(lattice=lattice, reference=reference, half=half)
+
+    def _create_lattice(self, wings):
+        """Lattice of the wings.
+
+        Parameters
+        ----------
+        wings : list of aerosandbox.Wing
+
+        Returns
+        -------
+        Lattice
+        """
+        return Lattice.from_wings(wings)
+
+    def _assemble_lattice(self, lattice, reference, symmetric=False):
+        """Assembled system of a lattice, hierarchical, partitioned, out of
+        core, in mixed precision or Krylov if requested.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+            Add the influence of the mirror-image vortices.
+
+        Returns
+        -------
+        InfluenceSystem
+        """
+        if self.hierarchical:
+            system = HierarchicalSystem(
+                lattice=lattice,
+                reference=reference,
+                symmetric=symmetric,
+                workers=self.workers,
+            )
+            return system.assemble()
+
+        if self.out_of_core:
+            system = OutOfCoreSystem(
+                lattice=lattice,
+                reference=reference,
+                symmetric=symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+                directory=self.directory,
+            )
+            return system.assemble()
+
+        if self.mixed_precision:
+            system = MixedPrecisionSystem(
+                lattice=lattice,
+                reference=reference,
+                symmetric=symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+            return system.assemble()
+
+        if self.krylov:
+            return self._assemble_krylov(
+                lattice=lattice, reference=reference, symmetric=symmetric
+            )
+
+        if not self.partition:
+            system = InfluenceSystem(
+                lattice=lattice,
+                reference=reference,
+                symmetric=symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+            return system.assemble()
+
+        base = self._get_base_system(
+            lattice=lattice, reference=reference, symmetric=symmetric
+        )
+
+        if base.lattice.n_panels == lattice.n_panels:
+            return base
+
+        system = PartitionedSystem(lattice=lattice, reference=reference, base=base)
+
+        return system.assemble()
+
+    def _assemble_krylov(self, lattice, reference, symmetric=False):
+        """Krylov system preconditioned with the last factorized one.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+
+        Returns
+        -------
+        KrylovSystem
+        """
+        if max(self.iterations, default=0) > self.REFACTOR_ITERATIONS:
+            self._preconditioner = None
+
+        system = KrylovSystem(
+            lattice=lattice,
+            reference=reference,
+            symmetric=symmetric,
+            tile_bytes=self.tile_bytes,
+            workers=self.workers,
+            preconditioner=self._preconditioner,
+        )
+        system.assemble()
+
+        if system.is_self_preconditioned:
+            self._preconditioner = system
+
+        return system
+
+    def _get_base_system(self, lattice, reference, symmetric=False):
+        """Assembled system of the planform panels, reused while the
+        planform lattice does not change.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+
+        Returns
+        -------
+        InfluenceSystem
+        """
+        n_base = np.count_nonzero(lattice.wing_index == 0)
+        base_lattice = lattice.take(slice(None, n_base))
+
+        base = self._base_system
+
+        if (
+            base is None
+            or base.symmetric != symmetric
+            or not base.lattice.is_equal(base_lattice)
+        ):
+
+            base = InfluenceSystem(
+                lattice=base_lattice,
+                reference=reference,
+                symmetric=symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+            base.assemble()
+
+            self._base_system = base
+
+        return base
+
+    def solve(self, system, rhs):
+
+        # Cached systems are shared, the warm start belongs to the backend
+        warm_start = self._warm_start if self.krylov else None
+
+        strengths, self.iterations = system.solve_with_iterations(
+            rhs, warm_start=warm_start
+        )
+
+        return strengths
+
+    def create_result(
+        self, system, alpha, velocity, density, vortex_strengths, near_field=True
+    ):
+
+        return VortexLatticeResult(
+            system=system,
+            alpha=alpha,
+            velocity=velocity,
+            density=density,
+            vortex_strengths=vortex_strengths,
+            near_field=near_field,
+        )
+
+
+class LiftingLineBackend(VortexLatticeBackend):
+    """Weissinger lifting line, for low-fidelity screening.
+
+    Solves a single spanwise row of horseshoe vortices per wing instead of
+    the full lattice, with the same sections and winglet geometry. Camber
+    enters through the thin airfoil zero-lift angle of the strips, so
+    pitching moments miss the camber contribution. Takes the options of
+    `VortexLatticeBackend`.
+    """
+
+    NAME = "lifting_line"
+
+    def _create_lattice(self, wings):
+        return Lattice.lifting_line(wings)
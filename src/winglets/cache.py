@@ -0,0 +1,222 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Default memory budget of the shared system cache
+MAX_BYTES = 512 * 1024**2
+
+
+def geometry_fingerprint(wings):
+    """Content hash of the lattice-defining geometry of a list of wings.
+
+    Two lists of wings with the same fingerprint produce the same
+    vortex lattice, whatever objects they are made of.
+
+    Parameters
+    ----------
+    wings : list of aerosandbox.Wing
+
+    Returns
+    -------
+    str
+    """
+    digest = hashlib.blake2b(digest_size=20)
+
+    def _update(*values):
+        for value in values:
+            if isinstance(value, str):
+                digest.update(value.encode())
+            else:
+                digest.update(np.asarray(value, dtype=float).tobytes())
+            digest.update(b"|")
+
+    for wing in wings:
+
+        _update(
+            "wing",
+            wing.xyz_le,
+            wing.symmetric,
+            wing.chordwise_panels,
+            wing.chordwise_spacing,
+        )
+
+        for xsec in wing.xsecs:
+            _update(
+                "xsec",
+                xsec.xyz_le,
+                xsec.chord,
+                xsec.twist,
+                xsec.airfoil.mcl_coordinates,
+                xsec.control_surface_type,
+                xsec.control_surface_hinge_point,
+                xsec.control_surface_deflection,
+                xsec.spanwise_panels,
+                xsec.spanwise_spacing,
+            )
+
+    return digest.hexdigest()
+
+
+class SystemCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        """Least-recently-used cache of assembled influence systems,
+        bounded in memory.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Memory budget. The least recently used systems are evicted
+            until the cached systems fit in it.
+
+        Attributes
+        ----------
+        hits : int
+        misses : int
+        evictions : int
+        """
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._systems = OrderedDict()
+        self._sizes = dict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._systems)
+
+    def __contains__(self, key):
+        return key in self._systems
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the cached systems."""
+        return sum(self._sizes.values())
+
+    def info(self):
+        """Cache statistics.
+
+        Returns
+        -------
+        dict
+        """
+        with self._lock:
+            info = dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self._systems),
+                nbytes=self.nbytes,
+                max_bytes=self.max_bytes,
+            )
+
+        return info
+
+    def get(self, key, default=None):
+        """Cached system, marked as most recently used.
+
+        Parameters
+        ----------
+        key : hashable
+        default : optional
+
+        Returns
+        -------
+        system or default
+        """
+        with self._lock:
+
+            if key not in self._systems:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._systems.move_to_end(key)
+
+            # Lazily built arrays may have grown the system
+            self._sizes[key] = self._systems[key].nbytes
+            self._evict(keep=key)
+
+            return self._systems[key]
+
+    def put(self, key, system):
+        """Cache a system and evict the least recently used ones.
+
+        Systems larger than the whole budget are not cached, nor systems
+        held on disk, whose files would stay open while cached.
+
+        Parameters
+        ----------
+        key : hashable
+        system : InfluenceSystem-like
+        """
+        if getattr(system, "disk_nbytes", 0) > 0:
+            return
+
+        nbytes = system.nbytes
+
+        with self._lock:
+
+            if nbytes > self.max_bytes:
+                return
+
+            self._systems[key] = system
+            self._systems.move_to_end(key)
+            self._sizes[key] = nbytes
+
+            self._evict(keep=key)
+
+    def get_or_assemble(self, key, assemble):
+        """Cached system, assembling and caching it on a miss.
+
+        Parameters
+        ----------
+        key : hashable
+        assemble : callable
+            Returns the system for the key.
+
+        Returns
+        -------
+        system
+        """
+        system = self.get(key)
+
+        if system is None:
+            system = assemble()
+            self.put(key, system)
+
+        return system
+
+    def clear(self):
+        """Drop all the systems and reset the statistics."""
+
+        with self._lock:
+            self._systems.clear()
+            self._sizes.clear()
+
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def _evict(self, keep=None):
+        """Evict least recently used systems until the budget is met."""
+
+        while self.nbytes > self.max_bytes:
+
+            key = next(iter(self._systems))
+
+            if key == keep:
+                break
+
+            del self._systems[key]
+            del self._sizes[key]
+
+            self.evictions += 1
+
+
+# Process-wide cache shared by the solvers
+SYSTEM_CACHE = SystemCache()
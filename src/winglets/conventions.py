@@ -26,3 +26,19 @@ class WingletParameters(Enum):
     ANGLE_TWIST_ROOT = 5
     ANGLE_TWIST_TIP = 6
     AIRFOIL = "wingletAirfoil"
+
+
+class MeshParameters(Enum):
+
+    CHORDWISE_PANELS = "chordwisePanels"
+    CHORDWISE_SPACING = "chordwiseSpacing"
+    SPANWISE_PANELS = "spanwisePanels"
+    SPANWISE_SPACING = "spanwiseSpacing"
+
+
+class WingletGeometry(Enum):
+
+    LOCATION = "location"
+    ROOT = "root"
+    TIP = "tip"
+    AIRFOIL = "airfoil"
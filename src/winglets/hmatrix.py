@@ -0,0 +1,590 @@
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+from winglets.vlm import (
+    TILE_BYTES,
+    InfluenceSystem,
+    array_nbytes,
+    gmres_solve,
+    induced_velocities,
+    influence_matrix,
+    map_tiles,
+    resolve_workers,
+)
+
+# Items of the leaf clusters
+LEAF_SIZE = 48
+
+# Relative accuracy of the low-rank blocks
+ACA_TOL = 1e-8
+
+# Admissibility parameter, min(diameters) <= ETA * distance
+ETA = 1.0
+
+
+class Cluster:
+    def __init__(self, indices, lower, upper, children=()):
+        """Node of a cluster tree.
+
+        Parameters
+        ----------
+        indices : numpy.array
+            Items of the cluster.
+        lower : numpy.array
+            (3,) lower corner of the bounding box.
+        upper : numpy.array
+            (3,) upper corner of the bounding box.
+        children : tuple of Cluster
+        """
+        self.indices = indices
+        self.lower = lower
+        self.upper = upper
+        self.children = children
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def is_leaf(self):
+        return not self.children
+
+    @property
+    def diameter(self):
+        return np.linalg.norm(self.upper - self.lower)
+
+    def distance(self, other):
+        """Distance between the bounding boxes of two clusters."""
+        gaps = np.maximum(
+            0.0, np.maximum(self.lower - other.upper, other.lower - self.upper)
+        )
+        return np.linalg.norm(gaps)
+
+    def leaves(self):
+        """Leaf clusters, in tree order."""
+
+        if self.is_leaf:
+            return [self]
+
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+
+def cluster_tree(centers, lower=None, upper=None, leaf_size=LEAF_SIZE):
+    """Cluster tree by recursive bisection along the largest extent.
+
+    Parameters
+    ----------
+    centers : numpy.array
+        (N, 3) item locations used to split the clusters.
+    lower : numpy.array, optional
+        (N, 3) lower corner of the item extents, by default the centers.
+    upper : numpy.array, optional
+        (N, 3) upper corner of the item extents, by default the centers.
+    leaf_size : int
+
+    Returns
+    -------
+    Cluster
+    """
+    lower = centers if lower is None else lower
+    upper = centers if upper is None else upper
+
+    def _build(indices):
+
+        box_lower = lower[indices].min(axis=0)
+        box_upper = upper[indices].max(axis=0)
+
+        if len(indices) <= leaf_size:
+            return Cluster(indices, box_lower, box_upper)
+
+        _centers = centers[indices]
+        axis = np.argmax(np.ptp(_centers, axis=0))
+
+        order = indices[np.argsort(_centers[:, axis], kind="stable")]
+        half = len(order) // 2
+
+        children = (_build(order[:half]), _build(order[half:]))
+
+        return Cluster(indices, box_lower, box_upper, children)
+
+    return _build(np.arange(len(centers)))
+
+
+def adaptive_cross_approximation(
+    entries, n_rows, n_columns, tol=ACA_TOL, max_rank=None
+):
+    """Low-rank approximation U @ V of a block from a few of its rows and
+    columns, by adaptive cross approximation with partial pivoting.
+
+    Parameters
+    ----------
+    entries : callable
+        entries(rows, columns) returns the block entries at integer
+        row and column positions.
+    n_rows : int
+    n_columns : int
+    tol : float
+        Accuracy relative to the Frobenius norm of the block.
+    max_rank : int, optional
+        By default half the smallest block dimension.
+
+    Returns
+    -------
+    U : numpy.array or None
+        (n_rows, r), None if the block is not approximated within max_rank.
+    V : numpy.array or None
+        (r, n_columns)
+    """
+    if max_rank is None:
+        max_rank = min(n_rows, n_columns) // 2
+
+    all_rows = np.arange(n_rows)
+    all_columns = np.arange(n_columns)
+
+    U = np.empty((n_rows, 0))
+    V = np.empty((0, n_columns))
+
+    norm_squared = 0.0
+    used_rows = np.zeros(n_rows, dtype=bool)
+    row = 0
+
+    while len(V) < max_rank:
+
+        used_rows[row] = True
+
+        residual_row = entries([row], all_columns)[0] - U[row] @ V
+        column = np.argmax(np.abs(residual_row))
+        pivot = residual_row[column]
+
+        if pivot != 0.0:
+
+            v = residual_row / pivot
+            u = entries(all_rows, [column])[:, 0] - U @ V[:, column]
+
+            # Frobenius norm of the approximation, updated
+            norm_squared += 2.0 * np.sum((U.T @ u) * (V @ v)) + (u @ u) * (v @ v)
+
+            U = np.column_stack((U, u))
+            V = np.vstack((V, v))
+
+            if np.linalg.norm(u) * np.linalg.norm(v) <= tol * np.sqrt(norm_squared):
+                return U, V
+
+        # Every row is reproduced exactly
+        if used_rows.all():
+            return U, V
+
+        if pivot != 0.0:
+            row = np.argmax(np.where(used_rows, -1.0, np.abs(u)))
+        else:
+            row = np.argmin(used_rows)
+
+    return None, None
+
+
+class HMatrix:
+    def __init__(
+        self,
+        entries,
+        row_tree,
+        column_tree,
+        tol=ACA_TOL,
+        eta=ETA,
+        workers=1,
+    ):
+        """Hierarchical matrix, with admissible blocks compressed by
+        adaptive cross approximation.
+
+        Blocks of row and column clusters that are far apart relative to
+        their size are numerically low rank and stored as U @ V. The
+        remaining blocks between leaf clusters are stored dense. Storage
+        and products scale as O(N log N) for a kernel that decays with the
+        distance.
+
+        Parameters
+        ----------
+        entries : callable
+            entries(rows, columns) returns the matrix entries at integer
+            row and column indices.
+        row_tree : Cluster
+        column_tree : Cluster
+        tol : float
+            Accuracy of the low-rank blocks relative to their norm.
+        eta : float
+            Admissibility parameter.
+        workers : int or None, default 1
+            Threads compressing the blocks, None for all the CPUs.
+        """
+        self.shape = (len(row_tree), len(column_tree))
+        self.tol = tol
+        self.eta = eta
+
+        self.dense_blocks = []
+        self.low_rank_blocks = []
+
+        blocks = list(self._partition(row_tree, column_tree))
+
+        def _compress(block):
+            self._add_block(entries, *block)
+
+        map_tiles(_compress, blocks, resolve_workers(workers))
+
+    def _partition(self, rows, columns):
+        """Blocks of the block cluster tree, with their admissibility."""
+
+        if min(rows.diameter, columns.diameter) <= self.eta * rows.distance(columns):
+            yield rows, columns, True
+        elif rows.is_leaf or columns.is_leaf:
+            yield rows, columns, False
+        else:
+            for row_child in rows.children:
+                for column_child in columns.children:
+                    yield from self._partition(row_child, column_child)
+
+    def _add_block(self, entries, rows, columns, admissible):
+        """Compress an admissible block, store it dense if not admissible
+        or not compressible."""
+
+        row_indices = rows.indices
+        column_indices = columns.indices
+
+        U = None
+        if admissible:
+
+            U, V = adaptive_cross_approximation(
+                lambda i, j: entries(row_indices[i], column_indices[j]),
+                len(row_indices),
+                len(column_indices),
+                tol=self.tol,
+            )
+
+        # list.append is thread safe
+        if U is None:
+            block = entries(row_indices, column_indices)
+            self.dense_blocks.append((row_indices, column_indices, block))
+        else:
+            self.low_rank_blocks.append((row_indices, column_indices, U, V))
+
+    @property
+    def nbytes(self):
+        """Memory held by the blocks."""
+        return array_nbytes(self.dense_blocks, self.low_rank_blocks)
+
+    @property
+    def compression(self):
+        """Stored entries relative to the dense matrix."""
+        return self.nbytes / (8.0 * self.shape[0] * self.shape[1])
+
+    def matvec(self, x):
+        """Product with vectors.
+
+        Parameters
+        ----------
+        x : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+            (M,) or (M, K)
+        """
+        y = np.zeros(self.shape[:1] + np.shape(x)[1:])
+
+        for rows, columns, block in self.dense_blocks:
+            y[rows] += block @ x[columns]
+
+        for rows, columns, U, V in self.low_rank_blocks:
+            y[rows] += U @ (V @ x[columns])
+
+        return y
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+    def toarray(self):
+        """Dense matrix of the blocks, with O(M N) memory.
+
+        Returns
+        -------
+        numpy.array
+            (M, N)
+        """
+        matrix = np.zeros(self.shape)
+
+        for rows, columns, block in self.dense_blocks:
+            matrix[np.ix_(rows, columns)] = block
+
+        for rows, columns, U, V in self.low_rank_blocks:
+            matrix[np.ix_(rows, columns)] = U @ V
+
+        return matrix
+
+
+class HierarchicalSystem(InfluenceSystem):
+
+    RTOL = 1e-10
+    MAX_ITER = 1000
+    RESTART = 50
+
+    def __init__(
+        self,
+        lattice,
+        reference,
+        symmetric=False,
+        tile_bytes=TILE_BYTES,
+        workers=1,
+        tol=ACA_TOL,
+        leaf_size=LEAF_SIZE,
+    ):
+        """Vortex lattice system with hierarchical-matrix influence
+        operators, solved by GMRES.
+
+        The normal-wash influence matrix and the induced velocities at the
+        vortex centers are not formed by the solves and products. Their
+        far-field blocks, such as the interaction of the inboard planform
+        with the winglet, are compressed by adaptive cross approximation.
+        The dense diagonal leaf blocks are factorized as a block Jacobi
+        preconditioner.
+
+        Columns are clustered with their trailing legs, whose bounding
+        boxes extend to infinity downstream.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+        tile_bytes : int, optional
+            Unused, the blocks are small.
+        workers : int or None, default 1
+            Threads compressing the blocks, None for all the CPUs.
+        tol : float
+            Accuracy of the low-rank blocks.
+        leaf_size : int
+            Panels of the leaf clusters.
+        """
+        super().__init__(
+            lattice=lattice,
+            reference=reference,
+            symmetric=symmetric,
+            tile_bytes=tile_bytes,
+            workers=workers,
+        )
+
+        self.tol = tol
+        self.leaf_size = leaf_size
+
+        self._row_tree = None
+        self._column_tree = None
+        self._blocks = None
+        self._velocity_operator = None
+
+    @property
+    def nbytes(self):
+        nbytes = array_nbytes(vars(self), vars(self.lattice))
+
+        for operator in (self.AIC, self._velocity_operator):
+            if operator is not None:
+                nbytes += operator.nbytes
+
+        return nbytes
+
+    def _entries(self, rows, columns):
+        """Entries of the normal-wash influence matrix."""
+
+        lattice = self.lattice
+
+        return influence_matrix(
+            lattice.collocation_points[rows],
+            lattice.normal_directions[rows],
+            lattice.left_vortex_vertices[columns],
+            lattice.right_vortex_vertices[columns],
+            symmetric=self.symmetric,
+            tile_bytes=None,
+        )
+
+    def _get_column_tree(self):
+        """Cluster tree of the horseshoe vortices."""
+
+        if self._column_tree is None:
+
+            lattice = self.lattice
+
+            left = lattice.left_vortex_vertices
+            right = lattice.right_vortex_vertices
+
+            upper = np.maximum(left, right)
+            upper[:, 0] = np.inf
+
+            self._column_tree = cluster_tree(
+                lattice.vortex_centers,
+                lower=np.minimum(left, right),
+                upper=upper,
+                leaf_size=self.leaf_size,
+            )
+
+        return self._column_tree
+
+    def assemble(self):
+        """Compress the influence matrix and factorize the preconditioner."""
+
+        self._row_tree = cluster_tree(
+            self.lattice.collocation_points, leaf_size=self.leaf_size
+        )
+
+        self.AIC = HMatrix(
+            self._entries,
+            self._row_tree,
+            self._get_column_tree(),
+            tol=self.tol,
+            workers=self.workers,
+        )
+
+        return self.factorize()
+
+    def factorize(self):
+        """LU-factorize the diagonal blocks of the row leaf clusters."""
+
+        self._blocks = []
+        for leaf in self._row_tree.leaves():
+            block = self._entries(leaf.indices, leaf.indices)
+            self._blocks.append((leaf.indices, lu_factor(block)))
+
+        return self
+
+    def _precondition(self, x):
+        """Block Jacobi preconditioner."""
+
+        y = np.empty_like(x)
+        for indices, lu_piv in self._blocks:
+            y[indices] = lu_solve(lu_piv, x[indices])
+
+        return y
+
+    def solve(self, rhs):
+        """Vortex strengths for normal-wash right-hand sides.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+
+        Raises
+        ------
+        ValueError
+            If GMRES does not converge.
+        """
+        strengths, _ = self.solve_with_iterations(rhs)
+
+        return strengths
+
+    def solve_with_iterations(self, rhs, warm_start=None):
+        """Vortex strengths and GMRES iterations of normal-wash right-hand
+        sides. Nothing is stored on the system, which may be shared.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+        warm_start : winglets.vlm.WarmStart, optional
+            Initial guesses, updated with the solution.
+
+        Returns
+        -------
+        strengths : numpy.array
+        iterations : list of int
+            Iterations of every right-hand side.
+
+        Raises
+        ------
+        ValueError
+            If GMRES does not converge.
+        """
+        x0 = None if warm_start is None else warm_start.get(np.shape(rhs))
+
+        strengths, iterations = gmres_solve(
+            self.AIC.matvec,
+            self._precondition,
+            rhs,
+            x0=x0,
+            rtol=self.RTOL,
+            restart=self.RESTART,
+            maxiter=self.MAX_ITER,
+        )
+
+        if warm_start is not None:
+            warm_start.put(strengths)
+
+        return strengths, iterations
+
+    @property
+    def velocity_operator(self):
+        """Hierarchical (3N, N) influence of the vortices on the velocity
+        components at the vortex centers, row 3 i + k being the component
+        k at the center i."""
+
+        if self._velocity_operator is None:
+
+            lattice = self.lattice
+            centers = np.repeat(lattice.vortex_centers, 3, axis=0)
+
+            def _entries(rows, columns):
+                rows = np.asarray(rows)
+                points, components = np.divmod(rows, 3)
+
+                # One kernel evaluation for the components of every point
+                points, inverse = np.unique(points, return_inverse=True)
+
+                velocities = induced_velocities(
+                    lattice.vortex_centers[points],
+                    lattice.left_vortex_vertices[columns],
+                    lattice.right_vortex_vertices[columns],
+                    symmetric=self.symmetric,
+                    tile_bytes=None,
+                )
+
+                return velocities[inverse, :, components]
+
+            self._velocity_operator = HMatrix(
+                _entries,
+                cluster_tree(centers, leaf_size=3 * self.leaf_size),
+                self._get_column_tree(),
+                tol=self.tol,
+                workers=self.workers,
+            )
+
+        return self._velocity_operator
+
+    @property
+    def Vij_centers(self):
+        """Induced velocity influence at the vortex centers, (N, N, 3),
+        expanded from the velocity operator. Takes O(N^2) memory, products
+        should use `induced_velocity_at_centers`."""
+
+        if self._Vij_centers is None:
+            n_panels = self.lattice.n_panels
+            matrix = self.velocity_operator.toarray().reshape(n_panels, 3, n_panels)
+            self._Vij_centers = np.ascontiguousarray(matrix.transpose(0, 2, 1))
+
+        return self._Vij_centers
+
+    def induced_velocity_at_centers(self, strengths):
+        """Induced velocity at the vortex centers.
+
+        Parameters
+        ----------
+        strengths : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+            (N, 3) or (N, 3, K)
+        """
+        velocities = self.velocity_operator.matvec(strengths)
+        shape = (self.lattice.n_panels, 3) + np.shape(strengths)[1:]
+
+        return velocities.reshape(shape)
@@ -1,8 +1,17 @@
+import copy
+from functools import lru_cache
+
 import aerosandbox as sbx
 import numpy as np
 from Geometry import Point
 
-from winglets.conventions import WingletParameters, WingSectionParameters
+from winglets.conventions import (
+    MeshParameters,
+    WingletGeometry,
+    WingletParameters,
+    WingSectionParameters,
+)
+from winglets.vlm import SPACING_COSINE, SPACING_UNIFORM
 
 # Extract conventions
 CHORD = WingSectionParameters.CHORD.value
@@ -19,22 +28,74 @@ W_CHORD_ROOT = WingletParameters.CHORD_ROOT.value
 W_TAPER_RATIO = WingletParameters.TAPER_RATIO.value
 W_AIRFOIL = WingletParameters.AIRFOIL.value
 
+CHORDWISE_PANELS = MeshParameters.CHORDWISE_PANELS.value
+CHORDWISE_SPACING = MeshParameters.CHORDWISE_SPACING.value
+SPANWISE_PANELS = MeshParameters.SPANWISE_PANELS.value
+SPANWISE_SPACING = MeshParameters.SPANWISE_SPACING.value
+
+# aerosandbox defaults
+DEFAULT_MESH = {
+    CHORDWISE_PANELS: 10,
+    CHORDWISE_SPACING: SPACING_COSINE,
+    SPANWISE_PANELS: 10,
+    SPANWISE_SPACING: SPACING_COSINE,
+}
+
+
+@lru_cache(maxsize=None)
+def get_airfoil(name):
+    """Airfoil shared by the whole process, built once per name.
+
+    Its coordinate and camber arrays are read-only, so that the models and
+    threads sharing it cannot modify them.
+
+    Parameters
+    ----------
+    name : str
+        aerosandbox airfoil name, "naca4412" for instance.
+
+    Returns
+    -------
+    aerosandbox.Airfoil
+    """
+    airfoil = sbx.Airfoil(name=name)
+
+    for array in vars(airfoil).values():
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+
+    return airfoil
+
 
 class FlyingWing:
 
     NAME = "flying_wing"
 
-    def __init__(self, sections, winglet_parameters=None):
+    def __init__(
+        self, sections, winglet_parameters=None, planform_mesh=None, winglet_mesh=None
+    ):
         """Wing planform implementation.
 
         Parameters
         ----------
         sections : list of dicts
         winglet : dict
+        planform_mesh : dict, optional
+            Panels and spacing of the planform lattice, by MeshParameters
+            value. Missing values take the aerosandbox defaults, 10 cosine
+            spaced panels in each direction. Spanwise values apply to
+            every planform section.
+        winglet_mesh : dict, optional
+            Panels and spacing of the winglet lattice.
 
         Attributes
         ----------
         planform : aerosandbox.Wing
+
+        Raises
+        ------
+        ValueError
+            If a mesh setting is unknown or invalid.
         """
         # Store sections sorted by span-wise direction
         self.sections = self.__sort_sections__(sections)
@@ -42,17 +103,177 @@ class FlyingWing:
         # Store winglet configuration
         self.winglet_parameters = winglet_parameters
 
+        # Store discretization
+        self.planform_mesh = self.__get_mesh__(planform_mesh)
+        self.winglet_mesh = self.__get_mesh__(winglet_mesh)
+
         self.planform = None
         self.winglet = None
         self.winglet_dimensions = dict()
 
         self.__winglet_created__ = False
 
+    def refine(self, factor):
+        """Copy of the flying wing with its panel counts scaled.
+
+        The planform and winglet are created if they exist in this one.
+
+        Parameters
+        ----------
+        factor : float
+
+        Returns
+        -------
+        FlyingWing
+        """
+
+        def _scale(mesh):
+            mesh = mesh.copy()
+            for key in [CHORDWISE_PANELS, SPANWISE_PANELS]:
+                mesh[key] = max(int(round(factor * mesh[key])), 1)
+            return mesh
+
+        winglet_parameters = self.winglet_parameters
+        if winglet_parameters is not None:
+            winglet_parameters = winglet_parameters.copy()
+
+        model = type(self)(
+            sections=self.sections,
+            winglet_parameters=winglet_parameters,
+            planform_mesh=_scale(self.planform_mesh),
+            winglet_mesh=_scale(self.winglet_mesh),
+        )
+
+        if self.planform is not None:
+            model.create_wing_planform()
+
+        if self.__winglet_created__ == True:
+            model.create_winglet()
+
+        return model
+
+    def with_winglet(self, parameters):
+        """Copy of the flying wing with a new winglet, leaving this one
+        untouched.
+
+        The planform is shared with the copy.
+
+        Parameters
+        ----------
+        parameters : dict
+            Winglet parameters.
+
+        Returns
+        -------
+        FlyingWing
+        """
+        model = copy.copy(self)
+
+        model.winglet_parameters = parameters.copy()
+        model.winglet_dimensions = dict()
+        model.create_winglet()
+
+        return model
+
+    def stretched(self, factor):
+        """Copy of the flying wing stretched along x, keeping the surface
+        slopes.
+
+        Leading edge x coordinates and chords are scaled, twists and
+        airfoils are kept. This is the Prandtl-Glauert (Goethert) affine
+        wing with factor 1 / beta.
+
+        Parameters
+        ----------
+        factor : float
+
+        Returns
+        -------
+        FlyingWing
+        """
+        model = copy.copy(self)
+
+        if self.planform is not None:
+            model.planform = self.__stretch_wing__(self.planform, factor)
+
+        if self.winglet is not None:
+            model.winglet = [
+                self.__stretch_wing__(winglet, factor) for winglet in self.winglet
+            ]
+
+        return model
+
+    @staticmethod
+    def __stretch_wing__(wing, factor):
+        """Copy of an aerosandbox.Wing stretched along x."""
+
+        scaling = np.array([factor, 1.0, 1.0])
+
+        xsecs = [
+            sbx.WingXSec(
+                xyz_le=list(np.asarray(xsec.xyz_le, dtype=float) * scaling),
+                chord=xsec.chord * factor,
+                twist=xsec.twist,
+                airfoil=xsec.airfoil,
+                control_surface_type=xsec.control_surface_type,
+                control_surface_hinge_point=xsec.control_surface_hinge_point,
+                control_surface_deflection=xsec.control_surface_deflection,
+                spanwise_panels=xsec.spanwise_panels,
+                spanwise_spacing=xsec.spanwise_spacing,
+            )
+            for xsec in wing.xsecs
+        ]
+
+        return sbx.Wing(
+            name=wing.name,
+            xyz_le=list(np.asarray(wing.xyz_le, dtype=float) * scaling),
+            symmetric=wing.symmetric,
+            xsecs=xsecs,
+            chordwise_panels=wing.chordwise_panels,
+            chordwise_spacing=wing.chordwise_spacing,
+        )
+
     @staticmethod
     def __sort_sections__(sections):
         _sort_func = lambda section: section[LE_LOCATION].y
         return sorted(sections, key=_sort_func)
 
+    @staticmethod
+    def __get_mesh__(mesh):
+        """Complete and validate mesh settings.
+
+        Parameters
+        ----------
+        mesh : dict or None
+
+        Returns
+        -------
+        dict
+
+        Raises
+        ------
+        ValueError
+        """
+        mesh = {} if mesh is None else mesh
+
+        unknown = set(mesh) - set(DEFAULT_MESH)
+        if unknown:
+            raise ValueError(f"Unknown mesh settings {sorted(unknown)}.")
+
+        mesh = {**DEFAULT_MESH, **mesh}
+
+        for key in [CHORDWISE_PANELS, SPANWISE_PANELS]:
+            if int(mesh[key]) != mesh[key] or mesh[key] < 1:
+                raise ValueError(f"'{key}' must be a positive integer.")
+
+        for key in [CHORDWISE_SPACING, SPANWISE_SPACING]:
+            if mesh[key] not in (SPACING_UNIFORM, SPACING_COSINE):
+                raise ValueError(
+                    f"'{key}' must be '{SPACING_UNIFORM}' or '{SPACING_COSINE}'."
+                )
+
+        return mesh
+
     @property
     def __wingtip_section__(self):
         # Get furthest section
@@ -102,19 +323,23 @@ class FlyingWing:
         aerosanbox.Wing
         """
 
+        mesh = self.planform_mesh
+
         # Create sections
         sections = []
 
         for _section in self.sections:
 
             _coordinates = list(_section[LE_LOCATION])
-            _airfoil = sbx.Airfoil(name=_section[AIRFOIL])
+            _airfoil = get_airfoil(_section[AIRFOIL])
 
             _sbx_section = sbx.WingXSec(
                 xyz_le=_coordinates,  # Coordinates of the XSec's leading edge, **relative** to the wing's leading edge.
                 chord=_section[CHORD],
                 twist=_section[TWIST],  # degrees
                 airfoil=_airfoil,
+                spanwise_panels=mesh[SPANWISE_PANELS],
+                spanwise_spacing=mesh[SPANWISE_SPACING],
             )
 
             sections.append(_sbx_section)
@@ -125,6 +350,8 @@ class FlyingWing:
             xyz_le=[0.0, 0.0, 0.0],  # Coordinates of the wing's leading edge
             symmetric=True,
             xsecs=sections,
+            chordwise_panels=mesh[CHORDWISE_PANELS],
+            chordwise_spacing=mesh[CHORDWISE_SPACING],
         )
 
         self.planform = planform
@@ -134,7 +361,72 @@ class FlyingWing:
     def create_winglet(self):
         """Create winglet according to parametrization."""
 
-        # Compute dimensions based on wing referenced values
+        self.__update_winglet_dimensions__()
+
+        self._create_winglet()
+
+        self.__winglet_created__ = True
+
+    def update_winglet(self, parameters):
+        """Update the winglet in place for new parameters.
+
+        Only the winglet location, cross section coordinates, chords,
+        twists and airfoil that change are set on the existing
+        aerosandbox objects, instead of rebuilding the winglet. Copies
+        sharing the winglet objects see the change. The winglet is
+        created if it does not exist.
+
+        Parameters
+        ----------
+        parameters : dict
+            Winglet parameters, missing ones keep their value.
+
+        Returns
+        -------
+        set of WingletGeometry
+            Parts of the winglet geometry that changed, empty if none.
+        """
+        self.winglet_parameters = {**(self.winglet_parameters or {}), **parameters}
+
+        if self.__winglet_created__ == False:
+            self.create_winglet()
+            return set(WingletGeometry)
+
+        self.__update_winglet_dimensions__()
+        geometry = self.__winglet_geometry__()
+
+        winglet = self.winglet[0]
+        root, tip = winglet.xsecs
+
+        changed = set()
+
+        if not np.array_equal(winglet.xyz_le, geometry["location"]):
+            winglet.xyz_le = np.array(geometry["location"])
+            changed.add(WingletGeometry.LOCATION)
+
+        if (root.chord, root.twist) != (geometry["chord_root"], geometry["twist_root"]):
+            root.chord = geometry["chord_root"]
+            root.twist = geometry["twist_root"]
+            changed.add(WingletGeometry.ROOT)
+
+        if not np.array_equal(tip.xyz_le, geometry["location_tip"]) or (
+            tip.chord,
+            tip.twist,
+        ) != (geometry["chord_tip"], geometry["twist_tip"]):
+            tip.xyz_le = np.array(geometry["location_tip"])
+            tip.chord = geometry["chord_tip"]
+            tip.twist = geometry["twist_tip"]
+            changed.add(WingletGeometry.TIP)
+
+        if root.airfoil is not geometry["airfoil"]:
+            root.airfoil = tip.airfoil = geometry["airfoil"]
+            changed.add(WingletGeometry.AIRFOIL)
+
+        return changed
+
+    def __update_winglet_dimensions__(self):
+        """Compute dimensions based on wing referenced values."""
+
         parameters = self.winglet_parameters
 
         # Chords
@@ -147,10 +439,6 @@ class FlyingWing:
         # Length
         self.winglet_dimensions["length"] = self.span * parameters[W_SPAN]
 
-        self._create_winglet()
-
-        self.__winglet_created__ = True
-
     def remove_winglet(self):
         """Remove winglet from flying wing."""
 
@@ -190,12 +478,13 @@ class FlyingWing:
 
         return vector
 
-    def _create_winglet(self):
-        """Create winglet.
+    def __winglet_geometry__(self):
+        """Winglet location, cross section values and airfoil from the
+        parameters and dimensions.
 
         Returns
         -------
-        aerosandbox.Wing
+        dict
         """
 
         # Extract winglet configuration
@@ -222,29 +511,53 @@ class FlyingWing:
 
         coordinates_weld.x += _section[CHORD] - chord_root
 
-        winglet_airfoil = sbx.Airfoil(name=parameters[W_AIRFOIL])
+        geometry = dict(
+            location=list(coordinates_weld),
+            chord_root=chord_root,
+            twist_root=parameters[W_ANGLE_TWIST_ROOT],
+            location_tip=list(location_tip),
+            chord_tip=chord_tip,
+            twist_tip=parameters[W_ANGLE_TWIST_TIP],
+            airfoil=get_airfoil(parameters[W_AIRFOIL]),
+        )
+
+        return geometry
+
+    def _create_winglet(self):
+        """Create winglet.
+
+        Returns
+        -------
+        aerosandbox.Wing
+        """
 
-        twist_root = parameters[W_ANGLE_TWIST_ROOT]
-        twist_tip = parameters[W_ANGLE_TWIST_TIP]
+        geometry = self.__winglet_geometry__()
+        mesh = self.winglet_mesh
 
         winglet = sbx.Wing(
             name="Winglet",
-            xyz_le=list(coordinates_weld),
+            xyz_le=geometry["location"],
             symmetric=True,
             xsecs=[
                 sbx.WingXSec(
                     xyz_le=[0, 0, 0],
-                    chord=chord_root,
-                    twist=twist_root,
-                    airfoil=winglet_airfoil,
+                    chord=geometry["chord_root"],
+                    twist=geometry["twist_root"],
+                    airfoil=geometry["airfoil"],
+                    spanwise_panels=mesh[SPANWISE_PANELS],
+                    spanwise_spacing=mesh[SPANWISE_SPACING],
                 ),
                 sbx.WingXSec(
-                    xyz_le=list(location_tip),
-                    chord=chord_tip,
-                    twist=twist_tip,
-                    airfoil=winglet_airfoil,
+                    xyz_le=geometry["location_tip"],
+                    chord=geometry["chord_tip"],
+                    twist=geometry["twist_tip"],
+                    airfoil=geometry["airfoil"],
+                    spanwise_panels=mesh[SPANWISE_PANELS],
+                    spanwise_spacing=mesh[SPANWISE_SPACING],
                 ),
             ],
+            chordwise_panels=mesh[CHORDWISE_PANELS],
+            chordwise_spacing=mesh[CHORDWISE_SPACING],
         )
 
         self.winglet = [winglet]
@@ -1,10 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
 import numpy as np
 from scipy.optimize import minimize
 
 import winglets as wl
+from winglets.backends import VortexLatticeBackend
 from winglets.conventions import OperationPoint, WingletParameters
+from winglets.solver import DragMode, FlightCondition, solve
 
 ALTITUDE = OperationPoint.ALTITUDE.value
 MACH = OperationPoint.MACH.value
@@ -37,7 +40,14 @@ class WingletOptimizer:
     MAX_ITER = 100
 
     def __init__(
-        self, base, target, operation_point, initial_winglet, interpolation_factor=0.5
+        self,
+        base,
+        target,
+        operation_point,
+        initial_winglet,
+        interpolation_factor=0.5,
+        backend=None,
+        drag=DragMode.NEAR_FIELD,
     ):
         """Winglet Optimizer.
 
@@ -48,6 +58,10 @@ class WingletOptimizer:
         operation_point : dict
         initial_winglet : dict
         interpolation_factor : float, default 0.5
+        backend : winglets.backends.SolverBackend, optional
+            Aerodynamic engine shared by all the solvers.
+        drag : DragMode, default DragMode.NEAR_FIELD
+            Induced drag evaluation of the solvers.
         """
 
         # Collect design CL
@@ -59,17 +73,57 @@ class WingletOptimizer:
         self.operation_point = operation_point
         self.interpolation_factor = interpolation_factor
         self.initial_winglet = initial_winglet
+        self.backend = backend
+        self.drag = drag
 
         self.optimum = None
         self.success = None
         self.bounds = None
+        self.optimum_errors = None
 
-    def _create_solver(self, model):
+        # Memos of the target solves, keyed by their solver settings
+        self._target_backend = None
+        self._target_results = None
+
+    def _get_target_backend(self):
+        """Backend of the target solvers.
+
+        Design updates only move the winglet, so a native vortex lattice
+        backend keeps the planform block of the influence matrix and its
+        factorization between them.
+
+        Returns
+        -------
+        winglets.backends.SolverBackend or None
+        """
+        if not isinstance(self.backend, VortexLatticeBackend):
+            return self.backend
+
+        if self._target_backend is None or self._target_backend[0] is not self.backend:
+            backend = self.backend.fresh()
+            backend.partition = True
+
+            self._target_backend = (self.backend, backend)
+
+        return self._target_backend[1]
+
+    def _target_key(self):
+        """Solver settings the target results depend on."""
+        return (
+            self.backend,
+            self.drag,
+            self.CL,
+            tuple(self.operation_point.items()),
+        )
+
+    def _create_solver(self, model, backend=None):
         """Create solver at the operational point.
 
         Parameters
         ----------
         model : winglets.FlyingWing
+        backend : winglets.backends.SolverBackend, optional
+            By default the optimizer backend.
 
         Returns
         -------
@@ -79,7 +133,17 @@ class WingletOptimizer:
         _altitude = self.operation_point[ALTITUDE]
         _mach = self.operation_point[MACH]
 
-        solver = wl.WingSolver(model=model, altitude=_altitude, mach=_mach)
+        if backend is None:
+            backend = self.backend
+
+        solver = wl.WingSolver(
+            model=model,
+            altitude=_altitude,
+            mach=_mach,
+            backend=backend,
+            drag=self.drag,
+            coefficients=[NAME_CD, NAME_CM],
+        )
 
         return solver
 
@@ -90,16 +154,23 @@ class WingletOptimizer:
         ----------
         model : winglets.FlyingWing
         x : np.array
+
+        Returns
+        -------
+        new_parameters : dict
+        changed : set of winglets.conventions.WingletGeometry
+            Parts of the winglet geometry that changed.
         """
 
         new_parameters = self.__dv2param__(x)
 
-        model.winglet_parameters = new_parameters.copy()
+        changed = model.update_winglet(new_parameters)
 
-        model.remove_winglet()
-        model.create_winglet()
+        # The last target results belong to the previous geometry
+        if changed and model is self.target:
+            self._target_results = None
 
-        return new_parameters
+        return new_parameters, changed
 
     def __dv2param__(self, x):
         """From the design vector compute the winglet design parameters.
@@ -204,13 +275,59 @@ class WingletOptimizer:
         """
 
         # Update geometry with new parameters
-        parameters = self._update_wing(model=self.target, x=x)
+        parameters, _ = self._update_wing(model=self.target, x=x)
+
+        # Solve again only if the winglet or the solver settings changed
+        key = self._target_key()
+        if self._target_results is None or self._target_results[0] != key:
+            solver_target = self._create_solver(
+                model=self.target, backend=self._get_target_backend()
+            )
+            self._target_results = (key, self.__solve__(solver_target))
 
-        # Create solver and get solution
-        solver_target = self._create_solver(model=self.target)
-        results = self.__solve__(solver_target)
+        return self._target_results[1].copy(), parameters
 
-        return results, parameters
+    def evaluate_candidates(self, xs, workers=None):
+        """Compute the state of many design vectors on a thread pool.
+
+        The target model is not modified, every candidate is solved on
+        its own copy with the stateless `winglets.solve`.
+
+        Parameters
+        ----------
+        xs : array-like
+            (M, n) design vectors.
+        workers : int, optional
+            Number of threads, by default chosen by the executor.
+
+        Returns
+        -------
+        results : list of dict
+        """
+        condition = FlightCondition(
+            altitude=self.operation_point[ALTITUDE],
+            mach=self.operation_point[MACH],
+            cl=self.CL,
+        )
+
+        def _evaluate(x):
+
+            model = self.target.with_winglet(self.__dv2param__(x))
+
+            problem = solve(
+                model,
+                condition,
+                backend=self.backend,
+                drag=self.drag,
+                coefficients=[NAME_CD, NAME_CM],
+            )
+
+            return {NAME_CD: problem.CDi, NAME_CM: problem.Cm}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate, np.asarray(xs, dtype=float)))
+
+        return results
 
     def set_bounds(self, lower, upper):
         """Create bounds for optimizer.
@@ -291,9 +408,16 @@ class WingletOptimizer:
 
         return optimum
 
-    def evaluate_optimum(self):
+    def evaluate_optimum(self, levels=None):
         """Evaluate problem for optimal solution.
 
+        Parameters
+        ----------
+        levels : int, optional
+            Extrapolate the coefficients from two or three refined meshes,
+            see `WingSolver.solve_cl_richardson`. Their estimated errors
+            are stored in `optimum_errors`.
+
         Returns
         -------
         result : dict
@@ -308,6 +432,16 @@ class WingletOptimizer:
 
         x = self.optimum.x
 
-        results, optimized_parameters = self._compute_state(x=x)
+        if levels is None:
+            results, optimized_parameters = self._compute_state(x=x)
+            return results, optimized_parameters
+
+        optimized_parameters, _ = self._update_wing(model=self.target, x=x)
+
+        solver = self._create_solver(model=self.target)
+        extrapolated, errors = solver.solve_cl_richardson(cl=self.CL, levels=levels)
+
+        results = {NAME_CD: extrapolated[NAME_CD], NAME_CM: extrapolated[NAME_CM]}
+        self.optimum_errors = {NAME_CD: errors[NAME_CD], NAME_CM: errors[NAME_CM]}
 
         return results, optimized_parameters
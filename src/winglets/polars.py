@@ -0,0 +1,350 @@
+import os
+from functools import lru_cache
+
+import aerosandbox as sbx
+import numpy as np
+
+from winglets.model import get_airfoil
+from winglets.vlm import ZERO_LIFT_POINTS, zero_lift_angle
+
+# Grid of the estimated polar tables
+ALPHAS = np.linspace(-10.0, 20.0, 61)
+REYNOLDS = np.geomspace(1.0e5, 1.0e8, 13)
+
+# Semi-empirical polar model
+CL_MAX = 1.5
+DRAG_DUE_TO_LIFT = 0.01
+THICKNESS_POINTS = 101
+
+# On-disk table location, overridden by the WINGLETS_POLARS variable
+POLAR_DIRECTORY = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join("~", ".cache")), "winglets", "polars"
+)
+
+
+class PolarTable:
+    def __init__(self, alpha, reynolds, cl, cd, cm, name=None):
+        """Airfoil lift, drag and moment coefficients tabulated against
+        angle of attack and Reynolds number.
+
+        Parameters
+        ----------
+        alpha : numpy.array
+            (A,) increasing, in degrees.
+        reynolds : numpy.array
+            (R,) increasing.
+        cl, cd, cm : numpy.array
+            (A, R)
+        name : str, optional
+            Airfoil name.
+        """
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.reynolds = np.asarray(reynolds, dtype=float)
+        self.cl = np.asarray(cl, dtype=float)
+        self.cd = np.asarray(cd, dtype=float)
+        self.cm = np.asarray(cm, dtype=float)
+        self.name = name
+
+    @classmethod
+    def load(cls, path):
+        """Read a table saved with `save`.
+
+        Parameters
+        ----------
+        path : str
+
+        Returns
+        -------
+        PolarTable
+        """
+        with np.load(path) as data:
+            name = str(data["name"]) if "name" in data else None
+            return cls(
+                alpha=data["alpha"],
+                reynolds=data["reynolds"],
+                cl=data["cl"],
+                cd=data["cd"],
+                cm=data["cm"],
+                name=name,
+            )
+
+    def save(self, path):
+        """Write the table to a .npz file.
+
+        Parameters
+        ----------
+        path : str
+        """
+        arrays = dict(
+            alpha=self.alpha,
+            reynolds=self.reynolds,
+            cl=self.cl,
+            cd=self.cd,
+            cm=self.cm,
+        )
+        if self.name is not None:
+            arrays["name"] = np.array(self.name)
+
+        np.savez(path, **arrays)
+
+    @classmethod
+    def estimate(cls, airfoil, alpha=ALPHAS, reynolds=REYNOLDS):
+        """Semi-empirical polar of an airfoil, without viscous analysis.
+
+        Thin airfoil theory lift and quarter-chord moment, capped at
+        CL_MAX, and the turbulent flat plate skin friction
+        Cf = 0.074 Re^-0.2 with a thickness form factor, plus a quadratic
+        drag due to lift.
+
+        Parameters
+        ----------
+        airfoil : aerosandbox.Airfoil
+        alpha : numpy.array, optional
+            In degrees.
+        reynolds : numpy.array, optional
+
+        Returns
+        -------
+        PolarTable
+        """
+        alpha = np.asarray(alpha, dtype=float)
+        reynolds = np.asarray(reynolds, dtype=float)
+
+        xsec = sbx.WingXSec(xyz_le=[0.0, 0.0, 0.0], chord=1.0, airfoil=airfoil)
+        alpha_zero = zero_lift_angle(xsec)
+
+        # Quarter-chord moment, cm = 1/2 int dz/dx (cos(2 theta) - cos(theta))
+        theta = np.linspace(0.0, np.pi, ZERO_LIFT_POINTS + 1)
+        mcl = airfoil.get_downsampled_mcl(0.5 * (1.0 - np.cos(theta)))
+        slopes = np.diff(mcl[:, 1]) / np.diff(mcl[:, 0])
+        theta_mid = 0.5 * (theta[1:] + theta[:-1])
+        cm_zero = 0.5 * np.sum(
+            slopes * (np.cos(2.0 * theta_mid) - np.cos(theta_mid)) * np.diff(theta)
+        )
+
+        thickness = np.max(
+            airfoil.get_thickness_at_chord_fraction(
+                np.linspace(0.0, 1.0, THICKNESS_POINTS)
+            )
+        )
+        form_factor = 1.0 + 2.0 * thickness + 60.0 * thickness**4
+
+        cl_inviscid = 2.0 * np.pi * np.sin(np.deg2rad(alpha) - alpha_zero)
+        cl = np.clip(cl_inviscid, -CL_MAX, CL_MAX)
+
+        cd_zero = 2.0 * 0.074 * reynolds**-0.2 * form_factor
+        cd = cd_zero[None, :] + DRAG_DUE_TO_LIFT * cl_inviscid[:, None] ** 2
+
+        shape = (len(alpha), len(reynolds))
+
+        return cls(
+            alpha=alpha,
+            reynolds=reynolds,
+            cl=np.broadcast_to(cl[:, None], shape),
+            cd=cd,
+            cm=np.full(shape, cm_zero),
+            name=airfoil.name,
+        )
+
+    def _reynolds_weights(self, reynolds):
+        """Bracketing columns and linear weights in log Reynolds number,
+        clipped to the table."""
+
+        log_reynolds = np.log(self.reynolds)
+        values = np.clip(np.log(reynolds), log_reynolds[0], log_reynolds[-1])
+
+        upper = np.clip(np.searchsorted(log_reynolds, values), 1, len(log_reynolds) - 1)
+        lower = upper - 1
+
+        weights = (values - log_reynolds[lower]) / (
+            log_reynolds[upper] - log_reynolds[lower]
+        )
+
+        return lower, upper, weights
+
+    def interpolate(self, alpha, reynolds):
+        """Coefficients at angles of attack and Reynolds numbers, bilinear
+        in alpha and log Reynolds number and clipped to the table.
+
+        Parameters
+        ----------
+        alpha : float or numpy.array
+            In degrees.
+        reynolds : float or numpy.array
+
+        Returns
+        -------
+        cl, cd, cm : numpy.array
+            With the broadcast shape of the inputs.
+        """
+        alpha, reynolds = np.broadcast_arrays(
+            np.asarray(alpha, dtype=float), np.asarray(reynolds, dtype=float)
+        )
+
+        values = np.clip(alpha, self.alpha[0], self.alpha[-1])
+        upper = np.clip(np.searchsorted(self.alpha, values), 1, len(self.alpha) - 1)
+        lower = upper - 1
+        alpha_weights = (values - self.alpha[lower]) / (
+            self.alpha[upper] - self.alpha[lower]
+        )
+
+        column_lower, column_upper, reynolds_weights = self._reynolds_weights(reynolds)
+
+        def _bilinear(table):
+            low = (1.0 - alpha_weights) * table[lower, column_lower] + (
+                alpha_weights * table[upper, column_lower]
+            )
+            high = (1.0 - alpha_weights) * table[lower, column_upper] + (
+                alpha_weights * table[upper, column_upper]
+            )
+            return (1.0 - reynolds_weights) * low + reynolds_weights * high
+
+        return _bilinear(self.cl), _bilinear(self.cd), _bilinear(self.cm)
+
+    def profile_drag(self, cl, reynolds):
+        """Drag coefficient at lift coefficients, through the attached flow
+        part of the lift curve of every Reynolds number column.
+
+        Parameters
+        ----------
+        cl : float or numpy.array
+        reynolds : float or numpy.array
+
+        Returns
+        -------
+        numpy.array
+            With the broadcast shape of the inputs.
+        """
+        cl, reynolds = np.broadcast_arrays(
+            np.asarray(cl, dtype=float), np.asarray(reynolds, dtype=float)
+        )
+
+        lower, upper, weights = self._reynolds_weights(reynolds)
+
+        # Drag of every point at every column, the columns are few
+        cd = np.empty(cl.shape + (len(self.reynolds),))
+        for column in np.unique(np.concatenate((lower.ravel(), upper.ravel()))):
+
+            lift = self.cl[:, column]
+            attached = slice(np.argmin(lift), np.argmax(lift) + 1)
+
+            cd[..., column] = np.interp(cl, lift[attached], self.cd[attached, column])
+
+        low = np.take_along_axis(cd, lower[..., None], axis=-1)[..., 0]
+        high = np.take_along_axis(cd, upper[..., None], axis=-1)[..., 0]
+
+        return (1.0 - weights) * low + weights * high
+
+
+def _resolve_directory(directory):
+    """Polar table directory, by default from the environment."""
+    if directory is None:
+        directory = os.environ.get("WINGLETS_POLARS", POLAR_DIRECTORY)
+
+    return os.path.expanduser(directory)
+
+
+def polar_table(name, directory=None):
+    """Polar table of an airfoil, shared by the whole process.
+
+    Read from `<directory>/<name>.npz`. Tables that are not on disk are
+    estimated in memory with `PolarTable.estimate`, nothing is written;
+    use `save_polar_tables` or tables from a viscous analysis to fill the
+    directory.
+
+    Parameters
+    ----------
+    name : str
+        aerosandbox airfoil name.
+    directory : str, optional
+        By default the WINGLETS_POLARS environment variable or
+        POLAR_DIRECTORY, read at every call.
+
+    Returns
+    -------
+    PolarTable
+    """
+    return _polar_table(name, _resolve_directory(directory))
+
+
+@lru_cache(maxsize=None)
+def _polar_table(name, directory):
+    path = os.path.join(directory, f"{name}.npz")
+
+    if os.path.exists(path):
+        return PolarTable.load(path)
+
+    return PolarTable.estimate(get_airfoil(name))
+
+
+def save_polar_tables(names, directory=None, overwrite=False):
+    """Estimate the polar tables of airfoils and write them to disk.
+
+    Parameters
+    ----------
+    names : list of str
+        aerosandbox airfoil names.
+    directory : str, optional
+        By default the WINGLETS_POLARS environment variable or
+        POLAR_DIRECTORY.
+    overwrite : bool, default False
+        Replace tables already on disk.
+
+    Returns
+    -------
+    list of str
+        Paths of the written tables.
+    """
+    directory = _resolve_directory(directory)
+    os.makedirs(directory, exist_ok=True)
+
+    paths = []
+    for name in names:
+
+        path = os.path.join(directory, f"{name}.npz")
+        if os.path.exists(path) and not overwrite:
+            continue
+
+        PolarTable.estimate(get_airfoil(name)).save(path)
+        paths.append(path)
+
+    _polar_table.cache_clear()
+
+    return paths
+
+
+def strip_airfoils(wings, interleaved=False):
+    """Airfoil names of the spanwise strips of a list of wings.
+
+    Every strip takes the airfoil of the inboard cross section of its
+    section. The strips of a symmetric wing follow the native lattice,
+    starboard then port, or aerosandbox.vlm3 if interleaved.
+
+    Parameters
+    ----------
+    wings : list of aerosandbox.Wing
+    interleaved : bool, default False
+        Mirror every section right after its starboard strips, as in
+        aerosandbox.vlm3.
+
+    Returns
+    -------
+    numpy.array
+        (S,) str
+    """
+    names = []
+    for wing in wings:
+
+        sections = [
+            [xsec.airfoil.name] * xsec.spanwise_panels for xsec in wing.xsecs[:-1]
+        ]
+
+        if not wing.symmetric:
+            names.extend(name for section in sections for name in section)
+        elif interleaved:
+            names.extend(name for section in sections for name in section * 2)
+        else:
+            starboard = [name for section in sections for name in section]
+            names.extend(starboard * 2)
+
+    return np.array(names)
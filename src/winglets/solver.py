@@ -1,9 +1,124 @@
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-from functools import partial
+from functools import lru_cache, partial
+from typing import NamedTuple
 
-import aerosandbox as sbx
+import numpy as np
 from fluids.atmosphere import ATMOSPHERE_1976
-from scipy.optimize import minimize_scalar
+from scipy.optimize import brentq, minimize_scalar
+
+from winglets.backends import AeroSandboxBackend
+from winglets.cache import SYSTEM_CACHE, geometry_fingerprint
+from winglets.polars import polar_table, strip_airfoils
+from winglets.vlm import (
+    TILE_BYTES,
+    BatchedSystem,
+    Lattice,
+    Reference,
+    SpanwiseLoads,
+    freestream_direction,
+    near_field_loads,
+    velocity_field,
+    trefftz_plane_drag,
+    wind_axes_coefficients,
+)
+
+# Convergence order assumed by the two-level Richardson extrapolation
+RICHARDSON_ORDER = 1.0
+
+
+@lru_cache(maxsize=1024)
+def standard_atmosphere(altitude):
+    """Speed of sound and density of the 1976 standard atmosphere,
+    memoized.
+
+    Parameters
+    ----------
+    altitude : float
+        In meters.
+
+    Returns
+    -------
+    speed_sound : float
+    density : float
+    """
+    atmosphere = ATMOSPHERE_1976(altitude)
+
+    speed_sound = atmosphere.sonic_velocity(atmosphere.T)
+    density = atmosphere.density(T=atmosphere.T, P=atmosphere.P)
+
+    return speed_sound, density
+
+
+@lru_cache(maxsize=1024)
+def dynamic_viscosity(altitude):
+    """Dynamic viscosity of the 1976 standard atmosphere, memoized.
+
+    Parameters
+    ----------
+    altitude : float
+        In meters.
+
+    Returns
+    -------
+    float
+        In Pa s.
+    """
+    return ATMOSPHERE_1976(altitude).mu
+
+
+def richardson_extrapolation(values, ratio, order=None):
+    """Mesh-converged value from solutions on geometrically refined meshes.
+
+    With values f_k on meshes refined by `ratio` at every level and a
+    discretization error C h^p, the converged value is
+
+        f = f_n + (f_n - f_n-1) / (ratio^p - 1)
+
+    Three levels estimate the order p. It falls back to RICHARDSON_ORDER
+    if the differences do not decrease monotonically.
+
+    Parameters
+    ----------
+    values : array-like
+        (2,) or (3,) values from the coarsest to the finest mesh.
+    ratio : float
+        Refinement ratio between consecutive levels.
+    order : float, optional
+        Convergence order p, estimated by default.
+
+    Returns
+    -------
+    value : float
+    error : float
+        Estimated error of the finest value.
+    order : float
+
+    Raises
+    ------
+    ValueError
+        If there are not two or three levels.
+    """
+    values = np.asarray(values, dtype=float)
+
+    if len(values) not in (2, 3):
+        raise ValueError("Richardson extrapolation needs two or three levels.")
+
+    differences = np.diff(values)
+
+    if order is None:
+
+        order = RICHARDSON_ORDER
+
+        if len(values) == 3 and differences[0] * differences[1] > 0.0:
+
+            observed = np.log(differences[0] / differences[1]) / np.log(ratio)
+            if observed > 0.0:
+                order = observed
+
+    correction = differences[-1] / (ratio**order - 1.0)
+
+    return values[-1] + correction, abs(correction), order
 
 
 class SolverMode(Enum):
@@ -12,38 +127,375 @@ class SolverMode(Enum):
     CL = auto()
 
 
+class TrimMode(Enum):
+
+    MINIMIZE = auto()
+    SUPERPOSITION = auto()
+
+
+class DragMode(Enum):
+
+    NEAR_FIELD = auto()
+    TREFFTZ = auto()
+
+
+class SolverResult:
+    """Aerodynamic coefficients at an operating point.
+
+    Lightweight, immutable result of the lean solver mode, without any
+    panel data. Coefficients that were not requested are None.
+    """
+
+    __slots__ = ("alpha", "CL", "CDi", "CY", "Cl", "Cm", "Cn", "CDp", "loads")
+
+    COEFFICIENTS = __slots__[1:7]
+
+    def __init__(self, alpha, loads=None, CDp=None, **coefficients):
+        """
+        Parameters
+        ----------
+        alpha : float
+            In degrees.
+        loads : winglets.vlm.SpanwiseLoads, optional
+        CDp : float, optional
+            Profile drag coefficient.
+        coefficients : float
+            Values of "CL", "CDi", "CY", "Cl", "Cm" or "Cn".
+        """
+        object.__setattr__(self, "alpha", alpha)
+        object.__setattr__(self, "loads", loads)
+        object.__setattr__(self, "CDp", CDp)
+
+        for name in self.COEFFICIENTS:
+            object.__setattr__(self, name, coefficients.get(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"'{type(self).__name__}' objects are immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"'{type(self).__name__}' objects are immutable.")
+
+    def __reduce__(self):
+        coefficients = {name: getattr(self, name) for name in self.COEFFICIENTS}
+        return (
+            partial(type(self), CDp=self.CDp, **coefficients),
+            (self.alpha, self.loads),
+        )
+
+    def __repr__(self):
+        names = ("alpha",) + self.COEFFICIENTS + ("CDp",)
+        values = ", ".join(f"{name}={getattr(self, name)}" for name in names)
+        return f"{type(self).__name__}({values})"
+
+
+class FlightCondition(NamedTuple):
+    """Operating point at a lift coefficient or an angle of attack."""
+
+    altitude: float
+    mach: float
+    cl: float = None
+    alpha: float = None
+
+
+def solve(
+    model,
+    condition,
+    backend=None,
+    cache=SYSTEM_CACHE,
+    drag=DragMode.NEAR_FIELD,
+    coefficients=SolverResult.COEFFICIENTS,
+    loads=False,
+    profile_drag=False,
+):
+    """Solve the aerodynamic problem of a geometry at a flight condition,
+    without side effects.
+
+    The model is only read and every call works on its own solver and on
+    a fresh copy of the backend, without the state it carries between
+    geometries, so calls run concurrently on threads. Assembled systems
+    are shared through the thread-safe cache. Geometries of winglet
+    candidates are built without touching a shared model with
+    `FlyingWing.with_winglet`.
+
+    Parameters
+    ----------
+    model : winglets.FlyingWing
+    condition : FlightCondition
+        With either `cl` or `alpha`.
+    backend : winglets.backends.SolverBackend, optional
+        Copied for the call with `fresh`, by default AeroSandbox `vlm3`.
+    cache : winglets.cache.SystemCache, optional
+    drag : DragMode, default DragMode.NEAR_FIELD
+    coefficients : list of str, optional
+        By default all of them.
+    loads : bool, default False
+        Attach the spanwise strip loads to the result.
+    profile_drag : bool, default False
+        Estimate the strip theory profile drag coefficient.
+
+    Returns
+    -------
+    SolverResult
+
+    Raises
+    ------
+    ValueError
+        If the condition does not set exactly one of `cl` and `alpha`.
+    """
+    if (condition.cl is None) == (condition.alpha is None):
+        raise ValueError("The flight condition must set either 'cl' or 'alpha'.")
+
+    # Backends hold per-geometry state, one fresh copy per call
+    if backend is not None:
+        backend = backend.fresh()
+
+    solver = WingSolver(
+        model=model,
+        altitude=condition.altitude,
+        mach=condition.mach,
+        backend=backend,
+        cache=cache,
+        drag=drag,
+        coefficients=coefficients,
+        loads=loads,
+        profile_drag=profile_drag,
+    )
+
+    if condition.cl is not None:
+        return solver.solve_cl(cl=condition.cl)
+
+    return solver.solve_alpha(alpha=condition.alpha)
+
+
+def solve_batch(models, condition, tile_bytes=TILE_BYTES):
+    """Solve the aerodynamic problems of many geometries with the same
+    panel count at once.
+
+    Meant for coarse-mesh screening of winglet candidates built with
+    `FlyingWing.with_winglet`. The lattices are assembled into a
+    (B, N, N) influence tensor and the unit freestream systems of all of
+    them are solved by one batched `numpy.linalg.solve` call. Lift
+    coefficient conditions are trimmed by a secant iteration vectorized
+    over the batch.
+
+    Parameters
+    ----------
+    models : list of winglets.FlyingWing
+    condition : FlightCondition
+        With either `cl` or `alpha`.
+    tile_bytes : int or None, optional
+        Memory budget of the kernel temporaries during assembly.
+
+    Returns
+    -------
+    results : dict
+        numpy.array of "alpha", "CL", "CDi", "CY", "Cl", "Cm" and "Cn"
+        per model.
+
+    Raises
+    ------
+    ValueError
+        If the condition does not set exactly one of `cl` and `alpha`, the
+        models have different panel counts or the trim does not converge.
+    """
+    if (condition.cl is None) == (condition.alpha is None):
+        raise ValueError("The flight condition must set either 'cl' or 'alpha'.")
+
+    system = BatchedSystem(
+        lattices=[Lattice.from_wings(model.wings) for model in models],
+        references=[Reference.from_wings(model.wings) for model in models],
+        tile_bytes=tile_bytes,
+    ).assemble()
+
+    # Unit freestream solutions, (B, N, 2) and (B, N, 3, 2)
+    unit_strengths = system.solve(-system.normal_directions[..., [0, 2]])
+    unit_velocities = system.induced_velocity_at_centers(unit_strengths)
+    unit_velocities[:, :, 0, 0] += 1.0
+    unit_velocities[:, :, 2, 1] += 1.0
+
+    def _coefficients(alpha):
+        weights = WingSolver.__freestream_weights__(alpha)
+        strengths = np.einsum("bik,kb->bi", unit_strengths, weights)
+        velocities = np.einsum("bijk,kb->bij", unit_velocities, weights)
+
+        force, moment = system.near_field_loads(strengths, velocities)
+
+        return wind_axes_coefficients(
+            force=force,
+            moment=moment,
+            alpha=alpha,
+            dynamic_pressure=0.5,
+            reference=system.reference,
+        )
+
+    if condition.alpha is not None:
+        alpha = np.full(system.n_batch, float(condition.alpha))
+    else:
+        alpha = _secant_alpha(condition.cl, _coefficients, system.n_batch)
+
+    results = _coefficients(alpha)
+    results["alpha"] = alpha
+
+    return results
+
+
+def _secant_alpha(cl, coefficients, n_batch, tol=1e-10, max_iter=50):
+    """Angles of attack for a lift coefficient, by a secant iteration
+    vectorized over a batch.
+
+    Parameters
+    ----------
+    cl : float
+    coefficients : callable
+        Coefficients from (B,) angles of attack.
+    n_batch : int
+    tol : float, optional
+        Absolute lift coefficient tolerance.
+    max_iter : int, optional
+
+    Returns
+    -------
+    numpy.array
+        (B,) in degrees.
+
+    Raises
+    ------
+    ValueError
+    """
+    alpha_0 = np.zeros(n_batch)
+    alpha_1 = np.ones(n_batch)
+    error_0 = coefficients(alpha_0)["CL"] - cl
+
+    for _ in range(max_iter):
+
+        error_1 = coefficients(alpha_1)["CL"] - cl
+
+        converged = np.abs(error_1) < tol
+        if converged.all():
+            break
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = error_1 * (alpha_1 - alpha_0) / (error_1 - error_0)
+
+        alpha_0, error_0 = alpha_1, error_1
+        alpha_1 = alpha_1 - np.where(converged, 0.0, step)
+
+    else:
+        converged = np.zeros(n_batch, dtype=bool)
+
+    low, high = WingSolver.ALPHA_BRACKET
+    if not converged.all() or np.any((alpha_1 < low) | (alpha_1 > high)):
+        raise ValueError(
+            "The solver did not converge to find an angle of attack for the demanded Cl"
+        )
+
+    return alpha_1
+
+
 class WingSolver:
 
     MAX_ITER_CL = 1000
     TOL_CL = 1e-3
+    ALPHA_BRACKET = (-30.0, 30.0)
     NAME = "wing_solver"
 
-    def __init__(self, model, altitude, mach):
+    def __init__(
+        self,
+        model,
+        altitude,
+        mach,
+        trim=TrimMode.SUPERPOSITION,
+        backend=None,
+        cache=SYSTEM_CACHE,
+        drag=DragMode.NEAR_FIELD,
+        coefficients=None,
+        loads=False,
+        profile_drag=False,
+        polars=None,
+    ):
         """
         Parameters
         ----------
         model : Wing
         altitude :
         mach :
-        design_cl :
+        trim : TrimMode, default TrimMode.SUPERPOSITION
+            Strategy to find the angle of attack for a lift coefficient.
+        backend : winglets.backends.SolverBackend, optional
+            Aerodynamic engine, by default AeroSandbox `vlm3`.
+        cache : winglets.cache.SystemCache, optional
+            Cache of assembled systems keyed by geometry, by default the
+            process-wide cache. None disables caching.
+        drag : DragMode, default DragMode.NEAR_FIELD
+            Induced drag evaluation. DragMode.TREFFTZ replaces the
+            near-field CDi of the results by the far-field Trefftz-plane
+            one, computed from the trailing vortices only. With backends
+            that have `FREESTREAM_FORCES`, the other coefficients then
+            come from the forces in the freestream only, skipping the
+            O(N^2) induced velocities at the vortex centers. The spanwise
+            loads and the profile drag still need that near-field pass.
+        coefficients : list of str, optional
+            Lean mode. Compute only these coefficients, plus CL, and
+            return a `SolverResult` instead of the backend result.
+        loads : bool, default False
+            Attach the spanwise strip loads, in newtons, to the results as
+            `loads`, a `winglets.vlm.SpanwiseLoads` with the root bending
+            moment.
+        profile_drag : bool, default False
+            Estimate the profile drag by strip theory, from the sectional
+            lift coefficient and Reynolds number of every spanwise strip
+            and the airfoil polar tables. Results get the profile drag
+            coefficient as `CDp`.
+        polars : dict, optional
+            `winglets.polars.PolarTable` by airfoil name, by default
+            read with `winglets.polars.polar_table`.
 
+        Raises
+        ------
+        ValueError
+            If a requested coefficient is unknown.
         """
 
         self.model = model
         self.altitude = altitude
         self.mach = mach
+        self.trim = trim
+
+        if backend is None:
+            backend = AeroSandboxBackend()
+
+        self.backend = backend
+        self.cache = cache
+        self.drag = drag
+
+        if coefficients is not None:
+
+            unknown = set(coefficients) - set(SolverResult.COEFFICIENTS)
+            if unknown:
+                raise ValueError(f"Unknown coefficients {sorted(unknown)}.")
+
+            coefficients = tuple(sorted(set(coefficients) | {"CL"}))
+
+        self.coefficients = coefficients
+        self.loads = loads
+        self.profile_drag = profile_drag
+        self.polars = dict() if polars is None else polars
 
         # Compute velocity in m/s
-        atmosphere = ATMOSPHERE_1976(altitude)
-        speed_sound = atmosphere.sonic_velocity(atmosphere.T)
+        speed_sound, density = standard_atmosphere(float(altitude))
 
         self.velocity = mach * speed_sound
-        self._atmosphere = atmosphere
+        self.density = density
+        self.viscosity = dynamic_viscosity(float(altitude))
 
         # Code results
         self.CL = None
         self.CY = None
         self.CDi = None
+        self.CDp = None
+
+        # System and vortex strengths of the last operating point
+        self._solution = None
 
     def solve_alpha(self, alpha):
         """Solve aerodynamical problem for an angle of attack.
@@ -55,7 +507,7 @@ class WingSolver:
 
         Return
         ------
-        aerosandbox.vlm3
+        aerosandbox.vlm3, backend result or SolverResult
         """
 
         problem = self._solve(value=alpha, mode=SolverMode.ALPHA)
@@ -71,15 +523,332 @@ class WingSolver:
 
         Return
         ------
-        aerosandbox.vlm3
+        aerosandbox.vlm3, backend result or SolverResult
         """
 
         problem = self._solve(value=cl, mode=SolverMode.CL)
 
         return problem
 
+    def induced_velocity(
+        self, points, freestream=False, tile_bytes=TILE_BYTES, workers=1
+    ):
+        """Velocity induced by the vortices of the last solved operating
+        point at arbitrary points.
+
+        Meant for downwash at the winglet location, wake surveys or
+        off-body probes. The Biot-Savart kernel is evaluated in row tiles
+        of points within a memory budget.
+
+        Parameters
+        ----------
+        points : numpy.array
+            (M, 3) in geometry axes.
+        freestream : bool, default False
+            Add the freestream velocity.
+        tile_bytes : int or None, optional
+            Memory budget of the kernel temporaries, None for no bound.
+        workers : int or None, default 1
+            Threads evaluating the tiles, None for all the CPUs.
+
+        Returns
+        -------
+        numpy.array
+            (M, 3) in m/s.
+
+        Raises
+        ------
+        ValueError
+            If no operating point was solved.
+        """
+        if self._solution is None:
+            raise ValueError("Solve an operating point first.")
+
+        system, vortex_strengths = self._solution
+        lattice = system.lattice
+
+        velocities = velocity_field(
+            points,
+            lattice.left_vortex_vertices,
+            lattice.right_vortex_vertices,
+            vortex_strengths,
+            symmetric=system.symmetric,
+            tile_bytes=tile_bytes,
+            workers=workers,
+        )
+
+        if freestream:
+            velocities += self.velocity * freestream_direction(self.alpha)
+
+        return velocities
+
+    def solve_alpha_sweep(self, alphas):
+        """Solve aerodynamical problem for a sweep of angles of attack.
+
+        The influence matrix is built and factorized once for all the
+        operating points.
+
+        Parameters
+        ----------
+        alphas : array-like
+            In degrees.
+
+        Returns
+        -------
+        results : dict
+            numpy.array of "CL", "CDi", "CY", "Cl", "Cm" and "Cn" per angle
+            of attack.
+        """
+        alphas = np.asarray(alphas, dtype=float)
+
+        superposition = self._create_superposition()
+        results = self._superposition_coefficients(alphas, *superposition)
+        self._update_sweep_drag(results, alphas, superposition)
+
+        return results
+
+    def solve_cl_sweep(self, cls):
+        """Solve aerodynamical problem for a sweep of lift coefficients.
+
+        The influence matrix is built and factorized once for all the
+        operating points.
+
+        Parameters
+        ----------
+        cls : array-like
+
+        Returns
+        -------
+        results : dict
+            numpy.array of "alpha", "CL", "CDi", "CY", "Cl", "Cm" and "Cn"
+            per lift coefficient.
+
+        Raises
+        ------
+        ValueError
+        """
+        cls = np.asarray(cls, dtype=float)
+
+        superposition = self._create_superposition()
+        alphas = np.array(
+            [self._find_alpha_superposition(cl, superposition) for cl in cls.flat]
+        ).reshape(cls.shape)
+
+        results = self._superposition_coefficients(alphas, *superposition)
+        self._update_sweep_drag(results, alphas, superposition)
+        results["alpha"] = alphas
+
+        return results
+
+    def solve_cl_richardson(self, cl, levels=2, ratio=2.0, order=None, workers=None):
+        """Solve aerodynamical problem for a lift coefficient on refined
+        copies of the model mesh and extrapolate the coefficients.
+
+        The model mesh is the coarsest level, every level multiplies its
+        panel counts by `ratio`. The levels are solved in parallel on a
+        thread pool.
+
+        Parameters
+        ----------
+        cl : float
+        levels : int, default 2
+            Two or three meshes. Three estimate the convergence order.
+        ratio : float, default 2.0
+        order : float, optional
+            Convergence order, by default RICHARDSON_ORDER for two
+            levels and estimated for three.
+        workers : int, optional
+            Threads solving the levels, by default one per level.
+
+        Returns
+        -------
+        results : dict
+            Extrapolated "alpha" and coefficients.
+        errors : dict
+            Estimated error of the finest mesh values.
+
+        Raises
+        ------
+        ValueError
+        """
+        if levels not in (2, 3):
+            raise ValueError("'levels' must be 2 or 3.")
+
+        models = [self.model] + [
+            self.model.refine(ratio**level) for level in range(1, levels)
+        ]
+
+        if self.coefficients is None:
+            names = ("alpha", "CL", "CDi", "CY", "Cm")
+        else:
+            names = ("alpha",) + self.coefficients
+
+        def _solve_level(model):
+
+            # Backends hold per-geometry state, one fresh copy per thread
+            solver = WingSolver(
+                model=model,
+                altitude=self.altitude,
+                mach=self.mach,
+                trim=self.trim,
+                backend=self.backend.fresh(),
+                cache=self.cache,
+                drag=self.drag,
+                coefficients=self.coefficients,
+            )
+            problem = solver.solve_cl(cl=cl)
+
+            values = {name: getattr(problem, name) for name in names[1:]}
+            values["alpha"] = solver.alpha
+
+            return values
+
+        with ThreadPoolExecutor(max_workers=workers or levels) as executor:
+            solutions = list(executor.map(_solve_level, models))
+
+        results = dict()
+        errors = dict()
+        for name in names:
+            values = [solution[name] for solution in solutions]
+            results[name], errors[name], _ = richardson_extrapolation(
+                values, ratio=ratio, order=order
+            )
+
+        return results, errors
+
+    def solve_operating_points(self, altitudes, machs, cls, prandtl_glauert=True):
+        """Solve aerodynamical problem for a set of operating points of
+        the model geometry.
+
+        Points with the same Mach number share one assembled and
+        factorized system, and their angles of attack come from its unit
+        freestream solutions. With the Prandtl-Glauert correction, every
+        Mach number solves the model stretched along x by 1 / beta, with
+        beta = sqrt(1 - M^2), and the loads are mapped back to the model
+        (Goethert rule). Atmosphere states are memoized.
+
+        Parameters
+        ----------
+        altitudes : array-like
+        machs : array-like
+        cls : array-like
+            Broadcast together.
+        prandtl_glauert : bool, default True
+            Without it the coefficients do not depend on the Mach number
+            and match `solve_cl_sweep`.
+
+        Returns
+        -------
+        results : dict
+            numpy.array of "alpha", "CL", "CDi", "CY", "Cl", "Cm", "Cn",
+            "velocity" and "density" per operating point.
+
+        Raises
+        ------
+        ValueError
+            If a Mach number is not subsonic or no angle of attack
+            reaches a lift coefficient.
+        """
+        altitudes, machs, cls = np.broadcast_arrays(
+            np.asarray(altitudes, dtype=float),
+            np.asarray(machs, dtype=float),
+            np.asarray(cls, dtype=float),
+        )
+
+        if np.any(machs >= 1.0):
+            raise ValueError("The Prandtl-Glauert correction needs subsonic Mach.")
+
+        names = ("alpha",) + SolverResult.COEFFICIENTS
+        results = {name: np.empty(cls.shape) for name in names}
+
+        reference = Reference.from_wings(self.model.wings)
+
+        for mach in np.unique(machs):
+
+            points = machs == mach
+            beta = np.sqrt(1.0 - mach**2) if prandtl_glauert else 1.0
+
+            model = self.model if beta == 1.0 else self.model.stretched(1.0 / beta)
+            superposition = self._create_superposition(model=model)
+
+            stretched_coefficients = partial(
+                self._stretched_coefficients, beta=beta, reference=reference
+            )
+
+            alphas = np.array(
+                [
+                    self._find_alpha_superposition(
+                        cl, superposition, coefficients=stretched_coefficients
+                    )
+                    for cl in cls[points]
+                ]
+            )
+
+            coefficients = stretched_coefficients(alphas, *superposition)
+            coefficients["alpha"] = alphas
+
+            for name in names:
+                results[name][points] = coefficients[name]
+
+        speeds_sound, densities = np.vectorize(standard_atmosphere)(altitudes)
+
+        results["velocity"] = machs * speeds_sound
+        results["density"] = densities
+
+        return results
+
+    def _stretched_coefficients(
+        self, alpha, system, unit_strengths, unit_velocities, beta, reference
+    ):
+        """Coefficients of the model from the unit solutions of the model
+        stretched along x by 1 / beta.
+
+        The panel forces of the stretched wing are those of the model and
+        the moments are taken with the panel locations mapped back to it.
+
+        Parameters
+        ----------
+        alpha : float or numpy.array
+            In degrees.
+        system : InfluenceSystem-like
+            Assembled system of the stretched model.
+        unit_strengths : numpy.array
+        unit_velocities : numpy.array
+        beta : float
+        reference : Reference
+            Reference dimensions of the model.
+
+        Returns
+        -------
+        dict
+            Coefficients with the shape of alpha.
+        """
+        weights = self.__freestream_weights__(alpha)
+        strengths = np.tensordot(unit_strengths, weights, axes=(1, 0))
+        velocities = np.tensordot(unit_velocities, weights, axes=(2, 0))
+
+        forces, force, _ = near_field_loads(system, strengths, velocities)
+
+        centers = np.asarray(system.lattice.vortex_centers) * [beta, 1.0, 1.0]
+        arms = (centers - reference.xyz_ref)[..., None]
+        moment = np.cross(arms, forces, axis=1).sum(axis=0)
+
+        coefficients = wind_axes_coefficients(
+            force=force,
+            moment=moment,
+            alpha=alpha,
+            dynamic_pressure=0.5,
+            reference=reference,
+        )
+
+        if self.drag == DragMode.TREFFTZ:
+            drag = trefftz_plane_drag(system.lattice, strengths)
+            coefficients["CDi"] = drag / (0.5 * reference.s_ref)
+
+        return coefficients
+
     def _solve(self, value, mode=None):
-        """Create and solve a VLM3 problem for a given angle of attack
+        """Solve the backend problem for a given angle of attack
         or lift coefficient.
 
         Parameters
@@ -93,36 +862,537 @@ class WingSolver:
         aero_problem : VLM3-like object
         """
 
-        # Create vlm3-object
         if mode == SolverMode.ALPHA:
 
-            atmosphere = self._atmosphere
-            rho = atmosphere.density(T=atmosphere.T, P=atmosphere.P)
-
-            aero_problem = sbx.vlm3(
-                airplane=self.model.airplane,
-                op_point=sbx.OperatingPoint(
-                    velocity=self.velocity, alpha=value, density=rho
-                ),
-            )
+            alpha = value
+            aero_problem = self._solve_alpha(alpha=alpha)
 
         elif mode == SolverMode.CL:
 
-            aero_problem = self._find_alpha_for_cl(cl=value)
+            if self.trim == TrimMode.SUPERPOSITION:
+                alpha, aero_problem = self._trim_superposition(cl=value)
+            else:
+                alpha, aero_problem = self._find_alpha_for_cl(cl=value)
 
         else:
             raise NotImplementedError("'mode' must be either 'alpha' or 'cl'.")
 
-        # Solve
-        aero_problem.run(verbose=False)
-
         self.CL = aero_problem.CL
         self.CDi = aero_problem.CDi
         self.CY = aero_problem.CY
-        self.alpha = aero_problem.op_point.alpha
+        self.CDp = getattr(aero_problem, "CDp", None)
+        self.alpha = alpha
 
         return aero_problem
 
+    def _solve_alpha(self, alpha):
+        """Assemble, solve and post-process the problem at an angle of attack.
+
+        Parameters
+        ----------
+        alpha : float
+            In degrees.
+
+        Returns
+        -------
+        aerosandbox.vlm3 or backend result
+        """
+        system = self._assemble()
+
+        freestream = self.velocity * freestream_direction(alpha)
+        rhs = -system.lattice.normal_directions @ freestream
+
+        aero_problem = self._create_result(
+            system=system,
+            alpha=alpha,
+            vortex_strengths=self.backend.solve(system, rhs),
+        )
+
+        return aero_problem
+
+    def _create_result(self, system, alpha, vortex_strengths, coefficients=None):
+        """Backend result at the solver operating point.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        alpha : float
+            In degrees.
+        vortex_strengths : numpy.array
+        coefficients : dict, optional
+            Near-field coefficients already known at this operating point,
+            used by the lean mode.
+
+        Returns
+        -------
+        aerosandbox.vlm3, backend result or SolverResult
+        """
+        self._solution = (system, vortex_strengths)
+
+        if self.coefficients is not None:
+            return self._create_lean_result(
+                system, alpha, vortex_strengths, coefficients=coefficients
+            )
+
+        aero_problem = self.backend.create_result(
+            system=system,
+            alpha=alpha,
+            velocity=self.velocity,
+            density=self.density,
+            vortex_strengths=vortex_strengths,
+            near_field=not self._freestream_forces,
+        )
+
+        if self.drag == DragMode.TREFFTZ:
+            aero_problem.CDi = self._trefftz_cdi(
+                system, vortex_strengths, velocity=self.velocity
+            )
+
+        if self.loads or self.profile_drag:
+
+            loads = self._create_loads(system, alpha, vortex_strengths)
+
+            if self.loads:
+                aero_problem.loads = loads
+
+            if self.profile_drag:
+                aero_problem.CDp = self._profile_drag(loads, system)
+
+        return aero_problem
+
+    def _create_lean_result(self, system, alpha, vortex_strengths, coefficients=None):
+        """Requested coefficients at the solver operating point.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        alpha : float
+            In degrees.
+        vortex_strengths : numpy.array
+        coefficients : dict, optional
+            Near-field coefficients already known at this operating point.
+
+        Returns
+        -------
+        SolverResult
+        """
+        forces = None
+
+        if coefficients is None:
+
+            freestream = self.velocity * freestream_direction(alpha)
+            velocities = self._center_velocities(system, vortex_strengths, freestream)
+
+            forces, force, moment = near_field_loads(
+                system, vortex_strengths, velocities
+            )
+
+            coefficients = wind_axes_coefficients(
+                force=force,
+                moment=moment,
+                alpha=alpha,
+                dynamic_pressure=0.5 * self.velocity**2,
+                reference=system.reference,
+            )
+
+        if self.drag == DragMode.TREFFTZ and "CDi" in self.coefficients:
+            coefficients["CDi"] = self._trefftz_cdi(
+                system, vortex_strengths, velocity=self.velocity
+            )
+
+        values = {name: float(coefficients[name]) for name in self.coefficients}
+
+        # Forces in the freestream only miss the induced part of the loads
+        if self._freestream_forces:
+            forces = None
+
+        loads = None
+        if self.loads or self.profile_drag:
+            loads = self._create_loads(system, alpha, vortex_strengths, forces=forces)
+
+        CDp = None
+        if self.profile_drag:
+            CDp = self._profile_drag(loads, system)
+
+        if not self.loads:
+            loads = None
+
+        return SolverResult(alpha=alpha, loads=loads, CDp=CDp, **values)
+
+    def _create_loads(self, system, alpha, vortex_strengths, forces=None):
+        """Spanwise strip loads at the solver operating point.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        alpha : float
+            In degrees.
+        vortex_strengths : numpy.array
+        forces : numpy.array, optional
+            (N, 3) panel forces per unit density, if already known.
+
+        Returns
+        -------
+        winglets.vlm.SpanwiseLoads
+        """
+        if forces is None:
+
+            freestream = self.velocity * freestream_direction(alpha)
+            velocities = (
+                system.induced_velocity_at_centers(vortex_strengths) + freestream
+            )
+
+            forces, _, _ = near_field_loads(system, vortex_strengths, velocities)
+
+        return SpanwiseLoads(system.lattice, self.density * forces, alpha)
+
+    def _profile_drag(self, loads, system):
+        """Strip theory profile drag coefficient.
+
+        Sets the strip profile drag of the loads.
+
+        Parameters
+        ----------
+        loads : winglets.vlm.SpanwiseLoads
+        system : InfluenceSystem-like
+
+        Returns
+        -------
+        float
+        """
+        dynamic_pressure = 0.5 * self.density * self.velocity**2
+
+        # Sectional lift in the plane of every strip, canted surfaces included
+        cl = loads.normal_force / (dynamic_pressure * loads.chord * loads.width)
+        reynolds = self.density * self.velocity * loads.chord / self.viscosity
+
+        # aerosandbox.vlm3 mirrors every section after its starboard strips
+        airfoils = strip_airfoils(
+            self.model.wings, interleaved=not isinstance(system.lattice, Lattice)
+        )
+
+        cd = np.empty_like(cl)
+        for name in np.unique(airfoils):
+
+            table = self.polars.get(name)
+            if table is None:
+                table = polar_table(name)
+
+            strips = airfoils == name
+            cd[strips] = table.profile_drag(cl[strips], reynolds[strips])
+
+        loads.profile_drag = dynamic_pressure * cd * loads.chord * loads.width
+
+        return float(
+            np.sum(loads.profile_drag) / (dynamic_pressure * system.reference.s_ref)
+        )
+
+    @property
+    def _freestream_forces(self):
+        """Whether the forces are taken in the freestream only, the
+        induced drag coming from the Trefftz plane."""
+        return self.drag == DragMode.TREFFTZ and self.backend.FREESTREAM_FORCES
+
+    def _center_velocities(self, system, vortex_strengths, freestream):
+        """Total velocities at the vortex centers for the forces.
+
+        Without the induced velocities, and their O(N^2) pass over the
+        panels, when the forces are taken in the freestream only.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        vortex_strengths : numpy.array
+            (N,) or (N, K)
+        freestream : float or numpy.array
+            (3,) freestream velocity.
+
+        Returns
+        -------
+        numpy.array
+            (N, 3) or (N, 3, K)
+        """
+        if not self._freestream_forces:
+            return system.induced_velocity_at_centers(vortex_strengths) + freestream
+
+        shape = np.shape(vortex_strengths)
+        velocities = np.zeros(shape[:1] + (3,) + shape[1:])
+        velocities += np.reshape(freestream, (-1,) + (1,) * (len(shape) - 1))
+
+        return velocities
+
+    @staticmethod
+    def _trefftz_cdi(system, vortex_strengths, velocity=1.0):
+        """Far-field induced drag coefficient.
+
+        Parameters
+        ----------
+        system : InfluenceSystem-like
+        vortex_strengths : numpy.array
+            (N,) or (N, K)
+        velocity : float
+
+        Returns
+        -------
+        float or numpy.array
+        """
+        drag = trefftz_plane_drag(system.lattice, vortex_strengths)
+
+        return drag / (0.5 * velocity**2 * system.reference.s_ref)
+
+    def _update_sweep_drag(self, results, alphas, superposition):
+        """Replace the near-field CDi of a sweep by the Trefftz-plane one
+        if requested.
+
+        Parameters
+        ----------
+        results : dict
+        alphas : numpy.array
+        superposition : tuple
+            Output of `_create_superposition`.
+        """
+        if self.drag != DragMode.TREFFTZ:
+            return
+
+        system, unit_strengths, _ = superposition
+
+        weights = self.__freestream_weights__(alphas.reshape(-1))
+        strengths = unit_strengths @ weights
+
+        cdi = self._trefftz_cdi(system, strengths)
+        results["CDi"] = cdi.reshape(alphas.shape)[()]
+
+    def _assemble(self, model=None):
+        """Assembled and factorized system of the model, from the cache
+        when the same geometry has already been assembled.
+
+        Parameters
+        ----------
+        model : winglets.FlyingWing, optional
+            By default the solver model.
+
+        Returns
+        -------
+        system : InfluenceSystem-like
+        """
+        if model is None:
+            model = self.model
+
+        if self.cache is None:
+            return self.backend.assemble(model)
+
+        key = (self.backend.cache_key, geometry_fingerprint(model.wings))
+
+        system = self.cache.get_or_assemble(key, partial(self.backend.assemble, model))
+
+        return system
+
+    def _create_superposition(self, model=None):
+        """Assemble and factorize the influence system once and solve
+        the unit freestream right-hand sides.
+
+        Without sideslip or rotation the freestream is
+        V * (cos(alpha), 0, sin(alpha)), so the vortex strengths for any
+        angle of attack are a combination of the solutions for unit
+        freestreams along the x and z geometry axes.
+
+        Parameters
+        ----------
+        model : winglets.FlyingWing, optional
+            By default the solver model.
+
+        Returns
+        -------
+        system : InfluenceSystem-like
+            Assembled and factorized backend system.
+        unit_strengths : numpy.array
+            (N, 2) vortex strengths for the unit freestreams.
+        unit_velocities : numpy.array
+            (N, 3, 2) total velocities at the vortex centers for the
+            unit freestreams.
+        """
+        system = self._assemble(model=model)
+
+        # Unit right-hand sides, one per freestream component
+        normals = system.lattice.normal_directions
+        unit_rhs = -normals[:, [0, 2]]
+        unit_strengths = self.backend.solve(system, unit_rhs)
+
+        # Velocities at the vortex centers for each unit freestream
+        unit_velocities = self._center_velocities(system, unit_strengths, 0.0)
+        unit_velocities[:, 0, 0] += 1.0
+        unit_velocities[:, 2, 1] += 1.0
+
+        return system, unit_strengths, unit_velocities
+
+    @staticmethod
+    def __freestream_weights__(alpha):
+        """Weights of the unit freestream solutions for angles of attack.
+
+        Parameters
+        ----------
+        alpha : float or numpy.array
+            In degrees.
+
+        Returns
+        -------
+        numpy.array
+            (2,) or (2, M) array.
+        """
+        _alpha = np.deg2rad(alpha)
+
+        return np.array([np.cos(_alpha), np.sin(_alpha)])
+
+    @classmethod
+    def _superposition_coefficients(
+        cls, alpha, system, unit_strengths, unit_velocities
+    ):
+        """Near-field coefficients from the superposed unit solutions.
+
+        Parameters
+        ----------
+        alpha : float or numpy.array
+            In degrees.
+        system : InfluenceSystem-like
+        unit_strengths : numpy.array
+        unit_velocities : numpy.array
+
+        Returns
+        -------
+        results : dict
+            Coefficients with the same shape as alpha.
+        """
+        alpha = np.asarray(alpha, dtype=float)
+        shape = alpha.shape
+        alpha = alpha.reshape(-1)
+
+        # Near-field loads per unit density and squared velocity
+        weights = cls.__freestream_weights__(alpha)
+        strengths = np.tensordot(unit_strengths, weights, axes=(1, 0))
+        velocities = np.tensordot(unit_velocities, weights, axes=(2, 0))
+
+        _, force, moment = near_field_loads(system, strengths, velocities)
+
+        results = wind_axes_coefficients(
+            force=force,
+            moment=moment,
+            alpha=alpha,
+            dynamic_pressure=0.5,
+            reference=system.reference,
+        )
+
+        for key, value in results.items():
+            results[key] = value.reshape(shape)[()]
+
+        return results
+
+    def _trim_superposition(self, cl):
+        """Solve the problem for a prescribed lift coefficient using the
+        linearity of the lattice in the freestream.
+
+        The lift coefficient is a closed-form function of alpha for the
+        superposed unit solutions, so the trim root is found without any
+        further lattice solves.
+
+        Parameters
+        ----------
+        cl : float
+
+        Returns
+        -------
+        alpha : float
+        aero_problem : aerosandbox.vlm3 or backend result
+
+        Raises
+        ------
+        ValueError
+        """
+        superposition = self._create_superposition()
+        system, unit_strengths, _ = superposition
+
+        alpha = self._find_alpha_superposition(cl, superposition)
+
+        # Recover the vortex strengths and post-process the forces
+        vortex_strengths = self.velocity * (
+            unit_strengths @ self.__freestream_weights__(alpha)
+        )
+
+        # The lean mode takes the coefficients from the unit solutions
+        coefficients = None
+        if self.coefficients is not None:
+            coefficients = self._superposition_coefficients(alpha, *superposition)
+
+        aero_problem = self._create_result(
+            system=system,
+            alpha=alpha,
+            vortex_strengths=vortex_strengths,
+            coefficients=coefficients,
+        )
+
+        return alpha, aero_problem
+
+    def _superposition_error_cl(
+        self, alpha, cl_target, superposition, coefficients=None
+    ):
+        """Lift coefficient error from the superposed unit solutions.
+
+        Parameters
+        ----------
+        alpha : float
+        cl_target : float
+        superposition : tuple
+            Output of `_create_superposition`.
+        coefficients : callable, optional
+            Coefficients from alpha and the superposition, by default
+            `_superposition_coefficients`.
+
+        Returns
+        -------
+        float
+        """
+        if coefficients is None:
+            coefficients = self._superposition_coefficients
+
+        results = coefficients(alpha, *superposition)
+
+        return results["CL"] - cl_target
+
+    def _find_alpha_superposition(self, cl, superposition, coefficients=None):
+        """Angle of attack for a lift coefficient from the unit solutions.
+
+        Parameters
+        ----------
+        cl : float
+        superposition : tuple
+            Output of `_create_superposition`.
+        coefficients : callable, optional
+            Coefficients from alpha and the superposition, by default
+            `_superposition_coefficients`.
+
+        Returns
+        -------
+        alpha : float
+
+        Raises
+        ------
+        ValueError
+        """
+        func = partial(
+            self._superposition_error_cl,
+            cl_target=cl,
+            superposition=superposition,
+            coefficients=coefficients,
+        )
+
+        try:
+            alpha = brentq(func, *self.ALPHA_BRACKET)
+        except ValueError:
+            raise ValueError(
+                "The solver did not converge to find an angle of attack for the demanded Cl"
+            )
+
+        return alpha
+
     def _error_cl(self, alpha, cl_target):
         """Objective function to find the correct angle of attack for
         the corresponding lift coefficient.
@@ -153,7 +1423,8 @@ class WingSolver:
 
         Returns
         -------
-        VLM3-like
+        alpha : float
+        aero_problem : VLM3-like
 
         Raises
         ------
@@ -175,7 +1446,7 @@ class WingSolver:
             # to the request CL
             aero_problem = self._solve(value=alpha, mode=SolverMode.ALPHA)
 
-            return aero_problem
+            return alpha, aero_problem
 
         else:
             raise ValueError(
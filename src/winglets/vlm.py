@@ -0,0 +1,2347 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.sparse.linalg import LinearOperator, gmres
+
+SPACING_UNIFORM = "uniform"
+SPACING_COSINE = "cosine"
+
+# Squared norm below which a vortex leg is considered singular
+SINGULARITY_TOL = 3.0e-16
+
+# Memory budget of the kernel temporaries of a row tile
+TILE_BYTES = 64 * 1024**2
+
+# Peak kernel temporaries per point and vortex pair, measured
+KERNEL_BYTES_PER_PAIR = 256
+
+# Chordwise points of the thin airfoil zero-lift angle quadrature
+ZERO_LIFT_POINTS = 200
+
+
+def spacing(kind, n_points):
+    """Nondimensional point distribution between 0 and 1.
+
+    Parameters
+    ----------
+    kind : str
+        ["uniform", "cosine"]
+    n_points : int
+
+    Returns
+    -------
+    numpy.array
+
+    Raises
+    ------
+    ValueError
+    """
+    if kind == SPACING_UNIFORM:
+        return np.linspace(0.0, 1.0, n_points)
+    elif kind == SPACING_COSINE:
+        return 0.5 + 0.5 * np.cos(np.linspace(np.pi, 0.0, n_points))
+    else:
+        raise ValueError(f"Unknown spacing '{kind}'.")
+
+
+def reflect(vectors):
+    """Reflect vectors over the XZ plane.
+
+    Parameters
+    ----------
+    vectors : numpy.array
+        (..., 3)
+
+    Returns
+    -------
+    numpy.array
+    """
+    return vectors * np.array([1.0, -1.0, 1.0])
+
+
+def array_nbytes(*values, memmap=False):
+    """Memory held by the arrays among some values.
+
+    Tuples, lists and dicts are searched recursively and every array is
+    counted once. Memory-mapped arrays live on disk and are only counted,
+    alone, if requested.
+
+    Parameters
+    ----------
+    values
+    memmap : bool, default False
+        Count the memory-mapped arrays instead of the in-memory ones.
+
+    Returns
+    -------
+    int
+    """
+    seen = set()
+    nbytes = 0
+
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, np.ndarray):
+            if isinstance(value, np.memmap) == memmap and id(value) not in seen:
+                seen.add(id(value))
+                nbytes += value.nbytes
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (tuple, list)):
+            stack.extend(value)
+
+    return nbytes
+
+
+class Reference:
+    def __init__(self, s_ref, c_ref, b_ref, xyz_ref=(0.0, 0.0, 0.0)):
+        """Reference dimensions for the aerodynamic coefficients.
+
+        Parameters
+        ----------
+        s_ref : float
+        c_ref : float
+        b_ref : float
+        xyz_ref : array-like
+            Moment reference point.
+        """
+        self.s_ref = s_ref
+        self.c_ref = c_ref
+        self.b_ref = b_ref
+        self.xyz_ref = np.array(xyz_ref, dtype=float)
+
+    @classmethod
+    def from_wings(cls, wings, xyz_ref=(0.0, 0.0, 0.0)):
+        """Reference dimensions taken from the main (first) wing, following
+        the aerosandbox.Airplane convention.
+
+        Parameters
+        ----------
+        wings : list of aerosandbox.Wing
+        xyz_ref : array-like
+
+        Returns
+        -------
+        Reference
+        """
+        main_wing = wings[0]
+
+        s_ref = main_wing.area_wetted()
+        b_ref = main_wing.span()
+
+        return cls(s_ref=s_ref, c_ref=s_ref / b_ref, b_ref=b_ref, xyz_ref=xyz_ref)
+
+
+class Lattice:
+    def __init__(
+        self,
+        left_vortex_vertices,
+        right_vortex_vertices,
+        collocation_points,
+        normal_directions,
+        areas,
+        is_trailing_edge,
+        wing_index,
+        strip_index,
+        mirror_index=None,
+    ):
+        """Horseshoe vortex lattice.
+
+        Every panel carries a horseshoe vortex whose bound leg joins the
+        left and right vortex vertices at the panel quarter chord and whose
+        trailing legs run to infinity along +x.
+
+        Parameters
+        ----------
+        left_vortex_vertices : numpy.array
+            (N, 3)
+        right_vortex_vertices : numpy.array
+            (N, 3)
+        collocation_points : numpy.array
+            (N, 3)
+        normal_directions : numpy.array
+            (N, 3)
+        areas : numpy.array
+            (N,)
+        is_trailing_edge : numpy.array
+            (N,) bool
+        wing_index : numpy.array
+            (N,) int, wing each panel belongs to.
+        strip_index : numpy.array
+            (N,) int, spanwise strip each panel belongs to.
+        mirror_index : numpy.array, optional
+            (N,) int, panel that is the mirror image of each panel over
+            the XZ plane, -1 if there is none.
+        """
+        self.left_vortex_vertices = left_vortex_vertices
+        self.right_vortex_vertices = right_vortex_vertices
+        self.collocation_points = collocation_points
+        self.normal_directions = normal_directions
+        self.areas = areas
+        self.is_trailing_edge = is_trailing_edge
+        self.wing_index = wing_index
+        self.strip_index = strip_index
+
+        if mirror_index is None:
+            mirror_index = np.full(len(collocation_points), -1)
+
+        self.mirror_index = mirror_index
+
+        self.vortex_centers = 0.5 * (left_vortex_vertices + right_vortex_vertices)
+        self.vortex_bound_leg = right_vortex_vertices - left_vortex_vertices
+
+    @property
+    def n_panels(self):
+        return len(self.collocation_points)
+
+    @property
+    def n_strips(self):
+        return int(self.strip_index.max()) + 1 if self.n_panels else 0
+
+    @property
+    def is_symmetric(self):
+        """Whether every panel has a mirror image."""
+        return bool(np.all(self.mirror_index >= 0))
+
+    @property
+    def is_starboard(self):
+        """Panels listed before their mirror image, (N,) bool."""
+        return self.mirror_index > np.arange(self.n_panels)
+
+    def take(self, indices):
+        """Lattice made of a subset of the panels.
+
+        Mirror images outside the subset are dropped.
+
+        Parameters
+        ----------
+        indices : slice or numpy.array
+
+        Returns
+        -------
+        Lattice
+        """
+        taken = np.arange(self.n_panels)[indices]
+
+        positions = np.full(self.n_panels, -1)
+        positions[taken] = np.arange(len(taken))
+
+        mirror_index = self.mirror_index[taken]
+        mirror_index = np.where(mirror_index >= 0, positions[mirror_index], -1)
+
+        return Lattice(
+            left_vortex_vertices=self.left_vortex_vertices[indices],
+            right_vortex_vertices=self.right_vortex_vertices[indices],
+            collocation_points=self.collocation_points[indices],
+            normal_directions=self.normal_directions[indices],
+            areas=self.areas[indices],
+            is_trailing_edge=self.is_trailing_edge[indices],
+            wing_index=self.wing_index[indices],
+            strip_index=self.strip_index[indices],
+            mirror_index=mirror_index,
+        )
+
+    def is_equal(self, other):
+        """Whether two lattices have the same vortices and collocation points.
+
+        Parameters
+        ----------
+        other : Lattice
+
+        Returns
+        -------
+        bool
+        """
+        return (
+            np.array_equal(self.left_vortex_vertices, other.left_vortex_vertices)
+            and np.array_equal(self.right_vortex_vertices, other.right_vortex_vertices)
+            and np.array_equal(self.collocation_points, other.collocation_points)
+            and np.array_equal(self.normal_directions, other.normal_directions)
+        )
+
+    @classmethod
+    def from_wings(cls, wings, chordwise_panels=None):
+        """Mesh a list of wings.
+
+        Parameters
+        ----------
+        wings : list of aerosandbox.Wing
+        chordwise_panels : int, optional
+            Override the chordwise panels of the wings.
+
+        Returns
+        -------
+        Lattice
+        """
+        panels = [_mesh_wing(wing, chordwise_panels) for wing in wings]
+
+        # Tag panels with their wing and offset the strip and panel numbering
+        n_strips = 0
+        n_panels = 0
+        for wing_num, _panels in enumerate(panels):
+            _panels["wing_index"] = np.full(len(_panels["areas"]), wing_num)
+            _panels["strip_index"] = _panels["strip_index"] + n_strips
+            _panels["mirror_index"] = np.where(
+                _panels["mirror_index"] >= 0, _panels["mirror_index"] + n_panels, -1
+            )
+            n_strips = _panels["strip_index"].max() + 1
+            n_panels += len(_panels["areas"])
+
+        merged = {
+            key: np.concatenate([_panels[key] for _panels in panels])
+            for key in panels[0]
+        }
+
+        return cls(**merged)
+
+    @classmethod
+    def lifting_line(cls, wings):
+        """Weissinger lifting line of a list of wings.
+
+        A single chordwise panel per strip, with the bound vortex on the
+        quarter chord line and the collocation point on the three-quarter
+        chord line. The panel normals are rotated about the bound legs by
+        the thin airfoil zero-lift angle of the strips, so that camber and
+        control surface deflections are kept.
+
+        Parameters
+        ----------
+        wings : list of aerosandbox.Wing
+
+        Returns
+        -------
+        Lattice
+        """
+        lattice = cls.from_wings(wings, chordwise_panels=1)
+
+        angles = -np.concatenate([_strip_zero_lift_angles(wing) for wing in wings])
+        axes = lattice.vortex_bound_leg / np.linalg.norm(
+            lattice.vortex_bound_leg, axis=1, keepdims=True
+        )
+
+        # Rodrigues rotation
+        normals = lattice.normal_directions
+        cos_angles = np.cos(angles)[:, None]
+
+        lattice.normal_directions = (
+            normals * cos_angles
+            + np.cross(axes, normals) * np.sin(angles)[:, None]
+            + axes * np.sum(axes * normals, axis=1, keepdims=True) * (1.0 - cos_angles)
+        )
+
+        return lattice
+
+
+def _mesh_wing(wing, chordwise_panels=None):
+    """Mesh the mean camber surface of a wing.
+
+    Follows the aerosandbox.vlm3 discretization, vectorized over the
+    panels of each section. Spanwise paneling is taken from the inner
+    cross section of every section.
+
+    Parameters
+    ----------
+    wing : aerosandbox.Wing
+    chordwise_panels : int, optional
+        By default the wing ones.
+
+    Returns
+    -------
+    dict
+        Lattice arrays of the wing.
+    """
+    xsecs = wing.xsecs
+
+    if chordwise_panels is None:
+        chordwise_panels = wing.chordwise_panels
+
+    chord_fractions = spacing(wing.chordwise_spacing, chordwise_panels + 1)
+
+    # Leading and trailing edges of every cross section
+    xsec_le = np.array([xsec.xyz_le for xsec in xsecs], dtype=float) + wing.xyz_le
+    xsec_te = np.array([xsec.xyz_te() for xsec in xsecs], dtype=float) + wing.xyz_le
+
+    # Spanwise direction of the sections projected on the YZ plane
+    quarter_chords = 0.75 * xsec_le + 0.25 * xsec_te
+    section_directions = quarter_chords[1:] - quarter_chords[:-1]
+    section_directions[:, 0] = 0.0
+    section_directions /= np.linalg.norm(section_directions, axis=1, keepdims=True)
+
+    inner_normals = section_directions[:-1] + section_directions[1:]
+    inner_normals /= np.linalg.norm(inner_normals, axis=1, keepdims=True)
+    xsec_normals = np.vstack(
+        (section_directions[:1], inner_normals, section_directions[-1:])
+    )
+
+    # Local frame of every cross section
+    xsec_back = xsec_te - xsec_le
+    xsec_chord = np.linalg.norm(xsec_back, axis=1)
+    xsec_back /= xsec_chord[:, None]
+    xsec_up = np.cross(xsec_back, xsec_normals)
+
+    # Airfoils at dihedral breaks are stretched to keep their thickness
+    xsec_scaling = 1.0 / np.sqrt(
+        (1.0 + np.sum(section_directions[1:] * section_directions[:-1], axis=1)) / 2.0
+    )
+    xsec_scaling = np.hstack((1.0, xsec_scaling, 1.0))
+
+    # Mean camber lines, (xsec, chordwise point, xyz)
+    mcl_nondim = np.array(
+        [_camber_line(xsec, chord_fractions) for xsec in xsecs], dtype=float
+    )
+    xsec_mcl = (
+        xsec_le[:, None, :]
+        + xsec_back[:, None, :] * (mcl_nondim[:, :, :1] * xsec_chord[:, None, None])
+        + xsec_up[:, None, :]
+        * (mcl_nondim[:, :, 1:] * (xsec_chord * xsec_scaling)[:, None, None])
+    )
+
+    panels = []
+    n_strips = 0
+
+    for section_num in range(len(xsecs) - 1):
+
+        xsec = xsecs[section_num]
+        span_fractions = spacing(xsec.spanwise_spacing, xsec.spanwise_panels + 1)
+
+        # (chordwise point, spanwise point, xyz)
+        mcl = (1.0 - span_fractions)[None, :, None] * xsec_mcl[
+            section_num, :, None, :
+        ] + span_fractions[None, :, None] * xsec_mcl[section_num + 1, :, None, :]
+
+        n_chord = mcl.shape[0] - 1
+        n_span = mcl.shape[1] - 1
+
+        front_inner = mcl[:-1, :-1].reshape((-1, 3), order="F")
+        front_outer = mcl[:-1, 1:].reshape((-1, 3), order="F")
+        back_inner = mcl[1:, :-1].reshape((-1, 3), order="F")
+        back_outer = mcl[1:, 1:].reshape((-1, 3), order="F")
+
+        strip_index = n_strips + np.repeat(np.arange(n_span), n_chord)
+        is_trailing_edge = np.tile(np.arange(n_chord) == n_chord - 1, n_span)
+        n_strips += n_span
+
+        panels.append(
+            _make_panels(
+                front_inner,
+                front_outer,
+                back_inner,
+                back_outer,
+                is_trailing_edge,
+                strip_index,
+            )
+        )
+
+    starboard = {
+        key: np.concatenate([_panels[key] for _panels in panels]) for key in panels[0]
+    }
+
+    n_panels = len(starboard["areas"])
+
+    if not wing.symmetric:
+        starboard["mirror_index"] = np.full(n_panels, -1)
+        return starboard
+
+    starboard["mirror_index"] = np.arange(n_panels) + n_panels
+
+    # Mirror image, relabelled left to right
+    port = dict(
+        left_vortex_vertices=reflect(starboard["right_vortex_vertices"]),
+        right_vortex_vertices=reflect(starboard["left_vortex_vertices"]),
+        collocation_points=reflect(starboard["collocation_points"]),
+        normal_directions=reflect(starboard["normal_directions"]),
+        areas=starboard["areas"],
+        is_trailing_edge=starboard["is_trailing_edge"],
+        strip_index=starboard["strip_index"] + n_strips,
+        mirror_index=np.arange(n_panels),
+    )
+
+    return {key: np.concatenate((starboard[key], port[key])) for key in starboard}
+
+
+def _camber_line(xsec, chord_fractions):
+    """Nondimensional mean camber line of a cross section.
+
+    Parameters
+    ----------
+    xsec : aerosandbox.WingXSec
+    chord_fractions : numpy.array
+
+    Returns
+    -------
+    numpy.array
+        (n, 2)
+    """
+    airfoil = xsec.airfoil
+
+    if xsec.control_surface_deflection != 0:
+        airfoil = airfoil.add_control_surface(
+            deflection=xsec.control_surface_deflection,
+            hinge_point=xsec.control_surface_hinge_point,
+        )
+        return airfoil.get_downsampled_mcl(chord_fractions)
+
+    return _downsampled_mcl(airfoil, tuple(chord_fractions))
+
+
+@lru_cache(maxsize=256)
+def _downsampled_mcl(airfoil, chord_fractions):
+    """Mean camber line of a shared airfoil, memoized and read-only."""
+
+    mcl = airfoil.get_downsampled_mcl(np.array(chord_fractions))
+    mcl.flags.writeable = False
+
+    return mcl
+
+
+def zero_lift_angle(xsec, n_points=ZERO_LIFT_POINTS):
+    """Thin airfoil theory zero-lift angle of a cross section,
+
+        alpha_0 = -1/pi int_0^pi dz/dx (cos(theta) - 1) dtheta
+
+    with x = (1 - cos(theta)) / 2.
+
+    Parameters
+    ----------
+    xsec : aerosandbox.WingXSec
+    n_points : int, optional
+
+    Returns
+    -------
+    float
+        In radians.
+    """
+    theta = np.linspace(0.0, np.pi, n_points + 1)
+
+    mcl = _camber_line(xsec, 0.5 * (1.0 - np.cos(theta)))
+    slopes = np.diff(mcl[:, 1]) / np.diff(mcl[:, 0])
+
+    theta_mid = 0.5 * (theta[1:] + theta[:-1])
+
+    return -np.sum(slopes * (np.cos(theta_mid) - 1.0) * np.diff(theta)) / np.pi
+
+
+def _strip_zero_lift_angles(wing):
+    """Zero-lift angles of the spanwise strips of a wing, interpolated
+    between its cross sections in the `_mesh_wing` strip order.
+
+    Parameters
+    ----------
+    wing : aerosandbox.Wing
+
+    Returns
+    -------
+    numpy.array
+        (S,) in radians.
+    """
+    xsecs = wing.xsecs
+    xsec_angles = np.array([zero_lift_angle(xsec) for xsec in xsecs])
+
+    angles = []
+    for section_num, xsec in enumerate(xsecs[:-1]):
+
+        span_fractions = spacing(xsec.spanwise_spacing, xsec.spanwise_panels + 1)
+        middle = 0.5 * (span_fractions[1:] + span_fractions[:-1])
+
+        angles.append(
+            (1.0 - middle) * xsec_angles[section_num]
+            + middle * xsec_angles[section_num + 1]
+        )
+
+    angles = np.concatenate(angles)
+
+    if wing.symmetric:
+        angles = np.tile(angles, 2)
+
+    return angles
+
+
+def _make_panels(
+    front_inner, front_outer, back_inner, back_outer, is_trailing_edge, strip_index
+):
+    """Horseshoe vortex data from the panel corners.
+
+    Parameters
+    ----------
+    front_inner, front_outer, back_inner, back_outer : numpy.array
+        (N, 3) panel corners.
+    is_trailing_edge : numpy.array
+    strip_index : numpy.array
+
+    Returns
+    -------
+    dict
+    """
+    # Normals and areas from the diagonals
+    diagonals_cross = np.cross(front_outer - back_inner, front_inner - back_outer)
+    diagonals_norm = np.linalg.norm(diagonals_cross, axis=1)
+
+    panels = dict(
+        left_vortex_vertices=0.75 * front_inner + 0.25 * back_inner,
+        right_vortex_vertices=0.75 * front_outer + 0.25 * back_outer,
+        collocation_points=0.5 * (0.25 * front_inner + 0.75 * back_inner)
+        + 0.5 * (0.25 * front_outer + 0.75 * back_outer),
+        normal_directions=diagonals_cross / diagonals_norm[:, None],
+        areas=diagonals_norm / 2.0,
+        is_trailing_edge=is_trailing_edge,
+        strip_index=strip_index,
+    )
+
+    return panels
+
+
+def row_tiles(n_rows, n_columns, tile_bytes=TILE_BYTES, workers=1):
+    """Row blocks of a kernel evaluation within a memory budget.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of evaluation points.
+    n_columns : int
+        Number of vortices.
+    tile_bytes : int or None
+        Memory budget of the kernel temporaries of all the blocks being
+        evaluated at the same time. At least one row is evaluated at a
+        time. None evaluates all the rows at once.
+    workers : int, default 1
+        Blocks evaluated at the same time. There are at least as many
+        blocks as workers, if there are enough rows.
+
+    Returns
+    -------
+    list of slice
+    """
+    rows = max(-(-n_rows // workers), 1)
+
+    if tile_bytes is not None:
+        budget = tile_bytes / workers
+        rows = min(rows, int(budget // (KERNEL_BYTES_PER_PAIR * max(n_columns, 1))))
+        rows = max(rows, 1)
+
+    return [slice(start, min(start + rows, n_rows)) for start in range(0, n_rows, rows)]
+
+
+def map_tiles(function, tiles, workers=1):
+    """Evaluate a function on row tiles, on a thread pool if requested.
+
+    NumPy releases the GIL in the kernel operations, so the tiles are
+    evaluated in parallel by threads.
+
+    Parameters
+    ----------
+    function : callable
+        Called with every tile.
+    tiles : list of slice
+    workers : int, default 1
+        Number of threads.
+    """
+    if workers == 1 or len(tiles) == 1:
+        for rows in tiles:
+            function(rows)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the results to raise the errors of the tiles
+        list(executor.map(function, tiles))
+
+
+def resolve_workers(workers):
+    """Number of threads for an assembly.
+
+    Parameters
+    ----------
+    workers : int or None
+        None uses all the CPUs.
+
+    Returns
+    -------
+    int
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+
+    return max(int(workers), 1)
+
+
+def tiled_product(matrix, x, tile_bytes=TILE_BYTES):
+    """Product of a matrix with vectors in float64, by row tiles.
+
+    Only a tile of the matrix is read and cast to float64 at a time, so
+    the matrix may be single precision or memory-mapped.
+
+    Parameters
+    ----------
+    matrix : numpy.array
+        (M, N, ...)
+    x : numpy.array
+        (N,) or (N, K)
+    tile_bytes : int or None, optional
+        Memory budget of a float64 tile, None for no bound.
+
+    Returns
+    -------
+    numpy.array
+        (M, ...) or (M, ..., K), the product over the second axis of the
+        matrix.
+    """
+    n_rows = len(matrix)
+    row_size = 8 * int(np.prod(matrix.shape[1:]))
+
+    if tile_bytes is None:
+        rows = max(n_rows, 1)
+    else:
+        rows = max(1, int(tile_bytes // row_size))
+
+    y = np.empty(matrix.shape[:1] + matrix.shape[2:] + np.shape(x)[1:])
+    for start in range(0, n_rows, rows):
+        tile = np.asarray(matrix[start : start + rows], dtype=float)
+        y[start : start + rows] = np.tensordot(tile, x, axes=(1, 0))
+
+    return y
+
+
+def induced_velocities(
+    points,
+    left_vertices,
+    right_vertices,
+    symmetric=False,
+    tile_bytes=TILE_BYTES,
+    workers=1,
+    out=None,
+):
+    """Velocity induced by unit-strength horseshoe vortices.
+
+    The kernel is evaluated in row tiles, so that its temporaries stay
+    within `tile_bytes` besides the (M, N, 3) result.
+
+    Parameters
+    ----------
+    points : numpy.array
+        (M, 3) evaluation points.
+    left_vertices : numpy.array
+        (N, 3)
+    right_vertices : numpy.array
+        (N, 3)
+    symmetric : bool, default False
+        Add the velocity induced by the mirror image of every vortex over
+        the XZ plane, carrying the same strength.
+    tile_bytes : int or None, optional
+        Memory budget of the kernel temporaries, None for no bound.
+    workers : int or None, default 1
+        Threads evaluating the tiles, None for all the CPUs.
+    out : numpy.array, optional
+        (M, N, 3) array to store the result in.
+
+    Returns
+    -------
+    numpy.array
+        (M, N, 3) induced velocity of every vortex at every point.
+    """
+    points = np.reshape(points, (-1, 3))
+    workers = resolve_workers(workers)
+
+    if out is None:
+        out = np.empty((len(points), len(left_vertices), 3))
+
+    velocities = out
+
+    def _evaluate(rows):
+        velocities[rows] = _tile_velocities(
+            points[rows], left_vertices, right_vertices, symmetric
+        )
+
+    tiles = row_tiles(len(points), len(left_vertices), tile_bytes, workers)
+    map_tiles(_evaluate, tiles, workers)
+
+    return velocities
+
+
+def velocity_field(
+    points,
+    left_vertices,
+    right_vertices,
+    strengths,
+    symmetric=False,
+    tile_bytes=TILE_BYTES,
+    workers=1,
+):
+    """Velocity induced by horseshoe vortices of known strengths.
+
+    The kernel is evaluated and contracted with the strengths in row
+    tiles, so that the (M, N, 3) influence is never stored.
+
+    Parameters
+    ----------
+    points : numpy.array
+        (M, 3) evaluation points.
+    left_vertices : numpy.array
+        (N, 3)
+    right_vertices : numpy.array
+        (N, 3)
+    strengths : numpy.array
+        (N,) or (N, K)
+    symmetric : bool, default False
+        Add the velocity induced by the mirror-image vortices.
+    tile_bytes : int or None, optional
+        Memory budget of the kernel temporaries, None for no bound.
+    workers : int or None, default 1
+        Threads evaluating the tiles, None for all the CPUs.
+
+    Returns
+    -------
+    numpy.array
+        (M, 3) or (M, 3, K)
+    """
+    points = np.reshape(points, (-1, 3))
+    workers = resolve_workers(workers)
+
+    velocities = np.empty((len(points), 3) + np.shape(strengths)[1:])
+
+    def _evaluate(rows):
+        Vij = _tile_velocities(points[rows], left_vertices, right_vertices, symmetric)
+        velocities[rows] = np.tensordot(Vij, strengths, axes=(1, 0))
+
+    tiles = row_tiles(len(points), len(left_vertices), tile_bytes, workers)
+    map_tiles(_evaluate, tiles, workers)
+
+    return velocities
+
+
+def _tile_velocities(points, left_vertices, right_vertices, symmetric):
+    """Induced velocities of a row tile, with the mirror images."""
+
+    velocities = _horseshoe_velocities(points, left_vertices, right_vertices)
+
+    if symmetric:
+        velocities += _horseshoe_velocities(
+            points, reflect(right_vertices), reflect(left_vertices)
+        )
+
+    return velocities
+
+
+def _horseshoe_velocities(points, left_vertices, right_vertices):
+    """Biot-Savart kernel of horseshoe vortices, evaluated at once.
+
+    Leading dimensions are broadcast, to evaluate a batch of lattices.
+
+    Parameters
+    ----------
+    points : numpy.array
+        (..., M, 3)
+    left_vertices : numpy.array
+        (..., N, 3)
+    right_vertices : numpy.array
+        (..., N, 3)
+
+    Returns
+    -------
+    numpy.array
+        (..., M, N, 3)
+    """
+    points = np.expand_dims(points, -2)
+
+    a = points - np.expand_dims(left_vertices, -3)
+    b = points - np.expand_dims(right_vertices, -3)
+
+    a_cross_b = np.cross(a, b)
+    a_dot_b = np.einsum("...k,...k->...", a, b)
+
+    # Cross and dot products with the x unit vector (trailing legs)
+    a_cross_x = np.stack((np.zeros_like(a[..., 0]), a[..., 2], -a[..., 1]), axis=-1)
+    b_cross_x = np.stack((np.zeros_like(b[..., 0]), b[..., 2], -b[..., 1]), axis=-1)
+    a_dot_x = a[..., 0]
+    b_dot_x = b[..., 0]
+
+    norm_a = np.linalg.norm(a, axis=-1)
+    norm_b = np.linalg.norm(b, axis=-1)
+
+    # Points on a vortex leg line: push the dot product so the term vanishes
+    a_dot_b = a_dot_b + (
+        np.einsum("...k,...k->...", a_cross_b, a_cross_b) < SINGULARITY_TOL
+    )
+    a_dot_x = a_dot_x + (
+        np.einsum("...k,...k->...", a_cross_x, a_cross_x) < SINGULARITY_TOL
+    )
+    b_dot_x = b_dot_x + (
+        np.einsum("...k,...k->...", b_cross_x, b_cross_x) < SINGULARITY_TOL
+    )
+
+    term_bound = (1.0 / norm_a + 1.0 / norm_b) / (norm_a * norm_b + a_dot_b)
+    term_left = (1.0 / norm_a) / (norm_a - a_dot_x)
+    term_right = (1.0 / norm_b) / (norm_b - b_dot_x)
+
+    velocities = (
+        a_cross_b * term_bound[..., None]
+        + a_cross_x * term_left[..., None]
+        - b_cross_x * term_right[..., None]
+    ) / (4.0 * np.pi)
+
+    return velocities
+
+
+def influence_matrix(
+    points,
+    normals,
+    left_vertices,
+    right_vertices,
+    symmetric=False,
+    tile_bytes=TILE_BYTES,
+    workers=1,
+    out=None,
+):
+    """Normal-wash influence of unit-strength horseshoe vortices.
+
+    Assembled in row tiles, without the (M, N, 3) induced velocities.
+
+    Parameters
+    ----------
+    points : numpy.array
+        (M, 3)
+    normals : numpy.array
+        (M, 3)
+    left_vertices : numpy.array
+        (N, 3)
+    right_vertices : numpy.array
+        (N, 3)
+    symmetric : bool, default False
+        Add the influence of the mirror-image vortices.
+    tile_bytes : int or None, optional
+        Memory budget of the kernel temporaries, None for no bound.
+    workers : int or None, default 1
+        Threads assembling the tiles, None for all the CPUs.
+    out : numpy.array, optional
+        (M, N) array to store the result in, a numpy.memmap for instance.
+
+    Returns
+    -------
+    numpy.array
+        (M, N)
+    """
+    workers = resolve_workers(workers)
+
+    AIC = out if out is not None else np.empty((len(points), len(left_vertices)))
+
+    def _assemble(rows):
+        Vij = _tile_velocities(points[rows], left_vertices, right_vertices, symmetric)
+        AIC[rows] = np.einsum("ijk,ik->ij", Vij, normals[rows])
+
+    tiles = row_tiles(len(points), len(left_vertices), tile_bytes, workers)
+    map_tiles(_assemble, tiles, workers)
+
+    return AIC
+
+
+class InfluenceSystem:
+    def __init__(
+        self, lattice, reference, symmetric=False, tile_bytes=TILE_BYTES, workers=1
+    ):
+        """Assembled and LU-factorized vortex lattice system.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+            Every vortex is paired with a mirror image of the same
+            strength that is not part of the lattice.
+        tile_bytes : int, optional
+            Memory budget of the kernel temporaries during assembly.
+        workers : int or None, default 1
+            Threads assembling the influence matrices, None for all the
+            CPUs.
+        """
+        self.lattice = lattice
+        self.reference = reference
+        self.symmetric = symmetric
+        self.tile_bytes = tile_bytes
+        self.workers = workers
+
+        self.AIC = None
+        self._lu_piv = None
+        self._Vij_centers = None
+
+    @property
+    def nbytes(self):
+        """Memory held by the system arrays."""
+        return array_nbytes(vars(self), vars(self.lattice))
+
+    @property
+    def disk_nbytes(self):
+        """Disk space held by the memory-mapped system arrays."""
+        return array_nbytes(vars(self), memmap=True)
+
+    def assemble(self):
+        """Build and factorize the normal-wash influence matrix."""
+
+        lattice = self.lattice
+
+        self.AIC = influence_matrix(
+            lattice.collocation_points,
+            lattice.normal_directions,
+            lattice.left_vortex_vertices,
+            lattice.right_vortex_vertices,
+            symmetric=self.symmetric,
+            tile_bytes=self.tile_bytes,
+            workers=self.workers,
+        )
+
+        return self.factorize()
+
+    def factorize(self):
+        """LU-factorize the influence matrix."""
+
+        self._lu_piv = lu_factor(self.AIC)
+
+        return self
+
+    @property
+    def Vij_centers(self):
+        """Induced velocity influence at the vortex centers, (N, N, 3)."""
+
+        if self._Vij_centers is None:
+            lattice = self.lattice
+            self._Vij_centers = induced_velocities(
+                lattice.vortex_centers,
+                lattice.left_vortex_vertices,
+                lattice.right_vortex_vertices,
+                symmetric=self.symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+
+        return self._Vij_centers
+
+    def solve(self, rhs):
+        """Vortex strengths for normal-wash right-hand sides.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+        """
+        return lu_solve(self._lu_piv, rhs)
+
+    def solve_with_iterations(self, rhs, warm_start=None):
+        """Vortex strengths and iterations of normal-wash right-hand sides,
+        the interface of the iteratively solved systems. Direct solves
+        take no iterations and do not use the warm start.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+        warm_start : WarmStart, optional
+
+        Returns
+        -------
+        strengths : numpy.array
+        iterations : list of int
+            Iterations of every right-hand side.
+        """
+        return self.solve(rhs), [0] * (np.size(rhs) // len(rhs))
+
+    def induced_velocity_at_centers(self, strengths):
+        """Induced velocity at the vortex centers.
+
+        Parameters
+        ----------
+        strengths : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+            (N, 3) or (N, 3, K)
+        """
+        return np.tensordot(self.Vij_centers, strengths, axes=(1, 0))
+
+
+class PartitionedSystem(InfluenceSystem):
+    def __init__(self, lattice, reference, base):
+        """Vortex lattice system partitioned into a cached base block and
+        the remaining panels.
+
+        With the base panels (b) first and the remaining panels (r) last,
+        the system
+
+            | A_bb  A_br | | x_b |   | y_b |
+            | A_rb  A_rr | | x_r | = | y_r |
+
+        is solved through the Schur complement
+        S = A_rr - A_rb A_bb^-1 A_br, reusing the factorization of A_bb
+        and its center influence from `base`. Only the blocks involving
+        the remaining panels are assembled.
+
+        Parameters
+        ----------
+        lattice : Lattice
+            Full lattice whose leading panels are the base lattice.
+        reference : Reference
+        base : InfluenceSystem
+            Assembled system of the base panels.
+        """
+        super().__init__(
+            lattice=lattice,
+            reference=reference,
+            symmetric=base.symmetric,
+            tile_bytes=base.tile_bytes,
+            workers=base.workers,
+        )
+
+        self.base = base
+        self.n_base = base.lattice.n_panels
+
+        self.remainder = lattice.take(slice(self.n_base, None))
+
+        self._A_br = None
+        self._A_rb = None
+        self._Y = None
+        self._schur_lu_piv = None
+        self._Vij_blocks = None
+
+    def assemble(self):
+        """Build the off-base blocks and factorize the Schur complement."""
+
+        base = self.base.lattice
+        remainder = self.remainder
+
+        self._A_br = influence_matrix(
+            base.collocation_points,
+            base.normal_directions,
+            remainder.left_vortex_vertices,
+            remainder.right_vortex_vertices,
+            symmetric=self.symmetric,
+            tile_bytes=self.tile_bytes,
+            workers=self.workers,
+        )
+        self._A_rb = influence_matrix(
+            remainder.collocation_points,
+            remainder.normal_directions,
+            base.left_vortex_vertices,
+            base.right_vortex_vertices,
+            symmetric=self.symmetric,
+            tile_bytes=self.tile_bytes,
+            workers=self.workers,
+        )
+        A_rr = influence_matrix(
+            remainder.collocation_points,
+            remainder.normal_directions,
+            remainder.left_vortex_vertices,
+            remainder.right_vortex_vertices,
+            symmetric=self.symmetric,
+            tile_bytes=self.tile_bytes,
+            workers=self.workers,
+        )
+
+        self._Y = self.base.solve(self._A_br)
+        self._schur_lu_piv = lu_factor(A_rr - self._A_rb @ self._Y)
+
+        return self
+
+    def solve(self, rhs):
+
+        rhs_base = rhs[: self.n_base]
+        rhs_remainder = rhs[self.n_base :]
+
+        z = self.base.solve(rhs_base)
+        x_remainder = lu_solve(self._schur_lu_piv, rhs_remainder - self._A_rb @ z)
+        x_base = z - self._Y @ x_remainder
+
+        return np.concatenate((x_base, x_remainder))
+
+    @property
+    def Vij_centers(self):
+        """Induced velocity influence at the vortex centers, (N, N, 3)."""
+
+        if self._Vij_centers is None:
+            (W_bb, W_br), (W_rb, W_rr) = self._get_Vij_blocks()
+            self._Vij_centers = np.concatenate(
+                (
+                    np.concatenate((W_bb, W_br), axis=1),
+                    np.concatenate((W_rb, W_rr), axis=1),
+                )
+            )
+
+        return self._Vij_centers
+
+    def _get_Vij_blocks(self):
+        """Center influence blocks, reusing the base block."""
+
+        if self._Vij_blocks is None:
+
+            base = self.base.lattice
+            remainder = self.remainder
+
+            W_br = induced_velocities(
+                base.vortex_centers,
+                remainder.left_vortex_vertices,
+                remainder.right_vortex_vertices,
+                symmetric=self.symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+            W_rb = induced_velocities(
+                remainder.vortex_centers,
+                base.left_vortex_vertices,
+                base.right_vortex_vertices,
+                symmetric=self.symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+            W_rr = induced_velocities(
+                remainder.vortex_centers,
+                remainder.left_vortex_vertices,
+                remainder.right_vortex_vertices,
+                symmetric=self.symmetric,
+                tile_bytes=self.tile_bytes,
+                workers=self.workers,
+            )
+
+            self._Vij_blocks = ((self.base.Vij_centers, W_br), (W_rb, W_rr))
+
+        return self._Vij_blocks
+
+    def induced_velocity_at_centers(self, strengths):
+
+        (W_bb, W_br), (W_rb, W_rr) = self._get_Vij_blocks()
+
+        strengths_base = strengths[: self.n_base]
+        strengths_remainder = strengths[self.n_base :]
+
+        velocities_base = np.tensordot(
+            W_bb, strengths_base, axes=(1, 0)
+        ) + np.tensordot(W_br, strengths_remainder, axes=(1, 0))
+        velocities_remainder = np.tensordot(
+            W_rb, strengths_base, axes=(1, 0)
+        ) + np.tensordot(W_rr, strengths_remainder, axes=(1, 0))
+
+        return np.concatenate((velocities_base, velocities_remainder))
+
+
+class SymmetricSystem(InfluenceSystem):
+    def __init__(self, lattice, reference, half):
+        """Vortex lattice system of a configuration symmetric about the XZ
+        plane, solved on its starboard half.
+
+        Without sideslip the right-hand side and the vortex strengths are
+        symmetric, so only the starboard panels are unknowns and the
+        influence of their mirror images is added to the kernel. The
+        system has half the unknowns and is assembled in half the kernel
+        evaluations of the full lattice.
+
+        Parameters
+        ----------
+        lattice : Lattice
+            Full lattice, with every panel paired with its mirror image.
+        reference : Reference
+        half : InfluenceSystem
+            Symmetric system of the starboard panels, in lattice order.
+        """
+        super().__init__(lattice=lattice, reference=reference)
+
+        self.half = half
+
+        is_starboard = lattice.is_starboard
+
+        self.starboard = np.flatnonzero(is_starboard)
+
+        # Starboard unknown of every panel
+        positions = np.full(lattice.n_panels, -1)
+        positions[self.starboard] = np.arange(len(self.starboard))
+        self.half_index = np.where(
+            is_starboard, positions, positions[lattice.mirror_index]
+        )
+
+        # Sign of the y component of the velocities on the port panels
+        self._y_sign = np.where(is_starboard, 1.0, -1.0)
+
+    @property
+    def nbytes(self):
+        return array_nbytes(vars(self), vars(self.lattice)) + self.half.nbytes
+
+    @property
+    def disk_nbytes(self):
+        return array_nbytes(vars(self), memmap=True) + self.half.disk_nbytes
+
+    def assemble(self):
+        """Assemble and factorize the starboard half system."""
+
+        if self.half._lu_piv is None:
+            self.half.assemble()
+
+        return self
+
+    def solve(self, rhs):
+        """Vortex strengths for symmetric normal-wash right-hand sides.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K), equal on every panel and its mirror image.
+
+        Returns
+        -------
+        numpy.array
+        """
+        strengths = self.half.solve(rhs[self.starboard])
+
+        return strengths[self.half_index]
+
+    def solve_with_iterations(self, rhs, warm_start=None):
+        strengths, iterations = self.half.solve_with_iterations(
+            rhs[self.starboard], warm_start=warm_start
+        )
+
+        return strengths[self.half_index], iterations
+
+    def induced_velocity_at_centers(self, strengths):
+        """Induced velocity at the vortex centers for symmetric strengths.
+
+        The velocities on the port panels are the mirror images of the
+        starboard ones.
+
+        Parameters
+        ----------
+        strengths : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+            (N, 3) or (N, 3, K)
+        """
+        velocities = self.half.induced_velocity_at_centers(strengths[self.starboard])
+        velocities = velocities[self.half_index]
+        velocities[:, 1] *= np.reshape(
+            self._y_sign, (-1,) + (1,) * (np.ndim(strengths) - 1)
+        )
+
+        return velocities
+
+
+class MixedPrecisionSystem(InfluenceSystem):
+
+    MAX_REFINEMENT = 10
+    REFINEMENT_TOL = 1e-12
+
+    def __init__(
+        self, lattice, reference, symmetric=False, tile_bytes=TILE_BYTES, workers=1
+    ):
+        """Vortex lattice system factorized in single precision.
+
+        The influence matrix is kept in float64 and only its LU factors
+        are single precision, which halves their memory and speeds up the
+        factorization. Solutions are refined with float64 residuals of the
+        stored matrix until the correction is below REFINEMENT_TOL, so
+        they converge to the float64 system.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+        tile_bytes : int, optional
+        workers : int or None, default 1
+
+        Attributes
+        ----------
+        refinement_steps : int
+            Refinement steps of the last solve.
+        """
+        super().__init__(
+            lattice=lattice,
+            reference=reference,
+            symmetric=symmetric,
+            tile_bytes=tile_bytes,
+            workers=workers,
+        )
+
+        self.refinement_steps = 0
+
+    def factorize(self):
+        """LU-factorize the influence matrix in single precision."""
+
+        self._lu_piv = lu_factor(self.AIC.astype(np.float32), overwrite_a=True)
+
+        return self
+
+    def solve(self, rhs):
+        """Vortex strengths for normal-wash right-hand sides, refined in
+        double precision.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+        """
+        rhs = np.asarray(rhs, dtype=float)
+
+        strengths = lu_solve(self._lu_piv, rhs.astype(np.float32)).astype(float)
+
+        scale = np.max(np.abs(strengths))
+
+        self.refinement_steps = 0
+        while self.refinement_steps < self.MAX_REFINEMENT:
+
+            residual = rhs - self.AIC @ strengths
+            correction = lu_solve(self._lu_piv, residual.astype(np.float32))
+
+            strengths += correction
+            self.refinement_steps += 1
+
+            if np.max(np.abs(correction)) <= self.REFINEMENT_TOL * scale:
+                break
+
+        return strengths
+
+
+class OutOfCoreSystem(InfluenceSystem):
+
+    RTOL = 1e-10
+    MAX_ITER = 1000
+    RESTART = 50
+    BLOCK_PANELS = 256
+
+    def __init__(
+        self,
+        lattice,
+        reference,
+        symmetric=False,
+        tile_bytes=TILE_BYTES,
+        workers=1,
+        directory=None,
+    ):
+        """Vortex lattice system whose influence matrix is stored on disk.
+
+        The influence matrix is assembled tile by tile into a temporary
+        memory-mapped file and the system is solved by GMRES, streaming
+        the matrix by row tiles. The diagonal blocks of BLOCK_PANELS
+        panels, which hold the strong chordwise coupling of the strips,
+        are factorized in memory as a block Jacobi preconditioner. The
+        velocities at the vortex centers are recomputed tile by tile
+        instead of being stored.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+        tile_bytes : int, optional
+            Memory budget of the kernel temporaries and of the matrix
+            tiles read from disk.
+        workers : int or None, default 1
+        directory : str, optional
+            Directory of the temporary file, by default the system one.
+        """
+        super().__init__(
+            lattice=lattice,
+            reference=reference,
+            symmetric=symmetric,
+            tile_bytes=tile_bytes,
+            workers=workers,
+        )
+
+        self.directory = directory
+
+        self._file = None
+        self._blocks = None
+
+    def assemble(self):
+        """Build the influence matrix on disk and factorize the
+        preconditioner."""
+
+        lattice = self.lattice
+        n_panels = lattice.n_panels
+
+        # Unlinked on creation, removed from disk once closed
+        self._file = tempfile.TemporaryFile(dir=self.directory)
+        self.AIC = np.memmap(
+            self._file, dtype=float, mode="w+", shape=(n_panels, n_panels)
+        )
+
+        influence_matrix(
+            lattice.collocation_points,
+            lattice.normal_directions,
+            lattice.left_vortex_vertices,
+            lattice.right_vortex_vertices,
+            symmetric=self.symmetric,
+            tile_bytes=self.tile_bytes,
+            workers=self.workers,
+            out=self.AIC,
+        )
+        self.AIC.flush()
+
+        return self.factorize()
+
+    def factorize(self):
+        """LU-factorize the diagonal blocks of the influence matrix."""
+
+        n_panels = self.lattice.n_panels
+
+        self._blocks = []
+        for start in range(0, n_panels, self.BLOCK_PANELS):
+            block = slice(start, min(start + self.BLOCK_PANELS, n_panels))
+            self._blocks.append((block, lu_factor(np.array(self.AIC[block, block]))))
+
+        return self
+
+    def _matvec(self, x):
+        """Product with the influence matrix, streamed by row tiles."""
+        return tiled_product(self.AIC, x, self.tile_bytes)
+
+    def _precondition(self, x):
+        """Block Jacobi preconditioner."""
+
+        y = np.empty_like(x)
+        for block, lu_piv in self._blocks:
+            y[block] = lu_solve(lu_piv, x[block])
+
+        return y
+
+    def solve(self, rhs):
+        """Vortex strengths for normal-wash right-hand sides.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+
+        Raises
+        ------
+        ValueError
+            If GMRES does not converge.
+        """
+        strengths, _ = self.solve_with_iterations(rhs)
+
+        return strengths
+
+    def solve_with_iterations(self, rhs, warm_start=None):
+        """Vortex strengths and GMRES iterations of normal-wash right-hand
+        sides. Nothing is stored on the system, which may be shared.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+        warm_start : WarmStart, optional
+            Initial guesses, updated with the solution.
+
+        Returns
+        -------
+        strengths : numpy.array
+        iterations : list of int
+            Iterations of every right-hand side.
+
+        Raises
+        ------
+        ValueError
+            If GMRES does not converge.
+        """
+        x0 = None if warm_start is None else warm_start.get(np.shape(rhs))
+
+        strengths, iterations = gmres_solve(
+            self._matvec,
+            self._precondition,
+            rhs,
+            x0=x0,
+            rtol=self.RTOL,
+            restart=self.RESTART,
+            maxiter=self.MAX_ITER,
+        )
+
+        if warm_start is not None:
+            warm_start.put(strengths)
+
+        return strengths, iterations
+
+    def induced_velocity_at_centers(self, strengths):
+        """Induced velocity at the vortex centers, evaluated tile by tile.
+
+        Parameters
+        ----------
+        strengths : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+            (N, 3) or (N, 3, K)
+        """
+        lattice = self.lattice
+        centers = lattice.vortex_centers
+        workers = resolve_workers(self.workers)
+
+        velocities = np.empty((lattice.n_panels, 3) + np.shape(strengths)[1:])
+
+        def _evaluate(rows):
+            Vij = _tile_velocities(
+                centers[rows],
+                lattice.left_vortex_vertices,
+                lattice.right_vortex_vertices,
+                self.symmetric,
+            )
+            velocities[rows] = np.tensordot(Vij, strengths, axes=(1, 0))
+
+        tiles = row_tiles(lattice.n_panels, lattice.n_panels, self.tile_bytes, workers)
+        map_tiles(_evaluate, tiles, workers)
+
+        return velocities
+
+
+class _IterationCounter:
+    """GMRES callback counting the iterations."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, residual):
+        self.count += 1
+
+
+def gmres_solve(
+    matvec, precondition, rhs, x0=None, rtol=1e-10, restart=50, maxiter=1000
+):
+    """Preconditioned GMRES solve of every right-hand side.
+
+    Parameters
+    ----------
+    matvec : callable
+        Product of the (N, N) system matrix with a vector.
+    precondition : callable
+        Approximate inverse of the system matrix applied to a vector.
+    rhs : numpy.array
+        (N,) or (N, K)
+    x0 : numpy.array, optional
+        Initial guess with the shape of rhs, by default zero.
+    rtol : float
+        Tolerance on the residual relative to the right-hand side.
+    restart : int
+    maxiter : int
+
+    Returns
+    -------
+    solution : numpy.array
+        With the shape of rhs.
+    iterations : list of int
+        Iterations of every right-hand side.
+
+    Raises
+    ------
+    ValueError
+        If GMRES does not converge.
+    """
+    n_rows = np.shape(rhs)[0]
+    shape = (n_rows, n_rows)
+
+    operator = LinearOperator(shape, matvec=matvec, dtype=float)
+    preconditioner = LinearOperator(shape, matvec=precondition, dtype=float)
+
+    columns = np.reshape(rhs, (n_rows, -1))
+    guesses = None if x0 is None else np.reshape(x0, columns.shape)
+    solution = np.empty(columns.shape)
+
+    iterations = []
+    for k in range(columns.shape[1]):
+
+        counter = _IterationCounter()
+        solution[:, k], info = gmres(
+            operator,
+            columns[:, k],
+            x0=None if guesses is None else guesses[:, k],
+            rtol=rtol,
+            atol=0.0,
+            restart=restart,
+            maxiter=maxiter,
+            M=preconditioner,
+            callback=counter,
+            callback_type="pr_norm",
+        )
+
+        if info != 0:
+            raise ValueError(f"GMRES did not converge for the right-hand side {k}.")
+
+        iterations.append(counter.count)
+
+    return solution.reshape(np.shape(rhs)), iterations
+
+
+class KrylovSystem(InfluenceSystem):
+
+    RTOL = 1e-10
+    MAX_ITER = 200
+    RESTART = 50
+
+    def __init__(
+        self,
+        lattice,
+        reference,
+        symmetric=False,
+        tile_bytes=TILE_BYTES,
+        workers=1,
+        preconditioner=None,
+    ):
+        """Vortex lattice system solved by GMRES, preconditioned with the
+        factorization of a nearby geometry.
+
+        Consecutive geometries of a design loop differ by small winglet
+        perturbations, so the LU factors of an earlier influence matrix
+        with the same panels are a close approximate inverse and the
+        previous vortex strengths are a close initial guess. Each solve
+        then costs a few matrix-vector products instead of a new
+        factorization.
+
+        Parameters
+        ----------
+        lattice : Lattice
+        reference : Reference
+        symmetric : bool, default False
+        tile_bytes : int, optional
+        workers : int or None, default 1
+        preconditioner : InfluenceSystem, optional
+            Factorized system of a nearby geometry. Without it, or if its
+            panel count differs, the system factorizes its own matrix.
+        """
+        super().__init__(
+            lattice=lattice,
+            reference=reference,
+            symmetric=symmetric,
+            tile_bytes=tile_bytes,
+            workers=workers,
+        )
+
+        self.preconditioner = preconditioner
+
+    @property
+    def is_self_preconditioned(self):
+        """Whether the preconditioner is the factorization of this system."""
+        return self.preconditioner is None
+
+    def factorize(self):
+        """LU-factorize the influence matrix, unless the factorization of
+        a nearby geometry is available."""
+
+        preconditioner = self.preconditioner
+
+        if (
+            preconditioner is None
+            or preconditioner._lu_piv is None
+            or preconditioner.symmetric != self.symmetric
+            or preconditioner.lattice.n_panels != self.lattice.n_panels
+        ):
+            self.preconditioner = None
+            return super().factorize()
+
+        self._lu_piv = preconditioner._lu_piv
+
+        return self
+
+    @property
+    def nbytes(self):
+        """Memory held by the system arrays and by the preconditioner it
+        keeps alive."""
+
+        values = [vars(self), vars(self.lattice)]
+        if self.preconditioner is not None:
+            values += [vars(self.preconditioner), vars(self.preconditioner.lattice)]
+
+        return array_nbytes(*values)
+
+    def solve(self, rhs):
+        """Vortex strengths for normal-wash right-hand sides, without
+        warm start.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+
+        Returns
+        -------
+        numpy.array
+
+        Raises
+        ------
+        ValueError
+            If GMRES does not converge.
+        """
+        strengths, _ = self.solve_with_iterations(rhs)
+
+        return strengths
+
+    def solve_with_iterations(self, rhs, warm_start=None):
+        """Vortex strengths and GMRES iterations of normal-wash right-hand
+        sides. Nothing is stored on the system, which may be cached and
+        shared; previous solutions come from the warm start of the caller.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (N,) or (N, K)
+        warm_start : WarmStart, optional
+            Initial guesses, updated with the solution.
+
+        Returns
+        -------
+        strengths : numpy.array
+        iterations : list of int
+            Iterations of every right-hand side, zero if solved by the
+            factorization of the system.
+
+        Raises
+        ------
+        ValueError
+            If GMRES does not converge.
+        """
+        rhs = np.asarray(rhs, dtype=float)
+
+        if self.is_self_preconditioned:
+            strengths = super().solve(rhs)
+            iterations = [0] * (rhs.size // len(rhs))
+        else:
+            x0 = None if warm_start is None else warm_start.get(rhs.shape)
+
+            strengths, iterations = gmres_solve(
+                lambda x: self.AIC @ x,
+                lambda x: lu_solve(self._lu_piv, x),
+                rhs,
+                x0=x0,
+                rtol=self.RTOL,
+                restart=self.RESTART,
+                maxiter=self.MAX_ITER,
+            )
+
+        if warm_start is not None:
+            warm_start.put(strengths)
+
+        return strengths, iterations
+
+
+class WarmStart:
+    def __init__(self):
+        """Last solutions of a sequence of systems, by right-hand side
+        shape, used as GMRES initial guesses. Thread-safe."""
+        self._solutions = dict()
+        self._lock = threading.Lock()
+
+    def get(self, shape):
+        """Last solution with a shape, if any.
+
+        Parameters
+        ----------
+        shape : tuple
+
+        Returns
+        -------
+        numpy.array or None
+        """
+        with self._lock:
+            return self._solutions.get(tuple(shape))
+
+    def put(self, solution):
+        """Store a solution.
+
+        Parameters
+        ----------
+        solution : numpy.array
+        """
+        with self._lock:
+            self._solutions[np.shape(solution)] = np.array(solution)
+
+    def clear(self):
+        with self._lock:
+            self._solutions.clear()
+
+
+class BatchedSystem:
+    def __init__(self, lattices, references, symmetric=False, tile_bytes=TILE_BYTES):
+        """Influence systems of lattices with the same panel count,
+        assembled and solved together.
+
+        The lattice arrays are stacked along a leading batch axis, the
+        kernel is evaluated on chunks of lattices, or row tiles of a
+        lattice, within `tile_bytes` and
+        the (B, N, N) influence tensor is solved by one batched LAPACK
+        call, without per-lattice Python overhead.
+
+        Parameters
+        ----------
+        lattices : list of Lattice
+        references : list of Reference
+        symmetric : bool, default False
+            Every vortex is paired with a mirror image of the same
+            strength that is not part of the lattice.
+        tile_bytes : int or None, optional
+            Memory budget of the kernel temporaries during assembly.
+
+        Raises
+        ------
+        ValueError
+            If the lattices do not have the same panel count.
+        """
+        if len({lattice.n_panels for lattice in lattices}) != 1:
+            raise ValueError("The lattices must have the same panel count.")
+
+        def _stack(name):
+            return np.stack([getattr(lattice, name) for lattice in lattices])
+
+        self.lattices = lattices
+        self.symmetric = symmetric
+        self.tile_bytes = tile_bytes
+
+        self.collocation_points = _stack("collocation_points")
+        self.normal_directions = _stack("normal_directions")
+        self.left_vortex_vertices = _stack("left_vortex_vertices")
+        self.right_vortex_vertices = _stack("right_vortex_vertices")
+        self.vortex_centers = _stack("vortex_centers")
+        self.vortex_bound_leg = _stack("vortex_bound_leg")
+
+        # Reference dimensions as (B,) arrays, broadcasting with the loads
+        self.reference = Reference(
+            s_ref=np.array([reference.s_ref for reference in references]),
+            c_ref=np.array([reference.c_ref for reference in references]),
+            b_ref=np.array([reference.b_ref for reference in references]),
+        )
+        self.xyz_ref = np.stack([reference.xyz_ref for reference in references])
+
+        self.AIC = None
+        self._Vij_centers = None
+
+    @property
+    def n_batch(self):
+        return len(self.lattices)
+
+    @property
+    def n_panels(self):
+        return self.lattices[0].n_panels
+
+    def _tiles(self, n_rows):
+        """Slices of lattices and of rows whose kernel temporaries fit the
+        budget, the rows of a lattice being split when a whole lattice does
+        not fit."""
+
+        size = self.n_batch
+        rows = [slice(0, n_rows)]
+
+        if self.tile_bytes is not None:
+            pairs = KERNEL_BYTES_PER_PAIR * n_rows * self.n_panels
+            size = max(1, min(size, int(self.tile_bytes // pairs)))
+
+            if pairs > self.tile_bytes:
+                rows = row_tiles(n_rows, self.n_panels, self.tile_bytes)
+
+        return [
+            (slice(start, min(start + size, self.n_batch)), _rows)
+            for start in range(0, self.n_batch, size)
+            for _rows in rows
+        ]
+
+    def assemble(self):
+        """Build the (B, N, N) normal-wash influence tensor."""
+
+        self.AIC = np.empty((self.n_batch, self.n_panels, self.n_panels))
+
+        for chunk, rows in self._tiles(self.n_panels):
+            Vij = _tile_velocities(
+                self.collocation_points[chunk, rows],
+                self.left_vortex_vertices[chunk],
+                self.right_vortex_vertices[chunk],
+                self.symmetric,
+            )
+            self.AIC[chunk, rows] = np.einsum(
+                "bijk,bik->bij", Vij, self.normal_directions[chunk, rows]
+            )
+
+        return self
+
+    @property
+    def Vij_centers(self):
+        """Induced velocity influence at the vortex centers, (B, N, N, 3)."""
+
+        if self._Vij_centers is None:
+
+            self._Vij_centers = np.empty((self.n_batch,) + (self.n_panels,) * 2 + (3,))
+
+            for chunk, rows in self._tiles(self.n_panels):
+                self._Vij_centers[chunk, rows] = _tile_velocities(
+                    self.vortex_centers[chunk, rows],
+                    self.left_vortex_vertices[chunk],
+                    self.right_vortex_vertices[chunk],
+                    self.symmetric,
+                )
+
+        return self._Vij_centers
+
+    def solve(self, rhs):
+        """Vortex strengths for normal-wash right-hand sides.
+
+        Parameters
+        ----------
+        rhs : numpy.array
+            (B, N) or (B, N, K)
+
+        Returns
+        -------
+        numpy.array
+        """
+        if np.ndim(rhs) == 2:
+            return np.linalg.solve(self.AIC, rhs[..., None])[..., 0]
+
+        return np.linalg.solve(self.AIC, rhs)
+
+    def induced_velocity_at_centers(self, strengths):
+        """Induced velocity at the vortex centers.
+
+        Parameters
+        ----------
+        strengths : numpy.array
+            (B, N) or (B, N, K)
+
+        Returns
+        -------
+        numpy.array
+            (B, N, 3) or (B, N, 3, K)
+        """
+        if np.ndim(strengths) == 2:
+            return np.einsum("bijk,bj->bik", self.Vij_centers, strengths)
+
+        return np.einsum("bijk,bjl->bikl", self.Vij_centers, strengths)
+
+    def near_field_loads(self, strengths, velocities):
+        """Total near-field force and moment of every lattice.
+
+        Parameters
+        ----------
+        strengths : numpy.array
+            (B, N)
+        velocities : numpy.array
+            (B, N, 3) total velocity at the vortex centers.
+
+        Returns
+        -------
+        force : numpy.array
+            (3, B) force per unit density.
+        moment : numpy.array
+            (3, B) moment per unit density about the reference points.
+        """
+        forces = np.cross(velocities, self.vortex_bound_leg) * strengths[..., None]
+        arms = self.vortex_centers - self.xyz_ref[:, None, :]
+        moments = np.cross(arms, forces)
+
+        return forces.sum(axis=1).T, moments.sum(axis=1).T
+
+
+def freestream_direction(alpha):
+    """Unit freestream vector in geometry axes, without sideslip.
+
+    Parameters
+    ----------
+    alpha : float or numpy.array
+        In degrees.
+
+    Returns
+    -------
+    numpy.array
+        (3,) or (3, M)
+    """
+    _alpha = np.deg2rad(alpha)
+
+    return np.array([np.cos(_alpha), np.zeros_like(_alpha), np.sin(_alpha)])
+
+
+def near_field_loads(system, strengths, velocities):
+    """Near-field panel forces from the Kutta-Joukowski theorem.
+
+    Parameters
+    ----------
+    system : InfluenceSystem
+    strengths : numpy.array
+        (N,) or (N, K) vortex strengths.
+    velocities : numpy.array
+        (N, 3) or (N, 3, K) total velocity at the vortex centers.
+
+    Returns
+    -------
+    forces : numpy.array
+        (N, 3) or (N, 3, K) force per unit density.
+    force : numpy.array
+        (3,) or (3, K) total force per unit density.
+    moment : numpy.array
+        (3,) or (3, K) total moment per unit density about the reference
+        point.
+    """
+    lattice = system.lattice
+
+    extra_dims = np.ndim(strengths) - 1
+    legs = np.reshape(lattice.vortex_bound_leg, (-1, 3) + (1,) * extra_dims)
+    arms = np.reshape(
+        lattice.vortex_centers - system.reference.xyz_ref, (-1, 3) + (1,) * extra_dims
+    )
+
+    forces = np.cross(velocities, legs, axis=1) * np.expand_dims(strengths, 1)
+    moments = np.cross(arms, forces, axis=1)
+
+    return forces, forces.sum(axis=0), moments.sum(axis=0)
+
+
+def trefftz_plane_drag(lattice, strengths):
+    """Induced drag from the trailing vortices in the Trefftz plane.
+
+    Far downstream the wake of every spanwise strip is a pair of
+    two-dimensional vortices at the trailing edge vortex vertices, with
+    the strip circulation. The induced drag is
+
+        D = - 1/2 rho sum_s Gamma_s (v_s . n_s) l_s
+
+    with v_s the velocity induced by the wake at the middle of the strip
+    trace, n_s its normal and l_s its length. The panels of every strip
+    must be contiguous and ordered from the leading to the trailing edge,
+    as in this lattice and in aerosandbox.vlm3.
+
+    Parameters
+    ----------
+    lattice : Lattice or aerosandbox.vlm3
+    strengths : numpy.array
+        (N,) or (N, K) vortex strengths.
+
+    Returns
+    -------
+    float or numpy.array
+        Drag along x per unit density, () or (K,).
+    """
+    is_trailing_edge = np.asarray(lattice.is_trailing_edge, dtype=bool)
+    trailing_edge = np.flatnonzero(is_trailing_edge)
+
+    # Strip circulations
+    strip_starts = np.concatenate(([0], trailing_edge[:-1] + 1))
+    gamma = np.add.reduceat(strengths, strip_starts, axis=0)
+
+    # Wake trace on the YZ plane
+    left = lattice.left_vortex_vertices[trailing_edge, 1:]
+    right = lattice.right_vortex_vertices[trailing_edge, 1:]
+
+    tangents = right - left
+    lengths = np.linalg.norm(tangents, axis=1)
+    normals = np.stack((-tangents[:, 1], tangents[:, 0]), axis=1) / lengths[:, None]
+    midpoints = 0.5 * (left + right)
+
+    def _vortex_velocity(vertices):
+        """Velocity of unit vortices along +x at the strip midpoints."""
+        d = midpoints[:, None, :] - vertices[None, :, :]
+        d_squared = np.sum(d**2, axis=-1)
+        d_squared = np.where(d_squared < SINGULARITY_TOL, np.inf, d_squared)
+
+        return np.stack((-d[..., 1], d[..., 0]), axis=-1) / (
+            2.0 * np.pi * d_squared[..., None]
+        )
+
+    # Normal wash influence, (S, S)
+    velocities = _vortex_velocity(right) - _vortex_velocity(left)
+    normal_wash = np.einsum("ijk,ik->ij", velocities, normals)
+
+    wash = normal_wash @ gamma
+
+    extra_dims = np.ndim(strengths) - 1
+    lengths = np.reshape(lengths, (-1,) + (1,) * extra_dims)
+
+    return -0.5 * np.sum(gamma * wash * lengths, axis=0)
+
+
+def wind_axes_coefficients(force, moment, alpha, dynamic_pressure, reference):
+    """Aerodynamic coefficients from geometry axes loads, without sideslip.
+
+    Parameters
+    ----------
+    force : numpy.array
+        (3,) or (3, M)
+    moment : numpy.array
+        (3,) or (3, M)
+    alpha : float or numpy.array
+        In degrees.
+    dynamic_pressure : float
+        In the same units as the loads.
+    reference : Reference
+
+    Returns
+    -------
+    dict
+    """
+    _alpha = np.deg2rad(alpha)
+    cos_alpha = np.cos(_alpha)
+    sin_alpha = np.sin(_alpha)
+
+    q_s = dynamic_pressure * reference.s_ref
+    q_b = dynamic_pressure * reference.b_ref
+    q_c = dynamic_pressure * reference.c_ref
+
+    coefficients = dict(
+        CL=(cos_alpha * force[2] - sin_alpha * force[0]) / q_s,
+        CDi=(cos_alpha * force[0] + sin_alpha * force[2]) / q_s,
+        CY=force[1] / q_s,
+        Cl=-(cos_alpha * moment[0] + sin_alpha * moment[2]) / q_b,
+        Cm=moment[1] / q_c,
+        Cn=(sin_alpha * moment[0] - cos_alpha * moment[2]) / q_b,
+    )
+
+    return coefficients
+
+
+class SpanwiseLoads:
+    def __init__(self, lattice, forces, alpha):
+        """Loads of the spanwise strips of a lattice, as contiguous arrays.
+
+        The panels of every strip must be contiguous and ordered from the
+        leading to the trailing edge, as in this lattice and in
+        aerosandbox.vlm3.
+
+        Parameters
+        ----------
+        lattice : Lattice or aerosandbox.vlm3
+        forces : numpy.array
+            (N, 3) panel forces in geometry axes.
+        alpha : float
+            In degrees.
+
+        Attributes
+        ----------
+        y, z : numpy.array
+            (S,) strip centers.
+        width : numpy.array
+            (S,) strip widths on the YZ plane.
+        chord : numpy.array
+            (S,) mean strip chords.
+        forces : numpy.array
+            (S, 3) strip forces in geometry axes.
+        lift : numpy.array
+            (S,) strip forces normal to the freestream.
+        normals : numpy.array
+            (S, 3) unit strip normals, area-weighted over the panels of the
+            strip and normal to the freestream.
+        normal_force : numpy.array
+            (S,) strip forces normal to the freestream along the strip
+            normals, the lift of the strip in its own plane.
+        profile_drag : numpy.array or None
+            (S,) strip profile drag, if estimated by the solver.
+        """
+        is_trailing_edge = np.asarray(lattice.is_trailing_edge, dtype=bool)
+        trailing_edge = np.flatnonzero(is_trailing_edge)
+
+        starts = np.concatenate(([0], trailing_edge[:-1] + 1))
+        counts = trailing_edge + 1 - starts
+
+        centers = np.add.reduceat(lattice.vortex_centers, starts, axis=0)
+        centers /= counts[:, None]
+
+        legs = (
+            lattice.right_vortex_vertices[trailing_edge]
+            - lattice.left_vortex_vertices[trailing_edge]
+        )
+
+        _alpha = np.deg2rad(alpha)
+        freestream = freestream_direction(alpha)
+
+        normals = np.add.reduceat(
+            lattice.areas[:, None] * lattice.normal_directions, starts, axis=0
+        )
+        normals -= np.outer(normals @ freestream, freestream)
+        normals /= np.linalg.norm(normals, axis=1)[:, None]
+
+        self.y = np.ascontiguousarray(centers[:, 1])
+        self.z = np.ascontiguousarray(centers[:, 2])
+        self.width = np.linalg.norm(legs[:, 1:], axis=1)
+        self.chord = np.add.reduceat(lattice.areas, starts) / self.width
+        self.forces = np.add.reduceat(forces, starts, axis=0)
+        self.lift = np.cos(_alpha) * self.forces[:, 2] - np.sin(_alpha) * (
+            self.forces[:, 0]
+        )
+        self.normals = normals
+        self.normal_force = np.einsum(
+            "ij,ij->i",
+            self.forces - np.outer(self.forces @ freestream, freestream),
+            normals,
+        )
+        self.profile_drag = None
+
+    @property
+    def lift_per_span(self):
+        """Sectional lift, (S,)."""
+        return self.lift / self.width
+
+    @property
+    def root_bending_moment(self):
+        """Bending moment about the x axis at the root of the starboard
+        wing, from the strips with positive y."""
+        arms = np.where(self.y > 0.0, 1.0, 0.0)
+        return arms @ (self.y * self.forces[:, 2] - self.z * self.forces[:, 1])
+
+
+class VortexLatticeResult:
+    def __init__(
+        self, system, alpha, velocity, density, vortex_strengths, near_field=True
+    ):
+        """Solution of the native vortex lattice at an operating point.
+
+        Parameters
+        ----------
+        system : InfluenceSystem
+        alpha : float
+            In degrees.
+        velocity : float
+        density : float
+        vortex_strengths : numpy.array
+        near_field : bool, default True
+            False skips the O(N^2) induced velocities at the vortex
+            centers and takes the forces in the freestream only. CDi is
+            then zero and must come from the Trefftz plane.
+        """
+        self.lattice = system.lattice
+        self.alpha = alpha
+        self.velocity = velocity
+        self.density = density
+        self.vortex_strengths = vortex_strengths
+
+        freestream = velocity * freestream_direction(alpha)
+        if near_field:
+            velocities = (
+                system.induced_velocity_at_centers(vortex_strengths) + freestream
+            )
+        else:
+            velocities = np.broadcast_to(
+                freestream, np.shape(self.lattice.vortex_centers)
+            )
+
+        forces, force, moment = near_field_loads(system, vortex_strengths, velocities)
+
+        self.forces_geometry = density * forces
+        self.Ftotal_geometry = density * force
+        self.Mtotal_geometry = density * moment
+
+        coefficients = wind_axes_coefficients(
+            force=force,
+            moment=moment,
+            alpha=alpha,
+            dynamic_pressure=0.5 * velocity**2,
+            reference=system.reference,
+        )
+
+        for key, value in coefficients.items():
+            setattr(self, key, value)
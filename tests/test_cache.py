@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+import winglets as wl
+from winglets.backends import VortexLatticeBackend
+from winglets.cache import SystemCache, geometry_fingerprint
+from winglets.conventions import WingletParameters
+from winglets.solver import WingSolver
+from winglets.utils import get_base_sections, get_base_winglet_parametrization
+
+
+class _System:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+def _create_flying_wing(winglet_parameters):
+
+    _wing = wl.FlyingWing(
+        sections=get_base_sections(), winglet_parameters=winglet_parameters
+    )
+
+    _wing.create_wing_planform()
+    _wing.create_winglet()
+
+    return _wing
+
+
+@pytest.fixture
+def flying_wing_winglets():
+    """Flying wing with winglets."""
+    return _create_flying_wing(get_base_winglet_parametrization(twist_zero=False))
+
+
+def test_cache_hits_and_misses():
+
+    cache = SystemCache(max_bytes=100)
+
+    assert cache.get("a") is None
+
+    system = cache.get_or_assemble("a", lambda: _System(10))
+
+    assert cache.get_or_assemble("a", lambda: _System(10)) is system
+    assert cache.info() == dict(
+        hits=1, misses=2, evictions=0, size=1, nbytes=10, max_bytes=100
+    )
+
+
+def test_cache_memory_bound():
+
+    cache = SystemCache(max_bytes=100)
+
+    cache.put("a", _System(40))
+    cache.put("b", _System(40))
+
+    # Touch "a", so "b" is the least recently used
+    cache.get("a")
+    cache.put("c", _System(40))
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.evictions == 1
+    assert cache.nbytes <= cache.max_bytes
+
+    # Larger than the whole budget
+    cache.put("d", _System(200))
+
+    assert "d" not in cache
+    assert len(cache) == 2
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+
+def test_geometry_fingerprint(flying_wing_winglets):
+
+    parameters = get_base_winglet_parametrization(twist_zero=False)
+    same_wing = _create_flying_wing(parameters)
+
+    assert geometry_fingerprint(flying_wing_winglets.wings) == geometry_fingerprint(
+        same_wing.wings
+    )
+
+    parameters[WingletParameters.ANGLE_CANT.value] += 1.0
+    other_wing = _create_flying_wing(parameters)
+
+    assert geometry_fingerprint(flying_wing_winglets.wings) != geometry_fingerprint(
+        other_wing.wings
+    )
+
+
+def test_solver_reuses_cached_system(flying_wing_winglets):
+
+    cache = SystemCache()
+    backend = VortexLatticeBackend()
+
+    solver = WingSolver(
+        model=flying_wing_winglets,
+        altitude=1000,
+        mach=0.1,
+        backend=backend,
+        cache=cache,
+    )
+
+    first = solver.solve_cl(0.3)
+    second = solver.solve_alpha(first.alpha)
+
+    assert cache.info()["misses"] == 1
+    assert cache.info()["hits"] == 1
+    assert second.lattice is first.lattice
+    assert np.isclose(second.CL, 0.3)
+
+    uncached = WingSolver(
+        model=flying_wing_winglets,
+        altitude=1000,
+        mach=0.1,
+        backend=backend,
+        cache=None,
+    )
+
+    assert uncached.solve_alpha(first.alpha).CL == pytest.approx(second.CL)
+
+
+@pytest.mark.parametrize("symmetric", [False, True])
+def test_cache_skips_out_of_core_systems(flying_wing_winglets, tmp_path, symmetric):
+
+    cache = SystemCache()
+    backend = VortexLatticeBackend(
+        out_of_core=True, symmetric=symmetric, directory=str(tmp_path)
+    )
+
+    system = cache.get_or_assemble("a", lambda: backend.assemble(flying_wing_winglets))
+
+    # Unknowns of the solved system, the starboard half if symmetric
+    n_panels = system.lattice.n_panels // (2 if symmetric else 1)
+
+    assert system.disk_nbytes == 8 * n_panels**2
+    assert "a" not in cache
+    assert cache.nbytes == 0
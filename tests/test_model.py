@@ -4,8 +4,14 @@ import aerosandbox as sbx
 import pytest
 from Geometry import Point
 from winglets import FlyingWing
-from winglets.conventions import WingSectionParameters, WingletParameters
-
+from winglets.model import get_airfoil
+from winglets.conventions import (
+    MeshParameters,
+    WingletGeometry,
+    WingSectionParameters,
+    WingletParameters,
+)
+from winglets.vlm import Lattice
 
 CHORD = WingSectionParameters.CHORD.value
 LE_LOCATION = WingSectionParameters.LE_LOCATION.value
@@ -172,3 +178,118 @@ def test_wingtip_chord(sections):
     result = wing.wing_tip_chord
 
     assert expected == result
+
+
+def test_mesh(sections, winglet_parameters):
+
+    CHORDWISE_PANELS = MeshParameters.CHORDWISE_PANELS.value
+    CHORDWISE_SPACING = MeshParameters.CHORDWISE_SPACING.value
+    SPANWISE_PANELS = MeshParameters.SPANWISE_PANELS.value
+    SPANWISE_SPACING = MeshParameters.SPANWISE_SPACING.value
+
+    wing = FlyingWing(
+        sections=sections,
+        winglet_parameters=winglet_parameters,
+        planform_mesh={CHORDWISE_PANELS: 4, SPANWISE_PANELS: 6},
+        winglet_mesh={
+            CHORDWISE_PANELS: 3,
+            SPANWISE_PANELS: 2,
+            CHORDWISE_SPACING: "uniform",
+            SPANWISE_SPACING: "uniform",
+        },
+    )
+
+    wing.create_wing_planform()
+    wing.create_winglet()
+
+    planform, winglet = wing.wings
+
+    assert planform.chordwise_panels == 4
+    assert planform.chordwise_spacing == "cosine"
+    assert [xsec.spanwise_panels for xsec in planform.xsecs] == [6, 6, 6]
+    assert winglet.chordwise_spacing == "uniform"
+    assert winglet.xsecs[0].spanwise_spacing == "uniform"
+
+    lattice = Lattice.from_wings(wing.wings)
+
+    # Both sides of two planform sections and one winglet section
+    assert lattice.n_panels == 2 * (4 * 6 * 2 + 3 * 2)
+
+
+@pytest.mark.parametrize(
+    "mesh",
+    [
+        {"chordwisePanels": 0},
+        {"spanwisePanels": 2.5},
+        {"spanwiseSpacing": "sine"},
+        {"panels": 10},
+    ],
+)
+def test_mesh_invalid(sections, mesh):
+
+    with pytest.raises(ValueError):
+        FlyingWing(sections=sections, planform_mesh=mesh)
+
+
+def test_airfoil_registry(sections, winglet_parameters):
+
+    wing = FlyingWing(sections=sections, winglet_parameters=winglet_parameters)
+    wing.create_wing_planform()
+    wing.create_winglet()
+
+    other = FlyingWing(sections=sections, winglet_parameters=winglet_parameters)
+    other.create_wing_planform()
+    other.create_winglet()
+
+    airfoils = [xsec.airfoil for xsec in wing.planform.xsecs]
+
+    # Built once and shared by the sections and models
+    assert all(airfoil is get_airfoil("naca4412") for airfoil in airfoils)
+    assert other.planform.xsecs[0].airfoil is airfoils[0]
+    assert other.winglet[0].xsecs[0].airfoil is wing.winglet[0].xsecs[1].airfoil
+
+    with pytest.raises(ValueError):
+        airfoils[0].coordinates[0, 0] = 0.0
+
+
+@pytest.mark.parametrize(
+    "update, changed",
+    [
+        ({}, set()),
+        ({WingletParameters.ANGLE_CANT.value: 60.0}, {WingletGeometry.TIP}),
+        ({WingletParameters.ANGLE_TWIST_ROOT.value: 2.0}, {WingletGeometry.ROOT}),
+        (
+            {WingletParameters.CHORD_ROOT.value: 0.5},
+            {WingletGeometry.LOCATION, WingletGeometry.ROOT, WingletGeometry.TIP},
+        ),
+        ({WingletParameters.AIRFOIL.value: "naca2412"}, {WingletGeometry.AIRFOIL}),
+    ],
+)
+def test_update_winglet(sections, winglet_parameters, update, changed):
+
+    wing = FlyingWing(sections=sections, winglet_parameters=winglet_parameters)
+    wing.create_wing_planform()
+    wing.create_winglet()
+
+    winglet = wing.winglet[0]
+
+    assert wing.update_winglet(update) == changed
+    assert wing.winglet[0] is winglet
+
+    # Same geometry as a winglet built from scratch
+    expected = FlyingWing(
+        sections=sections, winglet_parameters={**winglet_parameters, **update}
+    )
+    expected.create_wing_planform()
+    expected.create_winglet()
+
+    assert Lattice.from_wings(wing.wings).is_equal(Lattice.from_wings(expected.wings))
+
+
+def test_update_winglet_create(sections, winglet_parameters):
+
+    wing = FlyingWing(sections=sections)
+    wing.create_wing_planform()
+
+    assert wing.update_winglet(winglet_parameters) == set(WingletGeometry)
+    assert len(wing.wings) == 2
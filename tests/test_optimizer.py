@@ -158,9 +158,9 @@ class TestOptimizer:
 
         results = optimizer.put_up()
 
-        expected = {NAME_CD: 0.005628661627242771, NAME_CM: -51.54848089843833}
+        expected = {NAME_CD: 0.005628463698394095, NAME_CM: -51.547759847912616}
 
-        assert expected == results
+        assert results == pytest.approx(expected, rel=1e-9)
 
     def test_set_bounds(self, optimizer, bounds):
 
@@ -216,7 +216,7 @@ class TestOptimizer:
 
         targets, parameters = optimizer.evaluate_optimum()
 
-        expected_targets = {"CDi": 0.005318006823391808, "Cm": -51.93177989903035}
+        expected_targets = {"CDi": 0.005317886682748539, "Cm": -51.93129976471119}
         expected_parameters = {
             0: 0.05,
             2: 0.32,
@@ -228,5 +228,112 @@ class TestOptimizer:
             "wingletAirfoil": "naca0012",
         }
 
-        assert expected_parameters == parameters
-        assert expected_targets == targets
\ No newline at end of file
+        assert parameters == pytest.approx(expected_parameters, rel=1e-9)
+        assert targets == pytest.approx(expected_targets, rel=1e-9)
+
+    def test_evaluate_optimal_point_richardson(self, optimizer):
+
+        optimizer.backend = wl.VortexLatticeBackend(symmetric=True)
+        optimizer.optimum = OptimizeResult(x=np.ones(7), success=True)
+
+        targets, _ = optimizer.evaluate_optimum(levels=2)
+
+        assert set(targets) == set(optimizer.optimum_errors) == {"CDi", "Cm"}
+        assert all(np.isfinite(value) for value in targets.values())
+
+    def test_evaluate_candidates(self, optimizer, flying_wing_winglets):
+
+        optimizer.put_up()
+
+        xs = np.ones((2, 7))
+        xs[1, ANGLE_CANT] = 0.5
+
+        cant = flying_wing_winglets.winglet_parameters[ANGLE_CANT]
+
+        results = optimizer.evaluate_candidates(xs, workers=2)
+
+        assert flying_wing_winglets.winglet_parameters[ANGLE_CANT] == cant
+
+        for x, result in zip(xs, results):
+            expected, _ = optimizer._compute_state(x)
+            for key, value in expected.items():
+                assert np.isclose(value, result[key], rtol=1e-10)
+
+    def test_compute_state_reuses_unchanged_geometry(self, optimizer):
+
+        from winglets.cache import SYSTEM_CACHE
+        from winglets.optimizer import NAME_CD, NAME_CM
+
+        # Assemble every geometry through the backend
+        SYSTEM_CACHE.clear()
+
+        optimizer.backend = wl.VortexLatticeBackend()
+
+        x = np.ones(7)
+        first, _ = optimizer._compute_state(x)
+
+        backend = optimizer._get_target_backend()
+        base = backend._base_system
+
+        # Same design, the geometry does not change and nothing is solved
+        again, _ = optimizer._compute_state(x)
+        assert again == first
+        assert again is not optimizer._target_results[1]
+
+        # Winglet-only change, the planform block is kept
+        x[ANGLE_CANT] = 0.9
+        moved, _ = optimizer._compute_state(x)
+
+        assert backend._base_system is base
+        assert moved[NAME_CD] != first[NAME_CD]
+
+        expected = wl.WingSolver(
+            model=optimizer.target,
+            altitude=11000,
+            mach=0.75,
+            backend=wl.VortexLatticeBackend(),
+            cache=None,
+        ).solve_cl(cl=0.45)
+
+        assert np.isclose(moved[NAME_CD], expected.CDi, rtol=1e-9)
+        assert np.isclose(moved[NAME_CM], expected.Cm, rtol=1e-9)
+
+    def test_compute_state_after_evaluate_optimum(self, optimizer):
+
+        from winglets.optimizer import NAME_CD, NAME_CM
+
+        optimizer.backend = wl.VortexLatticeBackend(symmetric=True)
+
+        x = np.ones(7)
+        x[ANGLE_CANT] = 0.9
+
+        optimizer._compute_state(x)
+
+        # Moves the target to another design behind the state memo
+        optimizer.optimum = OptimizeResult(x=np.ones(7), success=True)
+        optimizer.evaluate_optimum(levels=2)
+
+        results, _ = optimizer._compute_state(x)
+
+        def _expected(backend):
+            return wl.WingSolver(
+                model=optimizer.target,
+                altitude=11000,
+                mach=0.75,
+                backend=backend,
+                cache=None,
+            ).solve_cl(cl=0.45)
+
+        expected = _expected(wl.VortexLatticeBackend())
+
+        assert np.isclose(results[NAME_CD], expected.CDi, rtol=1e-9)
+        assert np.isclose(results[NAME_CM], expected.Cm, rtol=1e-9)
+
+        # Other solver settings are not served from the memo
+        optimizer.backend = None
+        results, _ = optimizer._compute_state(x)
+
+        expected = _expected(None)
+
+        assert np.isclose(results[NAME_CD], expected.CDi, rtol=1e-9)
+        assert np.isclose(results[NAME_CM], expected.Cm, rtol=1e-9)
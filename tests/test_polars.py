@@ -0,0 +1,113 @@
+import aerosandbox as sbx
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from winglets.polars import (
+    PolarTable,
+    polar_table,
+    save_polar_tables,
+    strip_airfoils,
+)
+
+
+@pytest.fixture
+def table():
+    return PolarTable.estimate(sbx.Airfoil("naca4412"))
+
+
+def test_estimate(table):
+
+    cl, cd, cm = table.interpolate(alpha=[-6.0, 0.0, 4.0], reynolds=1e7)
+
+    # Cambered airfoil, positive lift at zero incidence and nose-down moment
+    assert cl[0] < 0.0 < cl[1] < cl[2]
+    assert np.all(cd > 0.0)
+    assert np.all(cm < 0.0)
+
+    _, cd_low, _ = table.interpolate(alpha=2.0, reynolds=1e6)
+    _, cd_high, _ = table.interpolate(alpha=2.0, reynolds=1e8)
+    assert cd_low > cd_high
+
+
+def test_interpolate(table):
+
+    # Nodes of the table
+    cl, cd, cm = table.interpolate(table.alpha[:, None], table.reynolds[None, :])
+
+    assert cl.shape == table.cl.shape
+    assert_allclose(actual=cd, desired=table.cd, rtol=1e-12)
+
+    # Linear in alpha between nodes and clipped outside the table
+    alpha = 0.5 * (table.alpha[10] + table.alpha[11])
+    _, cd, _ = table.interpolate(alpha, table.reynolds[3])
+    assert np.isclose(cd, 0.5 * (table.cd[10, 3] + table.cd[11, 3]))
+
+    _, cd, _ = table.interpolate(alpha, 1e12)
+    assert np.isclose(cd, 0.5 * (table.cd[10, -1] + table.cd[11, -1]))
+
+
+def test_profile_drag(table):
+
+    alpha = np.array([-2.0, 1.0, 3.0, 6.0])
+    reynolds = np.array([2e6, 5e6, 1e7, 3e7])
+
+    cl, cd, _ = table.interpolate(alpha, reynolds)
+
+    assert_allclose(actual=table.profile_drag(cl, reynolds), desired=cd, rtol=1e-3)
+
+
+def test_polar_table(tmp_path, monkeypatch):
+
+    # Estimated in memory, nothing is written
+    table = polar_table("naca0012", directory=str(tmp_path))
+
+    assert not (tmp_path / "naca0012.npz").exists()
+    assert polar_table("naca0012", directory=str(tmp_path)) is table
+
+    # Symmetric airfoil
+    cl, _, cm = table.interpolate(0.0, 1e7)
+    assert_allclose(actual=[cl, cm], desired=0.0, atol=1e-10)
+
+    # The directory is resolved at every call
+    monkeypatch.setenv("WINGLETS_POLARS", str(tmp_path))
+
+    paths = save_polar_tables(["naca0012"])
+
+    assert paths == [str(tmp_path / "naca0012.npz")]
+    assert save_polar_tables(["naca0012"]) == []
+
+    loaded = polar_table("naca0012")
+
+    assert loaded is not table
+    assert loaded.name == "naca0012"
+    assert_allclose(actual=loaded.cd, desired=table.cd)
+
+
+def test_strip_airfoils():
+
+    wing = sbx.Wing(
+        symmetric=True,
+        xsecs=[
+            sbx.WingXSec(
+                xyz_le=[0.0, 0.0, 0.0],
+                airfoil=sbx.Airfoil("naca4412"),
+                spanwise_panels=3,
+            ),
+            sbx.WingXSec(
+                xyz_le=[0.0, 1.0, 0.0],
+                airfoil=sbx.Airfoil("naca0012"),
+                spanwise_panels=2,
+            ),
+            sbx.WingXSec(xyz_le=[0.0, 2.0, 0.0], airfoil=sbx.Airfoil("naca2412")),
+        ],
+    )
+
+    starboard = ["naca4412"] * 3 + ["naca0012"] * 2
+
+    assert list(strip_airfoils([wing])) == starboard * 2
+    assert list(strip_airfoils([wing], interleaved=True)) == (
+        ["naca4412"] * 6 + ["naca0012"] * 4
+    )
+
+    wing.symmetric = False
+    assert list(strip_airfoils([wing])) == starboard
@@ -1,10 +1,21 @@
 import pytest
 
 import winglets as wl
+from winglets.solver import (
+    DragMode,
+    SolverResult,
+    TrimMode,
+    richardson_extrapolation,
+    standard_atmosphere,
+)
+from winglets.cache import SystemCache
 from winglets.conventions import WingSectionParameters, WingletParameters
+from winglets.polars import PolarTable
+from winglets.vlm import Lattice, Reference
 from Geometry import Point
 import numpy as np
 import copy
+import pickle
 from numpy.testing import assert_allclose
 
 ALTITUDE = 11000
@@ -120,7 +131,12 @@ class TestFlyingWing:
 
     def test_solver_cl(self, flying_wing):
 
-        solver = wl.WingSolver(model=flying_wing, altitude=ALTITUDE, mach=MACH)
+        solver = wl.WingSolver(
+            model=flying_wing,
+            altitude=ALTITUDE,
+            mach=MACH,
+            trim=TrimMode.MINIMIZE,
+        )
 
         problem = solver.solve_cl(cl=CL)
 
@@ -135,6 +151,24 @@ class TestFlyingWing:
 
         assert expected == results
 
+    def test_solver_cl_superposition(self, flying_wing):
+
+        solver = wl.WingSolver(model=flying_wing, altitude=ALTITUDE, mach=MACH)
+
+        problem = solver.solve_cl(cl=CL)
+
+        results = dict(CDi=problem.CDi, CL=problem.CL, Cm=problem.Cm)
+
+        expected = {
+            "CDi": 0.005628661627242771,
+            "CL": CL,
+            "Cm": -51.54848089843833,
+        }
+
+        assert np.isclose(CL, problem.CL, rtol=1e-12, atol=0.0)
+        for key, value in expected.items():
+            assert np.isclose(value, results[key], rtol=solver.TOL_CL, atol=0.0)
+
 
 class TestFlyingWingWinglets:
     def test_solver_alpha(self, flying_wing_winglets):
@@ -165,7 +199,12 @@ class TestFlyingWingWinglets:
 
     def test_solver_cl(self, flying_wing_winglets):
 
-        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            trim=TrimMode.MINIMIZE,
+        )
 
         problem = solver.solve_cl(cl=CL)
 
@@ -179,4 +218,741 @@ class TestFlyingWingWinglets:
         }
 
         assert np.isclose(CL, results["CL"], rtol=solver.TOL_CL, atol=solver.TOL_CL)
-        assert expected == results
\ No newline at end of file
+        assert expected == results
+
+    def test_solver_cl_superposition(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+
+        problem = solver.solve_cl(cl=CL)
+
+        # Same operating point as a direct solve at the trimmed angle
+        reference = solver.solve_alpha(alpha=solver.alpha)
+
+        results = dict(CDi=problem.CDi, CL=problem.CL, CY=problem.CY, Cm=problem.Cm)
+        expected = dict(
+            CDi=reference.CDi, CL=reference.CL, CY=reference.CY, Cm=reference.Cm
+        )
+
+        assert np.isclose(CL, problem.CL, rtol=1e-12, atol=0.0)
+        for key, value in expected.items():
+            assert np.isclose(value, results[key], rtol=1e-10, atol=1e-15)
+
+    def test_solver_alpha_sweep(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+
+        alphas = [-2.0, ALPHA, 3.5]
+
+        results = solver.solve_alpha_sweep(alphas=alphas)
+
+        for idx, alpha in enumerate(alphas):
+
+            problem = solver.solve_alpha(alpha=alpha)
+
+            assert np.isclose(problem.CL, results["CL"][idx], rtol=1e-10)
+            assert np.isclose(problem.CDi, results["CDi"][idx], rtol=1e-10)
+            assert np.isclose(problem.CY, results["CY"][idx], atol=1e-15)
+            assert np.isclose(problem.Cm, results["Cm"][idx], rtol=1e-10)
+
+    def test_solver_cl_sweep(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+
+        cls = np.array([0.2, CL])
+
+        results = solver.solve_cl_sweep(cls=cls)
+
+        problem = solver.solve_cl(cl=CL)
+
+        assert_allclose(actual=results["CL"], desired=cls, rtol=1e-12)
+        assert np.isclose(problem.CDi, results["CDi"][-1], rtol=1e-10)
+        assert np.isclose(problem.Cm, results["Cm"][-1], rtol=1e-10)
+        assert np.isclose(solver.alpha, results["alpha"][-1], rtol=1e-10)
+
+
+class TestVortexLatticeBackend:
+    def test_solver_alpha(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH
+        )
+
+        result = solver.solve_alpha(alpha=2.0)
+        expected = reference.solve_alpha(alpha=2.0)
+
+        for key in ["CL", "CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-10)
+
+        assert np.isclose(expected.CY, result.CY, rtol=0.0, atol=1e-15)
+
+    def test_solver_cl(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        assert np.isclose(CL, result.CL, rtol=1e-12)
+        assert np.isclose(reference.alpha, solver.alpha, rtol=1e-10)
+        for key in ["CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-10)
+
+    def test_solver_cl_symmetric(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(symmetric=True),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        assert np.isclose(reference.alpha, solver.alpha, rtol=1e-10)
+        for key in ["CL", "CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-10)
+
+    def test_solver_cl_out_of_core(self, flying_wing_winglets, tmp_path):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(
+                symmetric=True, out_of_core=True, directory=tmp_path
+            ),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        assert np.isclose(reference.alpha, solver.alpha, rtol=1e-8)
+        for key in ["CL", "CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-8)
+
+    def test_solver_cl_mixed_precision(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(mixed_precision=True),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        assert np.isclose(CL, result.CL, rtol=1e-12)
+        for key in ["CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-10)
+
+
+    def test_solver_cl_krylov(self, flying_wing_winglets):
+
+        backend = wl.VortexLatticeBackend(krylov=True)
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=backend,
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        for cant in [45.0, 45.5]:
+
+            flying_wing_winglets.winglet_parameters[
+                WingletParameters.ANGLE_CANT.value
+            ] = cant
+            flying_wing_winglets.remove_winglet()
+            flying_wing_winglets.create_winglet()
+
+            result = solver.solve_cl(cl=CL)
+            expected = reference.solve_cl(cl=CL)
+
+            for key in ["CL", "CDi", "Cm"]:
+                assert np.isclose(
+                    getattr(expected, key), getattr(result, key), rtol=1e-8
+                )
+
+        # The second geometry reuses the factorization of the first one
+        assert backend._preconditioner._lu_piv is not None
+        assert 0 < max(backend.iterations) <= backend.REFACTOR_ITERATIONS
+
+
+    def test_solver_cl_hierarchical(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(symmetric=True, hierarchical=True),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        assert np.isclose(reference.alpha, solver.alpha, rtol=1e-5)
+        for key in ["CL", "CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-5)
+
+
+class TestLiftingLineBackend:
+    def test_solver_cl(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.LiftingLineBackend(),
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        result = solver.solve_cl(cl=CL)
+        reference.solve_cl(cl=CL)
+
+        assert np.isclose(result.CL, CL, rtol=1e-6)
+        assert np.isclose(solver.alpha, reference.alpha, atol=0.2)
+
+
+class TestTrefftzDrag:
+    def test_solver_cl(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+            drag=DragMode.TREFFTZ,
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            drag=DragMode.TREFFTZ,
+        )
+
+        # Same strengths at an angle of attack, vlm3 keeps its near-field CL
+        result = solver.solve_alpha(alpha=3.0)
+        expected = reference.solve_alpha(alpha=3.0)
+
+        assert np.isclose(expected.CDi, result.CDi, rtol=1e-10)
+
+        result = solver.solve_cl(cl=CL)
+        assert solver.CDi == result.CDi
+
+        # Above the elliptic loading induced drag
+        wing = flying_wing_winglets.wings[0]
+        aspect_ratio = wing.span() ** 2 / wing.area_wetted()
+        assert result.CDi > CL**2 / (np.pi * aspect_ratio)
+
+    def test_solver_cl_sweep(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+            drag=DragMode.TREFFTZ,
+        )
+
+        results = solver.solve_cl_sweep([0.2, CL])
+
+        assert np.isclose(results["CDi"][1], solver.solve_cl(cl=CL).CDi, rtol=1e-10)
+
+    @pytest.mark.parametrize("coefficients", [None, ["CDi", "Cm"]])
+    def test_solver_freestream_forces(self, flying_wing_winglets, coefficients):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+            cache=None,
+            drag=DragMode.TREFFTZ,
+            coefficients=coefficients,
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+            cache=None,
+            coefficients=coefficients,
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        # No near-field pass over the panels
+        system, _ = solver._solution
+        assert system._Vij_centers is None
+
+        assert np.isclose(result.CL, CL, rtol=1e-6)
+        assert np.isclose(solver.alpha, reference.alpha, rtol=1e-2)
+        assert np.isclose(result.Cm, expected.Cm, rtol=1e-2)
+        assert result.CDi > expected.CDi
+
+
+class TestLeanResult:
+    @pytest.mark.parametrize("trim", [TrimMode.SUPERPOSITION, TrimMode.MINIMIZE])
+    def test_solver_cl(self, flying_wing_winglets, trim):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            trim=trim,
+            coefficients=["CDi", "Cm"],
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH, trim=trim
+        )
+
+        result = solver.solve_cl(cl=CL)
+        expected = reference.solve_cl(cl=CL)
+
+        assert isinstance(result, SolverResult)
+        assert not hasattr(result, "__dict__")
+        assert result.alpha == solver.alpha
+        assert result.CY is None
+        for key in ["CL", "CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-10)
+
+    def test_solver_alpha(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            coefficients=SolverResult.COEFFICIENTS,
+        )
+        reference = wl.WingSolver(
+            model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH
+        )
+
+        result = solver.solve_alpha(alpha=2.0)
+        expected = reference.solve_alpha(alpha=2.0)
+
+        for key in ["CL", "CDi", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), rtol=1e-10)
+
+        result = pickle.loads(pickle.dumps(result))
+        assert np.isclose(expected.CL, result.CL, rtol=1e-10)
+
+    def test_unknown_coefficient(self, flying_wing_winglets):
+
+        with pytest.raises(ValueError):
+            wl.WingSolver(
+                model=flying_wing_winglets,
+                altitude=ALTITUDE,
+                mach=MACH,
+                coefficients=["CD0"],
+            )
+
+
+def test_richardson_extrapolation():
+
+    h = np.array([1.0, 0.5, 0.25])
+    values = 2.0 + 3.0 * h**2
+
+    value, error, order = richardson_extrapolation(values, ratio=2.0)
+
+    assert np.isclose(value, 2.0, rtol=1e-12)
+    assert np.isclose(order, 2.0, rtol=1e-12)
+    assert np.isclose(error, values[-1] - 2.0, rtol=1e-12)
+
+    value, _, order = richardson_extrapolation(values[:2], ratio=2.0, order=2.0)
+    assert np.isclose(value, 2.0, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        richardson_extrapolation(values[:1], ratio=2.0)
+
+
+class TestRichardson:
+    def test_solver_cl(self, sections):
+
+        MESH = {"chordwisePanels": 2, "spanwisePanels": 4}
+
+        model = wl.FlyingWing(sections=sections, planform_mesh=MESH)
+        model.create_wing_planform()
+
+        backend = wl.VortexLatticeBackend()
+
+        solver = wl.WingSolver(
+            model=model, altitude=ALTITUDE, mach=MACH, backend=backend
+        )
+
+        results, errors = solver.solve_cl_richardson(cl=CL, levels=2)
+
+        fine = wl.WingSolver(
+            model=model.refine(2), altitude=ALTITUDE, mach=MACH, backend=backend
+        )
+        assert fine.model.planform.chordwise_panels == 4
+
+        coarse_problem = solver.solve_cl(cl=CL)
+        fine_problem = fine.solve_cl(cl=CL)
+
+        for key in ["CDi", "Cm"]:
+            coarse_value = getattr(coarse_problem, key)
+            fine_value = getattr(fine_problem, key)
+
+            assert np.isclose(results[key], 2.0 * fine_value - coarse_value)
+            assert np.isclose(errors[key], abs(fine_value - coarse_value))
+
+        assert np.isclose(results["CL"], CL)
+        assert np.isclose(results["alpha"], 2.0 * fine.alpha - solver.alpha)
+
+
+class TestOperatingPoints:
+    def test_solver_incompressible(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+
+        cls = np.array([0.2, CL])
+
+        results = solver.solve_operating_points(
+            altitudes=[ALTITUDE, 0.0], machs=MACH, cls=cls, prandtl_glauert=False
+        )
+        expected = solver.solve_cl_sweep(cls=cls)
+
+        for key in ["alpha", "CL", "CDi", "Cm"]:
+            assert_allclose(actual=results[key], desired=expected[key], rtol=1e-10)
+
+        assert np.isclose(results["velocity"][0], solver.velocity)
+        assert np.isclose(results["density"][0], solver.density)
+        assert results["density"][1] > results["density"][0]
+
+    def test_solver_prandtl_glauert(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+
+        machs = np.array([0.0, 0.5, MACH, MACH])
+        cls = np.array([CL, CL, CL, 0.2])
+
+        standard_atmosphere.cache_clear()
+        results = solver.solve_operating_points(
+            altitudes=ALTITUDE, machs=machs, cls=cls
+        )
+
+        assert standard_atmosphere.cache_info().misses == 1
+        assert_allclose(actual=results["CL"], desired=cls, rtol=1e-10)
+
+        # Less angle of attack for the same lift at higher Mach
+        assert results["alpha"][0] > results["alpha"][1] > results["alpha"][2]
+
+        # Forces of the stretched wing, on the model reference area
+        beta = np.sqrt(1.0 - MACH**2)
+        model = flying_wing_winglets.stretched(1.0 / beta)
+
+        stretched = wl.WingSolver(
+            model=model,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+        )
+        problem = stretched.solve_alpha(alpha=results["alpha"][2])
+
+        area_ratio = model.planform.area_wetted() / (
+            flying_wing_winglets.planform.area_wetted()
+        )
+        assert np.isclose(area_ratio, 1.0 / beta, rtol=1e-3)
+
+        for key in ["CL", "CDi"]:
+            assert np.isclose(
+                results[key][2], getattr(problem, key) * area_ratio, rtol=1e-10
+            )
+
+    def test_solver_supersonic(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+
+        with pytest.raises(ValueError):
+            solver.solve_operating_points(altitudes=ALTITUDE, machs=1.2, cls=CL)
+
+
+class TestStatelessSolve:
+    def test_solve(self, flying_wing_winglets):
+
+        condition = wl.FlightCondition(altitude=ALTITUDE, mach=MACH, cl=CL)
+
+        result = wl.solve(flying_wing_winglets, condition)
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+        expected = solver.solve_cl(cl=CL)
+
+        assert isinstance(result, SolverResult)
+        assert np.isclose(result.alpha, solver.alpha, rtol=1e-12)
+        for key in ["CL", "CDi", "CY", "Cm"]:
+            assert np.isclose(getattr(expected, key), getattr(result, key), atol=1e-15)
+
+        with pytest.raises(AttributeError):
+            result.CDi = 0.0
+
+        with pytest.raises(ValueError):
+            wl.solve(flying_wing_winglets, condition._replace(alpha=2.0))
+
+    def test_solve_threads(self, flying_wing_winglets):
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        ANGLE_CANT = WingletParameters.ANGLE_CANT.value
+
+        parameters = flying_wing_winglets.winglet_parameters
+        candidates = [{**parameters, ANGLE_CANT: cant} for cant in [20, 45, 70]]
+
+        condition = wl.FlightCondition(altitude=ALTITUDE, mach=0.5, alpha=2.0)
+        backend = wl.VortexLatticeBackend()
+
+        def _solve(candidate):
+            model = flying_wing_winglets.with_winglet(candidate)
+            return wl.solve(model, condition, backend=backend, cache=None)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            results = list(executor.map(_solve, candidates))
+
+        # The shared model is untouched
+        assert flying_wing_winglets.winglet_parameters[ANGLE_CANT] == 45
+
+        for candidate, result in zip(candidates, results):
+            expected = _solve(candidate)
+            assert result.CDi == expected.CDi
+            assert result.Cm == expected.Cm
+
+        assert results[0].CDi != results[2].CDi
+
+    def test_solve_threads_krylov(self, flying_wing_winglets):
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        ANGLE_CANT = WingletParameters.ANGLE_CANT.value
+
+        parameters = flying_wing_winglets.winglet_parameters
+        models = [
+            flying_wing_winglets.with_winglet({**parameters, ANGLE_CANT: cant})
+            for cant in np.linspace(40.0, 50.0, 8)
+        ]
+
+        condition = wl.FlightCondition(altitude=ALTITUDE, mach=0.5, alpha=2.0)
+        backend = wl.VortexLatticeBackend(krylov=True)
+        cache = SystemCache()
+
+        def _solve(model):
+            return wl.solve(model, condition, backend=backend, cache=cache)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(_solve, models + models))
+
+        # The shared backend carries no state between the calls
+        assert backend._preconditioner is None
+        assert backend.iterations == []
+
+        for model, result, again in zip(models, results, results[len(models) :]):
+            expected = wl.solve(model, condition, backend=wl.VortexLatticeBackend())
+            assert np.isclose(result.CL, expected.CL, rtol=1e-8)
+            assert np.isclose(again.CDi, expected.CDi, rtol=1e-8)
+
+
+class TestSpanwiseLoads:
+    @pytest.mark.parametrize("coefficients", [None, ["CDi"]])
+    def test_solver_cl(self, flying_wing_winglets, coefficients):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+            coefficients=coefficients,
+            loads=True,
+        )
+
+        result = solver.solve_cl(cl=CL)
+        loads = result.loads
+
+        dynamic_pressure = 0.5 * solver.density * solver.velocity**2
+        s_ref = Reference.from_wings(solver.model.wings).s_ref
+
+        lift = np.sum(loads.lift) / (dynamic_pressure * s_ref)
+        assert np.isclose(lift, result.CL, rtol=1e-6)
+        assert loads.root_bending_moment > 0.0
+
+    def test_solve(self, flying_wing_winglets):
+
+        condition = wl.FlightCondition(altitude=ALTITUDE, mach=MACH, cl=CL)
+
+        result = wl.solve(flying_wing_winglets, condition, loads=True)
+
+        assert pickle.loads(pickle.dumps(result)).loads is not None
+        assert wl.solve(flying_wing_winglets, condition).loads is None
+
+
+class TestBatchSolve:
+    @pytest.fixture
+    def candidates(self, flying_wing_winglets):
+
+        ANGLE_CANT = WingletParameters.ANGLE_CANT.value
+
+        parameters = flying_wing_winglets.winglet_parameters
+
+        return [
+            flying_wing_winglets.with_winglet({**parameters, ANGLE_CANT: cant})
+            for cant in [20, 45, 70]
+        ]
+
+    @pytest.mark.parametrize("mode", ["alpha", "cl"])
+    def test_solve_batch(self, candidates, mode):
+
+        condition = wl.FlightCondition(altitude=ALTITUDE, mach=MACH)
+        condition = condition._replace(**{mode: 2.0 if mode == "alpha" else CL})
+
+        # Chunked assembly, one candidate at a time
+        results = wl.solve_batch(candidates, condition, tile_bytes=1)
+
+        assert results["CL"].shape == (3,)
+
+        backend = wl.VortexLatticeBackend()
+        for index, model in enumerate(candidates):
+            expected = wl.solve(model, condition, backend=backend, cache=None)
+            for key in ["alpha", "CL", "CDi", "Cm"]:
+                assert np.isclose(
+                    getattr(expected, key), results[key][index], rtol=1e-6
+                )
+
+        assert results["CDi"][0] != results["CDi"][2]
+
+    def test_solve_batch_panel_count(self, candidates):
+
+        condition = wl.FlightCondition(altitude=ALTITUDE, mach=MACH, alpha=2.0)
+
+        with pytest.raises(ValueError):
+            wl.solve_batch([candidates[0], candidates[1].refine(2)], condition)
+
+
+class TestProfileDrag:
+    @pytest.mark.parametrize("coefficients", [None, ["CDi"]])
+    def test_solver_cl(self, flying_wing_winglets, coefficients):
+
+        import aerosandbox as sbx
+
+        polars = {
+            name: PolarTable.estimate(sbx.Airfoil(name))
+            for name in ["naca4412", "naca0012"]
+        }
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets,
+            altitude=ALTITUDE,
+            mach=MACH,
+            backend=wl.VortexLatticeBackend(),
+            coefficients=coefficients,
+            loads=True,
+            profile_drag=True,
+            polars=polars,
+        )
+
+        result = solver.solve_cl(cl=CL)
+
+        assert 0.0 < result.CDp < 0.05
+        assert solver.CDp == result.CDp
+
+        dynamic_pressure = 0.5 * solver.density * solver.velocity**2
+        s_ref = Reference.from_wings(solver.model.wings).s_ref
+
+        drag = np.sum(result.loads.profile_drag) / (dynamic_pressure * s_ref)
+        assert np.isclose(drag, result.CDp, rtol=1e-12)
+
+
+class TestInducedVelocity:
+    @pytest.mark.parametrize("backend", [None, wl.VortexLatticeBackend(symmetric=True)])
+    def test_boundary_condition(self, flying_wing_winglets, backend):
+
+        solver = wl.WingSolver(
+            model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH, backend=backend
+        )
+
+        with pytest.raises(ValueError):
+            solver.induced_velocity(np.zeros((1, 3)))
+
+        solver.solve_cl(cl=CL)
+
+        # No flow through the panels
+        lattice = Lattice.from_wings(flying_wing_winglets.wings)
+        velocities = solver.induced_velocity(
+            lattice.collocation_points, freestream=True
+        )
+        normal_wash = np.einsum("ij,ij->i", velocities, lattice.normal_directions)
+
+        assert velocities.shape == (lattice.n_panels, 3)
+        assert_allclose(actual=normal_wash / solver.velocity, desired=0.0, atol=1e-8)
+
+    def test_tiles(self, flying_wing_winglets):
+
+        solver = wl.WingSolver(model=flying_wing_winglets, altitude=ALTITUDE, mach=MACH)
+        solver.solve_alpha(alpha=2.0)
+
+        # Wake survey behind the wing
+        y, z = np.meshgrid(np.linspace(-16.0, 16.0, 41), np.linspace(-2.0, 2.0, 11))
+        points = np.stack((np.full(y.size, 20.0), y.ravel(), z.ravel()), axis=1)
+
+        expected = solver.induced_velocity(points, tile_bytes=None)
+        velocities = solver.induced_velocity(points, tile_bytes=1, workers=4)
+
+        assert_allclose(actual=velocities, desired=expected, rtol=1e-12, atol=1e-12)
+
+        # Downwash behind the loaded wing
+        assert np.mean(velocities[:, 2]) < 0.0
@@ -0,0 +1,758 @@
+import tracemalloc
+
+import aerosandbox as sbx
+import numpy as np
+import pytest
+import winglets as wl
+from numpy.testing import assert_allclose
+from winglets.conventions import WingletParameters
+from winglets.utils import get_base_sections, get_base_winglet_parametrization
+from winglets.hmatrix import (
+    HierarchicalSystem,
+    adaptive_cross_approximation,
+    cluster_tree,
+)
+from winglets.vlm import (
+    BatchedSystem,
+    InfluenceSystem,
+    KrylovSystem,
+    Lattice,
+    MixedPrecisionSystem,
+    OutOfCoreSystem,
+    PartitionedSystem,
+    Reference,
+    SpanwiseLoads,
+    SymmetricSystem,
+    WarmStart,
+    freestream_direction,
+    KERNEL_BYTES_PER_PAIR,
+    induced_velocities,
+    influence_matrix,
+    near_field_loads,
+    reflect,
+    row_tiles,
+    spacing,
+    tiled_product,
+    trefftz_plane_drag,
+    velocity_field,
+    wind_axes_coefficients,
+    zero_lift_angle,
+)
+
+
+@pytest.fixture
+def flying_wing_winglets():
+    """Flying wing with winglets."""
+
+    _wing = wl.FlyingWing(
+        sections=get_base_sections(),
+        winglet_parameters=get_base_winglet_parametrization(twist_zero=False),
+    )
+
+    _wing.create_wing_planform()
+    _wing.create_winglet()
+
+    return _wing
+
+
+@pytest.fixture
+def vlm3_problem(flying_wing_winglets):
+
+    problem = sbx.vlm3(
+        airplane=flying_wing_winglets.airplane,
+        op_point=sbx.OperatingPoint(velocity=1.0, alpha=0.0, density=1.0),
+    )
+
+    problem.verbose = False
+    problem.make_panels()
+
+    return problem
+
+
+def _panel_order(collocation_points):
+    """Sort panels by location, the panel order differs from vlm3."""
+    return np.lexsort(np.round(collocation_points, 9).T[::-1])
+
+
+def test_spacing():
+
+    assert_allclose(spacing("uniform", 5), [0.0, 0.25, 0.5, 0.75, 1.0])
+    assert_allclose(spacing("cosine", 3), [0.0, 0.5, 1.0], atol=1e-15)
+
+    with pytest.raises(ValueError):
+        spacing("exponential", 3)
+
+
+def test_lattice_matches_vlm3(flying_wing_winglets, vlm3_problem):
+
+    lattice = Lattice.from_wings(flying_wing_winglets.wings)
+
+    assert lattice.n_panels == vlm3_problem.n_panels
+
+    order = _panel_order(lattice.collocation_points)
+    order_vlm3 = _panel_order(vlm3_problem.collocation_points)
+
+    for name in ["collocation_points", "left_vortex_vertices", "normal_directions"]:
+
+        result = getattr(lattice, name)[order]
+        expected = getattr(vlm3_problem, name)[order_vlm3]
+
+        assert_allclose(actual=result, desired=expected, rtol=0.0, atol=1e-12)
+
+    assert np.isclose(lattice.areas.sum(), vlm3_problem.areas.sum(), rtol=1e-12)
+    assert lattice.is_trailing_edge.sum() == vlm3_problem.is_trailing_edge.sum()
+
+
+def test_lattice_indices(flying_wing_winglets):
+
+    lattice = Lattice.from_wings(flying_wing_winglets.wings)
+
+    # One trailing edge panel per spanwise strip
+    assert lattice.n_strips == lattice.is_trailing_edge.sum()
+    assert set(lattice.wing_index) == {0, 1}
+
+    # Every panel of the symmetric wings has a mirror image
+    assert lattice.is_symmetric
+    assert lattice.is_starboard.sum() == lattice.n_panels // 2
+    assert_allclose(
+        actual=lattice.collocation_points[lattice.mirror_index],
+        desired=reflect(lattice.collocation_points),
+        atol=1e-15,
+    )
+
+
+def test_induced_velocities_matches_vlm3(vlm3_problem):
+
+    points = vlm3_problem.collocation_points
+
+    result = induced_velocities(
+        points,
+        vlm3_problem.left_vortex_vertices,
+        vlm3_problem.right_vortex_vertices,
+    )
+    expected = vlm3_problem.calculate_Vij(points)
+
+    assert_allclose(actual=result, desired=expected, rtol=1e-12, atol=1e-15)
+
+
+@pytest.mark.parametrize("symmetric", [False, True])
+def test_velocity_field(flying_wing_winglets, symmetric):
+
+    lattice = Lattice.from_wings(flying_wing_winglets.wings)
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(-10.0, 10.0, size=(50, 3))
+    strengths = rng.standard_normal((lattice.n_panels, 2))
+
+    Vij = induced_velocities(
+        points,
+        lattice.left_vortex_vertices,
+        lattice.right_vortex_vertices,
+        symmetric=symmetric,
+    )
+    expected = np.tensordot(Vij, strengths, axes=(1, 0))
+
+    velocities = velocity_field(
+        points,
+        lattice.left_vortex_vertices,
+        lattice.right_vortex_vertices,
+        strengths,
+        symmetric=symmetric,
+        tile_bytes=1,
+        workers=2,
+    )
+
+    assert velocities.shape == (50, 3, 2)
+    assert_allclose(actual=velocities, desired=expected, rtol=1e-12)
+
+
+def test_row_tiles():
+
+    tiles = row_tiles(10, 4, tile_bytes=3 * 4 * KERNEL_BYTES_PER_PAIR)
+
+    assert tiles == [slice(0, 3), slice(3, 6), slice(6, 9), slice(9, 10)]
+
+    # At least one row per tile
+    assert row_tiles(2, 4, tile_bytes=0) == [slice(0, 1), slice(1, 2)]
+
+
+@pytest.mark.parametrize("symmetric", [False, True])
+def test_tiled_assembly(flying_wing_winglets, symmetric):
+
+    lattice = Lattice.from_wings(flying_wing_winglets.wings)
+
+    arguments = (
+        lattice.collocation_points,
+        lattice.normal_directions,
+        lattice.left_vortex_vertices,
+        lattice.right_vortex_vertices,
+        symmetric,
+    )
+
+    # A few rows per tile
+    tile_bytes = 7 * lattice.n_panels * KERNEL_BYTES_PER_PAIR
+
+    expected = influence_matrix(*arguments, tile_bytes=None)
+
+    tracemalloc.start()
+    result = influence_matrix(*arguments, tile_bytes=tile_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert np.array_equal(result, expected)
+    assert peak < expected.nbytes + 1.5 * tile_bytes
+
+    assert np.array_equal(
+        induced_velocities(*arguments[:1], *arguments[2:], tile_bytes=tile_bytes),
+        induced_velocities(*arguments[:1], *arguments[2:], tile_bytes=None),
+    )
+
+
+def test_parallel_assembly(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+
+    tiles = row_tiles(lattice.n_panels, lattice.n_panels, tile_bytes=None, workers=4)
+    assert len(tiles) == 4
+
+    system = InfluenceSystem(
+        lattice=lattice, reference=reference, tile_bytes=None, workers=4
+    ).assemble()
+    expected_system = InfluenceSystem(lattice=lattice, reference=reference)
+    expected_system.assemble()
+
+    assert np.array_equal(system.AIC, expected_system.AIC)
+    assert np.array_equal(system.Vij_centers, expected_system.Vij_centers)
+
+
+def test_influence_system_solve(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    system = InfluenceSystem(
+        lattice=Lattice.from_wings(wings), reference=Reference.from_wings(wings)
+    ).assemble()
+
+    rhs = -system.lattice.normal_directions[:, [0, 2]]
+
+    strengths = system.solve(rhs)
+
+    assert_allclose(actual=system.AIC @ strengths, desired=rhs, atol=1e-12)
+
+
+def test_partitioned_system(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+
+    n_base = np.count_nonzero(lattice.wing_index == 0)
+    base = InfluenceSystem(
+        lattice=lattice.take(slice(None, n_base)), reference=reference
+    ).assemble()
+
+    system = PartitionedSystem(lattice=lattice, reference=reference, base=base)
+    system.assemble()
+
+    expected_system = InfluenceSystem(lattice=lattice, reference=reference)
+    expected_system.assemble()
+
+    rhs = -lattice.normal_directions[:, [0, 2]]
+
+    strengths = system.solve(rhs)
+    expected = expected_system.solve(rhs)
+
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-10, atol=1e-12)
+
+    assert_allclose(
+        actual=system.induced_velocity_at_centers(strengths),
+        desired=expected_system.induced_velocity_at_centers(expected),
+        rtol=1e-10,
+        atol=1e-12,
+    )
+
+
+def test_partitioned_backend_reuses_planform(flying_wing_winglets):
+
+    backend = wl.VortexLatticeBackend(partition=True)
+
+    system = backend.assemble(flying_wing_winglets)
+
+    # Move the winglet, the planform block must be reused
+    flying_wing_winglets.winglet_parameters[WingletParameters.ANGLE_CANT.value] = 60
+    flying_wing_winglets.remove_winglet()
+    flying_wing_winglets.create_winglet()
+
+    new_system = backend.assemble(flying_wing_winglets)
+
+    assert isinstance(new_system, PartitionedSystem)
+    assert new_system.base is system.base
+
+
+@pytest.mark.parametrize("partition", [False, True])
+def test_symmetric_system(flying_wing_winglets, partition):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+
+    backend = wl.VortexLatticeBackend(partition=partition, symmetric=True)
+    system = backend.assemble(flying_wing_winglets)
+
+    assert isinstance(system, SymmetricSystem)
+    assert system.half.lattice.n_panels == lattice.n_panels // 2
+
+    expected_system = InfluenceSystem(lattice=lattice, reference=reference)
+    expected_system.assemble()
+
+    rhs = -lattice.normal_directions[:, [0, 2]]
+
+    strengths = system.solve(rhs)
+    expected = expected_system.solve(rhs)
+
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-10, atol=1e-12)
+
+    assert_allclose(
+        actual=system.induced_velocity_at_centers(strengths),
+        desired=expected_system.induced_velocity_at_centers(expected),
+        rtol=1e-10,
+        atol=1e-12,
+    )
+
+
+def test_trefftz_plane_drag():
+    """Far and near-field induced drag agree on a flat rectangular wing."""
+
+    airfoil = sbx.Airfoil("naca0012")
+    wing = sbx.Wing(
+        symmetric=True,
+        chordwise_panels=8,
+        xsecs=[
+            sbx.WingXSec(
+                xyz_le=[0.0, 0.0, 0.0],
+                chord=1.0,
+                airfoil=airfoil,
+                spanwise_panels=40,
+                spanwise_spacing="cosine",
+            ),
+            sbx.WingXSec(
+                xyz_le=[0.0, 4.0, 0.0], chord=1.0, airfoil=airfoil, spanwise_panels=40
+            ),
+        ],
+    )
+
+    system = InfluenceSystem(
+        lattice=Lattice.from_wings([wing]), reference=Reference.from_wings([wing])
+    ).assemble()
+
+    alpha = np.array([2.0, 5.0])
+    freestream = freestream_direction(alpha)
+
+    strengths = system.solve(-system.lattice.normal_directions @ freestream)
+    velocities = system.induced_velocity_at_centers(strengths) + freestream
+
+    _, force, moment = near_field_loads(system, strengths, velocities)
+    coefficients = wind_axes_coefficients(
+        force, moment, alpha, dynamic_pressure=0.5, reference=system.reference
+    )
+
+    result = trefftz_plane_drag(system.lattice, strengths)
+    result /= 0.5 * system.reference.s_ref
+
+    assert result.shape == (2,)
+    assert_allclose(actual=result, desired=coefficients["CDi"], rtol=5e-3)
+
+
+def test_spanwise_loads(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    system = InfluenceSystem(
+        lattice=Lattice.from_wings(wings), reference=Reference.from_wings(wings)
+    ).assemble()
+
+    alpha = 3.0
+    freestream = freestream_direction(alpha)
+
+    strengths = system.solve(-system.lattice.normal_directions @ freestream)
+    velocities = system.induced_velocity_at_centers(strengths) + freestream
+
+    forces, force, moment = near_field_loads(system, strengths, velocities)
+    coefficients = wind_axes_coefficients(
+        force, moment, alpha, dynamic_pressure=0.5, reference=system.reference
+    )
+
+    loads = SpanwiseLoads(system.lattice, forces, alpha)
+
+    n_strips = np.count_nonzero(system.lattice.is_trailing_edge)
+    assert loads.forces.shape == (n_strips, 3)
+    assert loads.y.flags.c_contiguous and loads.lift.flags.c_contiguous
+    assert_allclose(actual=loads.forces.sum(axis=0), desired=force, atol=1e-12)
+
+    lift = np.sum(loads.lift_per_span * loads.width)
+    assert_allclose(
+        actual=lift / (0.5 * system.reference.s_ref),
+        desired=coefficients["CL"],
+        rtol=1e-12,
+    )
+
+    # Moment of the starboard panels about the x axis through the root
+    starboard = system.lattice.vortex_centers[:, 1] > 0.0
+    centers = system.lattice.vortex_centers[starboard]
+    expected = np.sum(
+        centers[:, 1] * forces[starboard, 2] - centers[:, 2] * forces[starboard, 1]
+    )
+
+    assert loads.root_bending_moment > 0.0
+    assert_allclose(actual=loads.root_bending_moment, desired=expected, rtol=5e-2)
+
+
+@pytest.mark.parametrize("cant", [0.0, 45.0])
+def test_spanwise_loads_canted(cant):
+    """Strip normal forces lie in the plane of canted strips."""
+
+    airfoil = sbx.Airfoil("naca0012")
+    tip = 4.0 * np.array([0.0, np.cos(np.deg2rad(cant)), np.sin(np.deg2rad(cant))])
+    wing = sbx.Wing(
+        symmetric=True,
+        chordwise_panels=4,
+        xsecs=[
+            sbx.WingXSec(
+                xyz_le=[0.0, 0.0, 0.0], chord=1.0, airfoil=airfoil, spanwise_panels=16
+            ),
+            sbx.WingXSec(xyz_le=tip, chord=1.0, airfoil=airfoil),
+        ],
+    )
+
+    system = InfluenceSystem(
+        lattice=Lattice.from_wings([wing]), reference=Reference.from_wings([wing])
+    ).assemble()
+
+    alpha = 4.0
+    freestream = freestream_direction(alpha)
+
+    strengths = system.solve(-system.lattice.normal_directions @ freestream)
+    velocities = system.induced_velocity_at_centers(strengths) + freestream
+
+    forces, _, _ = near_field_loads(system, strengths, velocities)
+    loads = SpanwiseLoads(system.lattice, forces, alpha)
+
+    assert_allclose(actual=np.linalg.norm(loads.normals, axis=1), desired=1.0)
+    assert_allclose(actual=loads.normals @ freestream, desired=0.0, atol=1e-12)
+
+    # Only the vertical part of the strip lift is seen in wind axes
+    assert np.all(loads.normal_force > 0.0)
+    assert_allclose(
+        actual=loads.lift,
+        desired=np.cos(np.deg2rad(cant)) * loads.normal_force,
+        rtol=1e-2,
+    )
+
+
+def test_out_of_core_system(flying_wing_winglets, tmp_path):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+
+    # A few matrix rows per tile
+    system = OutOfCoreSystem(
+        lattice=lattice,
+        reference=reference,
+        tile_bytes=7 * lattice.n_panels * KERNEL_BYTES_PER_PAIR,
+        directory=tmp_path,
+    ).assemble()
+
+    expected_system = InfluenceSystem(lattice=lattice, reference=reference)
+    expected_system.assemble()
+
+    assert isinstance(system.AIC, np.memmap)
+    assert np.array_equal(system.AIC, expected_system.AIC)
+    assert system.nbytes < expected_system.AIC.nbytes
+
+    rhs = -lattice.normal_directions[:, [0, 2]]
+
+    strengths, iterations = system.solve_with_iterations(rhs)
+    expected = expected_system.solve(rhs)
+
+    assert len(iterations) == 2
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-8, atol=1e-12)
+
+    assert_allclose(
+        actual=system.induced_velocity_at_centers(expected),
+        desired=expected_system.induced_velocity_at_centers(expected),
+        rtol=1e-10,
+        atol=1e-12,
+    )
+
+
+def test_tiled_product():
+
+    rng = np.random.default_rng(0)
+
+    matrix = rng.normal(size=(10, 6, 3)).astype(np.float32)
+    x = rng.normal(size=(6, 2))
+
+    expected = np.tensordot(matrix.astype(float), x, axes=(1, 0))
+
+    assert_allclose(tiled_product(matrix, x, tile_bytes=1), expected, rtol=1e-14)
+    assert_allclose(tiled_product(matrix[..., 0], x[:, 0]), expected[:, 0, 0])
+
+
+def test_batched_system_row_tiles(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+    n_panels = lattice.n_panels
+
+    expected = InfluenceSystem(lattice=lattice, reference=reference).assemble()
+
+    # Budget of a tenth of a lattice
+    tile_bytes = KERNEL_BYTES_PER_PAIR * n_panels**2 // 10
+
+    system = BatchedSystem(
+        [lattice, lattice], [reference, reference], tile_bytes=tile_bytes
+    ).assemble()
+
+    tiles = system._tiles(n_panels)
+
+    assert len(tiles) >= 20
+    for chunk, rows in tiles:
+        pairs = (chunk.stop - chunk.start) * (rows.stop - rows.start) * n_panels
+        assert KERNEL_BYTES_PER_PAIR * pairs <= tile_bytes
+
+    assert_allclose(actual=system.AIC[1], desired=expected.AIC, rtol=1e-14)
+    assert_allclose(
+        actual=system.Vij_centers[0], desired=expected.Vij_centers, rtol=1e-14
+    )
+
+
+def test_mixed_precision_system(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+
+    system = MixedPrecisionSystem(lattice=lattice, reference=reference).assemble()
+
+    expected_system = InfluenceSystem(lattice=lattice, reference=reference)
+    expected_system.assemble()
+
+    # Only the factorization is single precision
+    assert system.AIC.dtype == np.float64
+    assert system._lu_piv[0].dtype == np.float32
+    assert system.nbytes < 0.8 * expected_system.nbytes
+
+    rhs = -lattice.normal_directions[:, [0, 2]]
+
+    strengths = system.solve(rhs)
+    expected = expected_system.solve(rhs)
+
+    # Converged to the solution of the double precision matrix
+    assert 0 < system.refinement_steps < system.MAX_REFINEMENT
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-10, atol=1e-12)
+
+
+def test_krylov_system(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+    reference = Reference.from_wings(wings)
+
+    nearby = InfluenceSystem(
+        lattice=Lattice.from_wings(wings), reference=reference
+    ).assemble()
+
+    # Perturb the winglet
+    flying_wing_winglets.winglet_parameters[WingletParameters.ANGLE_CANT.value] += 1.0
+    flying_wing_winglets.remove_winglet()
+    flying_wing_winglets.create_winglet()
+
+    lattice = Lattice.from_wings(flying_wing_winglets.wings)
+
+    expected_system = InfluenceSystem(lattice=lattice, reference=reference)
+    expected_system.assemble()
+
+    rhs = -lattice.normal_directions[:, [0, 2]]
+    expected = expected_system.solve(rhs)
+
+    system = KrylovSystem(
+        lattice=lattice, reference=reference, preconditioner=nearby
+    ).assemble()
+
+    assert not system.is_self_preconditioned
+    assert system._lu_piv is nearby._lu_piv
+
+    # The preconditioner kept alive by the system is accounted for
+    assert system.nbytes >= expected_system.nbytes + nearby.AIC.nbytes
+
+    warm_start = WarmStart()
+    strengths, iterations = system.solve_with_iterations(rhs, warm_start=warm_start)
+
+    assert len(iterations) == 2
+    assert 0 < max(iterations) < 10
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-8, atol=1e-12)
+
+    # Warm-started from the converged solution
+    strengths, iterations = system.solve_with_iterations(rhs, warm_start=warm_start)
+
+    assert max(iterations) <= 1
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-8, atol=1e-12)
+
+    # Without warm start, the system holds no solve state
+    _, iterations = system.solve_with_iterations(rhs)
+    assert min(iterations) > 1
+
+
+def test_krylov_system_self_preconditioned(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    system = KrylovSystem(
+        lattice=Lattice.from_wings(wings), reference=Reference.from_wings(wings)
+    ).assemble()
+
+    rhs = -system.lattice.normal_directions[:, 0]
+
+    assert system.is_self_preconditioned
+    strengths, iterations = system.solve_with_iterations(rhs)
+
+    assert_allclose(actual=system.AIC @ strengths, desired=rhs, atol=1e-12)
+    assert iterations == [0]
+
+
+def test_adaptive_cross_approximation():
+
+    rng = np.random.default_rng(0)
+
+    # Interaction of two well separated point clouds
+    sources = rng.uniform(size=(40, 3))
+    targets = rng.uniform(size=(30, 3)) + [20.0, 0.0, 0.0]
+
+    block = 1.0 / np.linalg.norm(targets[:, None] - sources[None], axis=-1)
+
+    U, V = adaptive_cross_approximation(
+        lambda i, j: block[np.ix_(i, j)], *block.shape, tol=1e-8
+    )
+
+    assert U.shape[1] <= 10
+    assert_allclose(actual=U @ V, desired=block, rtol=0.0, atol=1e-8 * block.max())
+
+    # Full rank blocks are not compressed
+    U, V = adaptive_cross_approximation(lambda i, j: np.eye(30)[np.ix_(i, j)], 30, 30)
+    assert U is None and V is None
+
+
+def test_cluster_tree():
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(size=(100, 3))
+
+    tree = cluster_tree(points, leaf_size=10)
+    leaves = tree.leaves()
+
+    assert all(len(leaf) <= 10 for leaf in leaves)
+    assert np.array_equal(
+        np.sort(np.concatenate([leaf.indices for leaf in leaves])), np.arange(100)
+    )
+    assert_allclose(tree.lower, points.min(axis=0))
+    assert_allclose(tree.upper, points.max(axis=0))
+
+
+@pytest.mark.parametrize("symmetric", [False, True])
+def test_hierarchical_system(flying_wing_winglets, symmetric):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    reference = Reference.from_wings(wings)
+
+    if symmetric:
+        lattice = lattice.take(lattice.is_starboard)
+
+    system = HierarchicalSystem(
+        lattice=lattice, reference=reference, symmetric=symmetric, leaf_size=16
+    ).assemble()
+
+    expected_system = InfluenceSystem(
+        lattice=lattice, reference=reference, symmetric=symmetric
+    )
+    expected_system.assemble()
+
+    assert system.AIC.low_rank_blocks
+    assert system.AIC.compression < 1.0
+
+    x = np.random.default_rng(0).normal(size=lattice.n_panels)
+    assert_allclose(actual=system.AIC @ x, desired=expected_system.AIC @ x, rtol=1e-6)
+
+    rhs = -lattice.normal_directions[:, [0, 2]]
+
+    strengths, iterations = system.solve_with_iterations(rhs)
+    expected = expected_system.solve(rhs)
+
+    assert len(iterations) == 2
+    assert_allclose(actual=strengths, desired=expected, rtol=1e-6)
+
+    assert_allclose(
+        actual=system.induced_velocity_at_centers(expected),
+        desired=expected_system.induced_velocity_at_centers(expected),
+        rtol=1e-6,
+        atol=1e-9,
+    )
+
+    # Dense center influence, for post-processing
+    Vij = system.Vij_centers
+    expected_Vij = expected_system.Vij_centers
+
+    assert Vij.shape == expected_Vij.shape
+    assert_allclose(
+        actual=Vij,
+        desired=expected_Vij,
+        rtol=0.0,
+        atol=1e-6 * np.abs(expected_Vij).max(),
+    )
+
+
+def test_zero_lift_angle():
+
+    angles = [
+        zero_lift_angle(
+            sbx.WingXSec(xyz_le=[0.0, 0.0, 0.0], chord=1.0, airfoil=sbx.Airfoil(name))
+        )
+        for name in ["naca0012", "naca2412"]
+    ]
+
+    assert_allclose(actual=np.rad2deg(angles), desired=[0.0, -2.08], atol=0.05)
+
+
+def test_lifting_line(flying_wing_winglets):
+
+    wings = flying_wing_winglets.wings
+
+    lattice = Lattice.from_wings(wings)
+    lifting_line = Lattice.lifting_line(wings)
+
+    assert lifting_line.n_panels == lattice.n_strips
+    assert np.all(lifting_line.is_trailing_edge)
+    assert_allclose(
+        actual=np.linalg.norm(lifting_line.normal_directions, axis=1), desired=1.0
+    )
+
+    # The NACA 4412 planform normals are tilted by its zero-lift angle
+    flat = Lattice.from_wings(wings, chordwise_panels=1)
+    planform = lifting_line.wing_index == 0
+
+    tilt = np.einsum(
+        "ij,ij->i",
+        lifting_line.normal_directions[planform],
+        flat.normal_directions[planform],
+    )
+    assert_allclose(actual=np.rad2deg(np.arccos(tilt)), desired=4.2, atol=0.05)